@@ -0,0 +1,145 @@
+"""
+컬럼형 JSON 직렬화(core/columnar.py) 벤치마크 - 생산실적 목록 형태의 합성 행 튜플 (DB 없음)
+
+비교 대상:
+  dict+jsonable_encoder : 행별 dict 변환 후 FastAPI 기본 JSON 응답 경로 (jsonable_encoder + json.dumps)
+  dict+orjson           : 행별 dict 변환 후 orjson
+  columnar+orjson       : 행 튜플 -> 필드별 배열 전치 후 orjson (직렬화만)
+  route:columnar-dict   : FastAPI 라우트가 columnar dict 반환 (응답 전에 jsonable_encoder 가 전체 값을 변환)
+  route:ColumnarResponse: FastAPI 라우트가 ColumnarResponse 직접 반환 (/api/v1 방식, encoder 생략)
+  route:* 는 ASGI 앱을 직접 호출해 라우팅/직렬화/응답 본문 전송까지 측정 (HTTP 소켓 제외)
+
+사용법 (app 디렉토리에서 실행):
+    python -m benchmarks.bench_columnar --rows 100000
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+import numpy as np
+import orjson
+from fastapi import APIRouter, FastAPI
+from fastapi.encoders import jsonable_encoder
+
+from core.columnar import ColumnarResponse, columnar, dumps
+
+FIELDS = ['result_id', 'order_id', 'operation_seq', 'equipment_id', 'start_ts', 'end_ts',
+          'product_id', 'product_name', 'operation_name', 'equipment_name']
+
+
+def synthetic_rows(n: int, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    base = datetime(2025, 1, 1)
+    orders = [uuid.uuid4() for _ in range(max(n // 5, 1))]
+    rows = []
+    for i, (op, eq, prod, start, dur) in enumerate(zip(
+        rng.integers(1, 6, n).tolist(), rng.integers(1, 14, n).tolist(), rng.integers(1, 8, n).tolist(),
+        rng.integers(0, 90 * 86400, n).tolist(), rng.integers(60, 3600, n).tolist(),
+    )):
+        start_ts = base + timedelta(seconds=start)
+        rows.append((
+            uuid.uuid4(), orders[i % len(orders)], op, f'EQ-{eq:02d}', start_ts, start_ts + timedelta(seconds=dur),
+            f'PRD-{prod:03d}', f'제품 {prod}', f'공정 {op}', f'설비 {eq}',
+        ))
+    return rows
+
+
+def as_dicts(rows: list) -> list:
+    # 기존 서비스 계층 방식 (행마다 새 dict, UUID 는 문자열)
+    items = []
+    for r in rows:
+        items.append({
+            'result_id': str(r[0]), 'order_id': str(r[1]), 'operation_seq': r[2], 'equipment_id': r[3],
+            'start_ts': r[4], 'end_ts': r[5], 'product_id': r[6], 'product_name': r[7],
+            'operation_name': r[8], 'equipment_name': r[9],
+        })
+    return items
+
+
+def route_app(rows: list) -> FastAPI:
+    # routers/api_v1.py 와 같은 라우터 설정 (default_response_class=ColumnarResponse)
+    router = APIRouter(default_response_class=ColumnarResponse)
+
+    @router.get('/dict')
+    def as_dict():
+        return columnar(FIELDS, rows)
+
+    @router.get('/response')
+    def as_response():
+        return ColumnarResponse(columnar(FIELDS, rows))
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+def call_route(app: FastAPI, path: str) -> bytes:
+    """ASGI 앱 직접 호출 -> 응답 본문"""
+    body = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        if message['type'] == 'http.response.body':
+            body.append(message.get('body', b''))
+
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'root_path': '', 'query_string': b'', 'headers': [],
+        'client': ('127.0.0.1', 0), 'server': ('127.0.0.1', 80),
+    }
+    asyncio.run(app(scope, receive, send))
+    return b''.join(body)
+
+
+_apps = {}
+
+
+def _route(path: str):
+    def run(rows):
+        app = _apps.get(id(rows)) or _apps.setdefault(id(rows), route_app(rows))
+        return call_route(app, path)
+    return run
+
+
+CASES = {
+    'dict+jsonable_encoder': lambda rows: json.dumps(
+        jsonable_encoder({'items': as_dicts(rows)}), ensure_ascii=False, separators=(',', ':')
+    ).encode('utf-8'),
+    'dict+orjson': lambda rows: orjson.dumps({'items': as_dicts(rows)}),
+    'columnar+orjson': lambda rows: dumps(columnar(FIELDS, rows)),
+    'route:columnar-dict': _route('/dict'),
+    'route:ColumnarResponse': _route('/response'),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rows = synthetic_rows(args.rows)
+    print(f'행 {args.rows:,}건')
+    print(f'{"방식":<24}{"최소(ms)":>10}{"크기(MB)":>10}{"최대 할당(MB)":>15}')
+    for name, fn in CASES.items():
+        times = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            payload = fn(rows)
+            times.append(time.perf_counter() - started)
+
+        tracemalloc.start()
+        fn(rows)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f'{name:<24}{min(times) * 1000:>10.1f}{len(payload) / 1e6:>10.2f}{peak / 1e6:>15.1f}')
+
+
+if __name__ == '__main__':
+    main()
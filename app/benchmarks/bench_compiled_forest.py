@@ -0,0 +1,84 @@
+"""
+CompiledForestRegressor vs sklearn model.predict 벤치마크
+- compiled: NumPy 탐색만 사용 / hybrid: 서비스 설정 (SKLEARN_MIN_BATCH 이상은 sklearn 위임)
+- hybrid 는 모든 배치 크기에서 sklearn 보다 느리지 않아야 함 (1k/10k 회귀 확인)
+
+사용법 (app 디렉토리에서 실행):
+    python -m benchmarks.bench_compiled_forest
+    python -m benchmarks.bench_compiled_forest --synthetic   # pkl 이 없을 때 동일 구조의 모델을 학습해 비교
+"""
+import argparse
+import pickle
+import time
+import joblib
+import numpy as np
+from pathlib import Path
+
+from services.ai_compiled_forest import SKLEARN_MIN_BATCH, CompiledForestRegressor
+
+MODEL_DIR = Path('ai_models/work_time')
+
+
+def synthetic_model(n_rows: int = 1360):
+    from sklearn.ensemble import RandomForestRegressor
+
+    rng = np.random.default_rng(0)
+    X = np.column_stack([
+        rng.integers(0, 9, n_rows),
+        rng.integers(1, 5, n_rows),
+        rng.integers(0, 13, n_rows),
+        rng.integers(10, 100, n_rows),
+    ]).astype(np.float64)
+    y = X[:, 3] * (20 + 10 * X[:, 1]) + rng.normal(0, 300, n_rows)
+    return RandomForestRegressor(n_estimators=100, random_state=42).fit(X, y)
+
+
+def random_inputs(n: int, rng) -> np.ndarray:
+    return np.column_stack([
+        rng.integers(0, 9, n),
+        rng.integers(1, 5, n),
+        rng.integers(0, 13, n),
+        rng.integers(1, 200, n),
+    ]).astype(np.float64)
+
+
+def timeit(fn, repeat: int) -> float:
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--synthetic', action='store_true')
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    model = synthetic_model() if args.synthetic else joblib.load(MODEL_DIR / 'rf_work_time_model.pkl')
+    compiled = CompiledForestRegressor.from_sklearn(model)
+    hybrid = CompiledForestRegressor.from_sklearn(model)
+    hybrid.set_fallback(lambda: model)
+    rng = np.random.default_rng(1)
+
+    print(f"트리 {compiled.n_trees}개, 노드 {len(compiled.value)}개, 최대 깊이 {compiled.max_depth}")
+    print(f"메모리: sklearn pickle {len(pickle.dumps(model)) / 1024:.1f} KiB"
+          f" / compiled {compiled.nbytes / 1024:.1f} KiB")
+    print(f"sklearn 위임 기준: {SKLEARN_MIN_BATCH}행 이상")
+    print(f"{'batch':>8} {'sklearn(ms)':>12} {'compiled(ms)':>13} {'hybrid(ms)':>11} {'speedup':>8} {'identical':>10}")
+
+    for batch in [1, 10, 100, 300, 1000, 10000]:
+        X = random_inputs(batch, rng)
+        expected = model.predict(X)
+        identical = np.array_equal(expected, compiled.predict(X)) and np.array_equal(expected, hybrid.predict(X))
+        repeat = max(3, args.repeat // max(1, batch // 100))
+        t_sk = timeit(lambda: model.predict(X), repeat)
+        t_cf = timeit(lambda: compiled.predict(X), repeat)
+        t_hy = timeit(lambda: hybrid.predict(X), repeat)
+        print(f"{batch:>8} {t_sk * 1000:>12.3f} {t_cf * 1000:>13.3f} {t_hy * 1000:>11.3f}"
+              f" {t_sk / t_hy:>7.1f}x {str(identical):>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+공정 이벤트 처리량 비교: 이벤트별 커밋 vs 그룹 커밋 버퍼 (실제 DB 필요)
+
+- 클라이언트 T개(스레드)가 각자 이벤트를 1건씩 보내고 완료(커밋)까지 대기하는 상황을 재현
+- direct: 이벤트마다 transition + commit (기존 POST /work/progress)
+- buffer: ProgressEventBuffer.submit() 후 Future 대기 (PROGRESS_WRITE_BUFFER=1)
+- 종료 시 생성한 오더/실적 삭제
+
+사용법 (app 디렉토리에서 실행):
+    python -m benchmarks.bench_group_commit --orders 2000 --clients 64
+    python -m benchmarks.bench_group_commit --mode buffer --max-batch 1000 --flush-ms 10
+"""
+import argparse
+import queue
+import random
+import threading
+import time
+
+from core.database import SessionLocal
+from services import order_transitions
+from services.event_buffer import ProgressEventBuffer
+from benchmarks.bench_status_transitions import create_orders, cleanup, OPERATIONS
+
+
+def run(order_ids: list, mode: str, n_clients: int, max_batch: int, flush_ms: float) -> dict:
+    # 오더별로 1~5공정을 순서대로 보내도록 오더 단위로 클라이언트에 분배
+    rng = random.Random(0)
+    shuffled = list(order_ids)
+    rng.shuffle(shuffled)
+    work = queue.SimpleQueue()
+    for order_id in shuffled:
+        work.put(order_id)
+
+    buffer = None
+    if mode == 'buffer':
+        buffer = ProgressEventBuffer(max_queue=n_clients * 4, max_batch=max_batch, flush_ms=flush_ms)
+        buffer.start()
+
+    latencies = []
+    lock = threading.Lock()
+
+    def client():
+        db = SessionLocal() if buffer is None else None
+        local = []
+        try:
+            while True:
+                try:
+                    order_id = work.get_nowait()
+                except queue.Empty:
+                    break
+                for seq in OPERATIONS:
+                    started = time.perf_counter()
+                    if buffer is None:
+                        order_transitions.transition(db, order_id, seq)
+                    else:
+                        buffer.submit(order_id, seq).result()
+                    local.append(time.perf_counter() - started)
+        finally:
+            if db is not None:
+                db.close()
+            with lock:
+                latencies.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(n_clients)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    if buffer is not None:
+        buffer.stop()
+
+    latencies.sort()
+    return {
+        'events': len(latencies),
+        'elapsed_sec': elapsed,
+        'p50_ms': latencies[len(latencies) // 2] * 1000,
+        'p99_ms': latencies[int(len(latencies) * 0.99)] * 1000,
+        'stats': buffer.stats if buffer is not None else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--orders', type=int, default=1000)
+    parser.add_argument('--clients', type=int, default=64)
+    parser.add_argument('--mode', choices=['direct', 'buffer', 'both'], default='both')
+    parser.add_argument('--max-batch', type=int, default=500)
+    parser.add_argument('--flush-ms', type=float, default=20)
+    args = parser.parse_args()
+
+    modes = ['direct', 'buffer'] if args.mode == 'both' else [args.mode]
+    rates = {}
+    for mode in modes:
+        order_ids = create_orders(args.orders)
+        try:
+            r = run(order_ids, mode, args.clients, args.max_batch, args.flush_ms)
+        finally:
+            cleanup(order_ids)
+        rates[mode] = r['events'] / r['elapsed_sec']
+        print(f"[{mode}] 이벤트 {r['events']}건, 클라이언트 {args.clients}개: "
+              f"{rates[mode]:.0f} events/sec, p50 {r['p50_ms']:.1f} ms, p99 {r['p99_ms']:.1f} ms")
+        if r['stats']:
+            print(f"  배치 {r['stats']['batches']}회 (평균 {r['stats']['events'] / r['stats']['batches']:.1f}건)")
+
+    if len(rates) == 2:
+        print(f"buffer / direct = {rates['buffer'] / rates['direct']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
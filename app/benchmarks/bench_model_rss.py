@@ -0,0 +1,85 @@
+"""
+워커별 모델 메모리(RSS/PSS) 측정: pkl/keras 로드 vs mmap 아티팩트 로드
+
+N 개의 워커 프로세스(spawn)를 동시에 띄워 4개 예측 서비스를 로드/1회 추론한 뒤
+/proc/self/smaps_rollup 의 Rss, Pss, Shared 를 비교한다.
+PSS 는 공유 페이지를 프로세스 수로 나눈 값이므로 워커 간 공유 효과가 드러난다.
+
+사용법 (app 디렉토리에서, 먼저 python -m scripts.convert_model_artifacts 실행):
+    python -m benchmarks.bench_model_rss --workers 8
+"""
+import argparse
+import multiprocessing as mp
+import os
+
+
+def read_smaps_rollup() -> dict:
+    stats = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 3 and parts[2] == 'kB':
+                stats[parts[0].rstrip(':')] = int(parts[1])
+    return stats
+
+
+def worker(mmap_flag: str, barrier, queue):
+    os.environ['MODEL_MMAP'] = mmap_flag
+    import numpy as np
+    from services.ai_production_qty_prediction import ProductionQuantityPredictionService
+    from services.ai_work_time_prediction import WorkTimePredictionService
+
+    services = [
+        ProductionQuantityPredictionService('sklearn'),
+        ProductionQuantityPredictionService('tensorflow'),
+        WorkTimePredictionService('sklearn'),
+        WorkTimePredictionService('tensorflow'),
+    ]
+    # 모델 페이지를 실제로 참조하도록 1회 추론
+    services[0].model.predict(np.ones((1, 10)))
+    services[1].model.predict(services[1].scaler.transform(np.ones((1, 10))), verbose=0)
+    for svc in services[2:]:
+        product = svc.get_available_products()[0]
+        equipment = svc.get_available_equipments()[0]
+        svc.predict_batch([(product, 1, equipment, 10)])
+
+    # 모든 워커가 살아있는 상태에서 측정해야 PSS 가 의미 있음
+    barrier.wait()
+    queue.put(read_smaps_rollup())
+    barrier.wait()
+
+
+def measure(mmap_flag: str, n_workers: int) -> list:
+    ctx = mp.get_context('spawn')
+    barrier = ctx.Barrier(n_workers)
+    queue = ctx.Queue()
+    procs = [ctx.Process(target=worker, args=(mmap_flag, barrier, queue)) for _ in range(n_workers)]
+    for p in procs:
+        p.start()
+    results = [queue.get() for _ in procs]
+    for p in procs:
+        p.join()
+    return results
+
+
+def summarize(label: str, results: list):
+    n = len(results)
+    rss = sum(r['Rss'] for r in results) / n / 1024
+    pss = sum(r['Pss'] for r in results) / n / 1024
+    shared = sum(r.get('Shared_Clean', 0) for r in results) / n / 1024
+    print(f"{label:>10} {rss:>12.1f} {pss:>12.1f} {shared:>14.1f} {pss * n:>14.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"워커 {args.workers}개 (단위 MiB)")
+    print(f"{'mode':>10} {'RSS/worker':>12} {'PSS/worker':>12} {'Shared_Clean':>14} {'PSS total':>14}")
+    summarize('pickle', measure('0', args.workers))
+    summarize('mmap', measure('1', args.workers))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+제품별 모델 학습 시간의 코어 수 확장성 벤치마크 (DB 없이 합성 이력 사용)
+
+사용법 (app 디렉토리에서 실행):
+    python -m benchmarks.bench_product_training --products 64 --days 730
+"""
+import argparse
+import os
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+
+from services.ai_product_forecast import train_product_model
+
+
+def synthetic_history(n_products: int, n_days: int) -> dict:
+    rng = np.random.default_rng(0)
+    start = date(2023, 1, 2)
+    history = {}
+    for p in range(n_products):
+        base = rng.uniform(50, 300)
+        history[f'PRD-{p:03d}'] = {
+            start + timedelta(days=i): float(max(0.0, base + 40 * np.sin(i / 7) + rng.normal(0, 30)))
+            for i in range(n_days)
+            if (start + timedelta(days=i)).weekday() != 6
+        }
+    return history
+
+
+def run(history: dict, n_workers: int) -> float:
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        futures = [pool.submit(train_product_model, pid, daily) for pid, daily in history.items()]
+        for f in futures:
+            f.result()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--products', type=int, default=64)
+    parser.add_argument('--days', type=int, default=730)
+    args = parser.parse_args()
+
+    history = synthetic_history(args.products, args.days)
+    print(f"제품 {args.products}개 x {args.days}일, CPU {os.cpu_count()}개")
+    print(f"{'workers':>8} {'wall(s)':>9} {'speedup':>8}")
+
+    baseline = None
+    for n_workers in [1, 2, 4, 8, 16]:
+        if n_workers > (os.cpu_count() or 1):
+            break
+        wall = run(history, n_workers)
+        baseline = baseline or wall
+        print(f"{n_workers:>8} {wall:>9.2f} {baseline / wall:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
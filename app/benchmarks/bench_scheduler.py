@@ -0,0 +1,62 @@
+"""
+스케줄링 코어(schedule_orders) 벤치마크 - 10k 오더 x 13 스테이션 (DB 없음)
+
+사용법 (app 디렉토리에서 실행):
+    python -m benchmarks.bench_scheduler --orders 10000
+"""
+import argparse
+import random
+import time
+
+from services.scheduling import schedule_orders
+
+STATIONS_BY_OP = {
+    1: ["STN-PREP-1", "STN-PREP-2", "STN-PREP-3"],
+    2: ["STN-A", "STN-B", "STN-C", "STN-D"],
+    3: ["STN-INS-1", "STN-INS-2", "STN-INS-3"],
+    4: ["STN-PKG-1", "STN-PKG-2", "STN-PKG-3"],
+}
+STANDARDS = {
+    "TEMP-100": {1: 15, 2: 40, 3: 25, 4: 10},
+    "PRES-200": {1: 20, 2: 50, 3: 35, 4: 15},
+    "GAS-300": {1: 25, 2: 60, 3: 45, 4: 20},
+    "MULTI-501": {1: 35, 2: 90, 3: 60, 4: 28},
+}
+STATUSES = ["S0_PLANNED", "S0_PLANNED", "S1_READY", "S2_ASSEMBLY", "S3_INSPECTION", "S4_PACK"]
+
+
+def synthetic_orders(n: int):
+    rng = random.Random(0)
+    orders, durations = [], {}
+    for i in range(n):
+        product_id = rng.choice(list(STANDARDS))
+        qty = rng.randint(10, 100)
+        orders.append((f"order-{i}", product_id, qty, rng.uniform(0, 30 * 86400), rng.choice(STATUSES)))
+        for seq, sec in STANDARDS[product_id].items():
+            durations[(product_id, seq, qty)] = float(sec * qty)
+    return orders, durations
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    orders, durations = synthetic_orders(args.orders)
+    n_stations = sum(len(s) for s in STATIONS_BY_OP.values())
+
+    times = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        result = schedule_orders(orders, STATIONS_BY_OP, durations)
+        times.append(time.perf_counter() - start)
+
+    late = sum(1 for a in result["assignments"] if a[5] > 0)
+    ops = sum(len(a[3]) for a in result["assignments"])
+    print(f"오더 {args.orders}개 x 스테이션 {n_stations}개, 배정 공정 {ops}개, 지연 {late}건")
+    print(f"best {min(times) * 1000:.1f} ms / median {sorted(times)[len(times) // 2] * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
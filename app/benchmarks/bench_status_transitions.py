@@ -0,0 +1,163 @@
+"""
+작업지시 상태 전이 동시성 스트레스 테스트 (실제 DB 필요)
+
+- 테스트용 오더 N개 생성 후 오더마다 1~5공정 완료 이벤트를 무작위 순서로 섞어
+  T개 스레드(스레드별 세션)가 동시에 처리
+- 검증: 모든 오더의 최종 상태가 S5_DONE (역행/유실 없음), 실적 N x 5건 기록
+- --legacy: 기존 방식(SELECT 후 status 덮어쓰기)과 비교
+- 종료 시 생성한 오더/실적 삭제
+
+사용법 (app 디렉토리에서 실행):
+    python -m benchmarks.bench_status_transitions --orders 2000 --threads 16
+    python -m benchmarks.bench_status_transitions --orders 2000 --threads 16 --legacy
+"""
+import argparse
+import queue
+import random
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+
+from core.database import SessionLocal
+import core.init_database  # noqa: F401  (모델 등록)
+from models.master_product import MasterProduct
+from models.order_status_history import OrderStatusHistory
+from models.work_order import WorkOrder
+from models.work_result import WorkResult
+from services import order_transitions
+
+OPERATIONS = [1, 2, 3, 4, 5]
+
+
+def legacy_transition(db, order_id, operation_seq: int, equipment_id=None) -> order_transitions.TransitionResult:
+    # 기존 advance_progress: 잠금 없이 읽고 덮어쓰기
+    now = datetime.utcnow()
+    order = db.query(WorkOrder).filter(WorkOrder.order_id == order_id).first()
+    from_status = order.status
+    db.add(WorkResult(order_id=order_id, operation_seq=operation_seq, equipment_id=equipment_id,
+                      start_ts=now, end_ts=now))
+    order.status = order_transitions.STEP_TO_STATUS[operation_seq]
+    if order.start_ts is None:
+        order.start_ts = now
+    if operation_seq == 5:
+        order.end_ts = now
+    db.commit()
+    return order_transitions.TransitionResult(order_transitions.APPLIED, from_status, order.status, order.product_id)
+
+
+def create_orders(n: int) -> list:
+    db = SessionLocal()
+    try:
+        product_id = db.query(MasterProduct.product_id).order_by(MasterProduct.product_id).first()[0]
+        due = datetime.utcnow() + timedelta(days=30)
+        orders = [WorkOrder(product_id=product_id, planned_qty=1, due_date=due, status="S0_PLANNED")
+                  for _ in range(n)]
+        db.add_all(orders)
+        db.commit()
+        return [o.order_id for o in orders]
+    finally:
+        db.close()
+
+
+def cleanup(order_ids: list):
+    db = SessionLocal()
+    try:
+        db.query(WorkResult).filter(WorkResult.order_id.in_(order_ids)).delete(synchronize_session=False)
+        db.query(OrderStatusHistory).filter(OrderStatusHistory.order_id.in_(order_ids)).delete(synchronize_session=False)
+        db.query(WorkOrder).filter(WorkOrder.order_id.in_(order_ids)).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def run(order_ids: list, n_threads: int, legacy: bool, seed: int) -> dict:
+    rng = random.Random(seed)
+    events = [(order_id, seq) for order_id in order_ids for seq in OPERATIONS]
+    rng.shuffle(events)
+    work = queue.SimpleQueue()
+    for e in events:
+        work.put(e)
+
+    outcomes = Counter()
+    errors = []
+    lock = threading.Lock()
+    handler = legacy_transition if legacy else order_transitions.transition
+
+    def worker():
+        db = SessionLocal()
+        local = Counter()
+        try:
+            while True:
+                try:
+                    order_id, seq = work.get_nowait()
+                except queue.Empty:
+                    break
+                try:
+                    local[handler(db, order_id, seq).outcome] += 1
+                except Exception as e:
+                    db.rollback()
+                    local['error'] += 1
+                    with lock:
+                        errors.append(repr(e))
+        finally:
+            db.close()
+            with lock:
+                outcomes.update(local)
+
+    threads = [threading.Thread(target=worker) for _ in range(n_threads)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    db = SessionLocal()
+    try:
+        final = Counter(
+            s for (s,) in db.query(WorkOrder.status).filter(WorkOrder.order_id.in_(order_ids))
+        )
+        n_results = db.query(WorkResult).filter(WorkResult.order_id.in_(order_ids)).count()
+    finally:
+        db.close()
+
+    return {
+        'events': len(events),
+        'elapsed_sec': elapsed,
+        'outcomes': dict(outcomes),
+        'final_status': dict(final),
+        'results': n_results,
+        'errors': errors[:5],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--orders', type=int, default=1000)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--legacy', action='store_true')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    order_ids = create_orders(args.orders)
+    try:
+        r = run(order_ids, args.threads, args.legacy, args.seed)
+    finally:
+        cleanup(order_ids)
+
+    mode = 'legacy (read-modify-write)' if args.legacy else 'conditional UPDATE'
+    wrong = args.orders - r['final_status'].get('S5_DONE', 0)
+    print(f"[{mode}] 오더 {args.orders}개, 이벤트 {r['events']}건, 스레드 {args.threads}개")
+    print(f"  처리 {r['elapsed_sec']:.2f}s -> {r['events'] / r['elapsed_sec']:.0f} transitions/sec")
+    print(f"  결과: {r['outcomes']}")
+    print(f"  최종 상태: {r['final_status']} (S5_DONE 아님: {wrong}건)")
+    print(f"  실적 {r['results']}건 (기대 {r['events']}건)")
+    if r['errors']:
+        print(f"  오류 예시: {r['errors']}")
+    if not args.legacy and (wrong or r['results'] != r['events']):
+        raise SystemExit("검증 실패: 상태 역행/유실 또는 실적 누락")
+
+
+if __name__ == "__main__":
+    main()
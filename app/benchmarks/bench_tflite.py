@@ -0,0 +1,74 @@
+"""
+DNN 추론 백엔드별 프로세스 메모리/지연시간 비교: keras vs TFLite(float32/float16/int8)
+
+각 백엔드를 별도 프로세스(spawn)에서 로드해 import 포함 RSS 를 측정한다.
+(경량 인터프리터 ai-edge-litert/tflite-runtime 이 설치된 경우 TF 런타임이 로드되지 않음)
+서비스는 라우트와 같은 get_work_time_service(model_type) 로 얻고, 사용된 인터프리터 패키지를 함께 출력한다.
+TF 가 설치되지 않은 서빙 이미지(WITH_TENSORFLOW=0)에서는 keras 백엔드를 건너뛴다.
+
+사용법 (app 디렉토리에서, 먼저 python -m scripts.export_tflite_models 실행):
+    python -m benchmarks.bench_tflite
+"""
+import importlib.util
+import multiprocessing as mp
+import os
+import time
+
+from benchmarks.bench_model_rss import read_smaps_rollup
+
+BACKENDS = [('tensorflow', None), ('tflite', 'float32'), ('tflite', 'float16'), ('tflite', 'int8')]
+
+
+def worker(model_type: str, precision: str | None, queue):
+    os.environ['MODEL_MMAP'] = '0'
+    if precision:
+        os.environ['TFLITE_PRECISION'] = precision
+    import sys
+    import numpy as np
+    from services.ai_tflite import interpreter_backend
+    from services.ai_work_time_prediction import get_work_time_service
+
+    svc = get_work_time_service(model_type)
+    product = svc.get_available_products()[0]
+    equipment = svc.get_available_equipments()[0]
+    rows = [(product, 1 + i % 4, equipment, 10 + i % 90) for i in range(256)]
+
+    svc.predict_batch(rows[:1])
+    start = time.perf_counter()
+    for i in range(200):
+        svc.predict_batch(rows[i % 256:i % 256 + 1])
+    single = (time.perf_counter() - start) / 200 * 1000
+
+    start = time.perf_counter()
+    for _ in range(20):
+        svc.predict_batch(rows)
+    batch = (time.perf_counter() - start) / 20 * 1000
+
+    queue.put({
+        'rss_mib': read_smaps_rollup()['Rss'] / 1024,
+        'single_ms': single,
+        'batch_ms': batch,
+        'interpreter': interpreter_backend() if model_type == 'tflite' else 'keras',
+        'tensorflow_loaded': 'tensorflow' in sys.modules,
+    })
+
+
+def main():
+    ctx = mp.get_context('spawn')
+    has_tensorflow = importlib.util.find_spec('tensorflow') is not None
+    print(f"{'backend':>20} {'interpreter':>15} {'RSS(MiB)':>10} {'single(ms)':>11} {'batch256(ms)':>13} {'TF loaded':>10}")
+    for model_type, precision in BACKENDS:
+        if model_type == 'tensorflow' and not has_tensorflow:
+            print(f"{model_type:>20} (tensorflow 미설치, 건너뜀)")
+            continue
+        queue = ctx.Queue()
+        p = ctx.Process(target=worker, args=(model_type, precision, queue))
+        p.start()
+        r = queue.get()
+        p.join()
+        label = model_type if precision is None else f'{model_type}-{precision}'
+        print(f"{label:>20} {r['interpreter']:>15} {r['rss_mib']:>10.1f} {r['single_ms']:>11.3f} {r['batch_ms']:>13.3f} {str(r['tensorflow_loaded']):>10}")
+
+
+if __name__ == '__main__':
+    main()
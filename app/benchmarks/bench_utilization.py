@@ -0,0 +1,54 @@
+"""
+설비 가동률 엔진(compute_utilization) 벤치마크 - 1개월 x 13 스테이션 합성 실적 (DB 없음)
+
+사용법 (app 디렉토리에서 실행):
+    python -m benchmarks.bench_utilization --intervals 3000000
+    python -m benchmarks.bench_utilization --intervals 3000000 --bucket day
+"""
+import argparse
+import time
+from datetime import datetime
+
+import numpy as np
+
+from services.utilization import bucket_edges, compute_utilization
+
+N_STATIONS = 13
+SPAN_SEC = 31 * 86400
+
+
+def synthetic_intervals(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    codes = rng.integers(0, N_STATIONS, n)
+    starts = rng.integers(-3600, SPAN_SEC, n)          # 일부는 조회 시작 이전에 시작
+    # 스테이션당 평균 부하 0.7 (겹침 병합 후 가동률 약 50%)
+    mean_sec = 0.7 * SPAN_SEC * N_STATIONS / n
+    ends = starts + np.maximum(rng.exponential(mean_sec, n).astype(np.int64), 1)
+    return codes, starts, ends
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--intervals", type=int, default=3_000_000)
+    parser.add_argument("--bucket", choices=["day", "shift"], default="shift")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    codes, starts, ends = synthetic_intervals(args.intervals)
+    edges = bucket_edges(SPAN_SEC, datetime(2025, 1, 1), args.bucket)
+
+    times = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        result = compute_utilization(codes, starts, ends, N_STATIONS, SPAN_SEC, edges)
+        times.append(time.perf_counter() - started)
+
+    busy = result["busy"].sum(axis=1)
+    merged = len(result["merged"][0])
+    print(f"실적 {args.intervals:,}건 -> 병합 구간 {merged:,}건, 스테이션 {N_STATIONS} x 버킷 {len(edges) - 1}")
+    print(f"소요시간: 최소 {min(times) * 1000:.1f} ms / 중앙값 {sorted(times)[len(times) // 2] * 1000:.1f} ms")
+    print(f"평균 가동률: {busy.mean() / SPAN_SEC * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+운영 모드(gunicorn.conf.py) 워커 수별 처리량 벤치마크
+워커 수마다 gunicorn 을 띄우고 모든 워커가 준비(/health 200)되면 부하를 건 뒤
+처리량(req/s), 지연(p50/p99), 워커 프로세스 메모리(PSS 합 / 워커당 고유 USS)를 출력
+(DB 접속 환경변수 필요 - 기동 시 부트스트랩/모델 로드 수행)
+
+사용법 (app 디렉토리에서 실행):
+    python -m benchmarks.bench_workers
+    python -m benchmarks.bench_workers --workers 1 2 4 8 --path /api/v1/orders --clients 32 --duration 15
+"""
+import argparse
+import http.client
+import os
+import signal
+import socket
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(port: int, workers: int, timeout: float = 180.0) -> set:
+    """서로 다른 워커 pid 가 workers 개 모두 ready 로 응답할 때까지 /health 반복 조회"""
+    import json
+    pids = set()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            conn.request('GET', '/health')
+            res = conn.getresponse()
+            body = json.loads(res.read())
+            conn.close()
+            if res.status == 200:
+                pids.add(body['worker']['pid'])
+                if len(pids) >= workers:
+                    return pids
+        except (OSError, ValueError, KeyError):
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(f'워커 준비 시간 초과 ({len(pids)}/{workers})')
+
+
+def client_loop(port: int, path: str, duration: float) -> list:
+    # keep-alive 연결 1개로 duration 초 동안 반복 요청, 요청별 지연(초) 목록 반환
+    latencies = []
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        try:
+            conn.request('GET', path)
+            conn.getresponse().read()
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - started)
+    conn.close()
+    return latencies
+
+
+def process_memory(pid: int) -> tuple:
+    """(PSS, USS) 바이트 - 공유 페이지는 PSS 에서 공유 프로세스 수로 나뉘어 계산됨"""
+    values = {}
+    for line in Path(f'/proc/{pid}/smaps_rollup').read_text().splitlines()[1:]:
+        key, value = line.split(':', 1)
+        values[key] = int(value.split()[0]) * 1024
+    return values.get('Pss', 0), values.get('Private_Clean', 0) + values.get('Private_Dirty', 0)
+
+
+def children(pid: int) -> list:
+    path = Path(f'/proc/{pid}/task/{pid}/children')
+    return [int(p) for p in path.read_text().split()] if path.exists() else []
+
+
+def run(workers: int, path: str, clients: int, duration: float) -> dict:
+    port = free_port()
+    env = {**os.environ, 'WEB_CONCURRENCY': str(workers), 'BIND': f'127.0.0.1:{port}', 'WORKER_MAX_REQUESTS': '0'}
+    proc = subprocess.Popen(
+        ['gunicorn', '-c', 'gunicorn.conf.py', '--access-logfile', '/dev/null', 'main:app'],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        started = time.perf_counter()
+        wait_ready(port, workers)
+        startup_sec = time.perf_counter() - started
+
+        with ProcessPoolExecutor(max_workers=clients) as pool:
+            results = list(pool.map(client_loop, [port] * clients, [path] * clients, [duration] * clients))
+        latencies = sorted(x for r in results for x in r)
+
+        worker_pids = children(proc.pid)
+        memory = [process_memory(p) for p in [proc.pid, *worker_pids]]
+        return {
+            'workers': workers,
+            'startup_sec': startup_sec,
+            'rps': len(latencies) / duration,
+            'p50_ms': latencies[len(latencies) // 2] * 1000 if latencies else None,
+            'p99_ms': latencies[int(len(latencies) * 0.99)] * 1000 if latencies else None,
+            'pss_mb': sum(m[0] for m in memory) / 2**20,
+            'uss_per_worker_mb': sum(m[1] for m in memory[1:]) / max(len(worker_pids), 1) / 2**20,
+        }
+    finally:
+        proc.send_signal(signal.SIGTERM)
+        proc.wait(timeout=60)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--path', default='/health')
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10.0)
+    args = parser.parse_args()
+
+    print(f'GET {args.path} - 동시 클라이언트 {args.clients}, {args.duration:.0f}초')
+    print(f'{"workers":>8}{"기동(s)":>9}{"req/s":>10}{"p50(ms)":>10}{"p99(ms)":>10}{"PSS합(MB)":>11}{"워커USS(MB)":>12}')
+    for n in args.workers:
+        r = run(n, args.path, args.clients, args.duration)
+        print(f'{r["workers"]:>8}{r["startup_sec"]:>9.1f}{r["rps"]:>10.0f}{r["p50_ms"] or 0:>10.1f}'
+              f'{r["p99_ms"] or 0:>10.1f}{r["pss_mb"]:>11.0f}{r["uss_per_worker_mb"]:>12.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import insert
+
+from core.database import Base, engine
+from core import init_database  # noqa: F401 - 모든 모델을 Base.metadata 에 등록
+from core.init_master_data import master_rows, seed_master_data
+from core.partitioning import PARTITIONING_ENABLED, ensure_partitions
+from models.schema_meta import SchemaMeta
+
+# 기동 시 스키마 생성 + 마스터 데이터 시딩 (워커 수와 무관하게 1회)
+# - 지문 = 모델 메타데이터(테이블/컬럼/타입/인덱스/제약) + 마스터 데이터 정의의 sha256
+# - schema_meta 의 지문이 현재 지문과 같으면 조회 1회로 종료 (create_all/시딩 생략)
+# - 다르면 advisory 락(트랜잭션 범위)을 잡고 다시 확인 후 create_all + 마스터 bulk upsert + 지문 기록
+#   동시에 기동한 다른 워커는 락 대기 후 갱신된 지문을 보고 생략
+# - 파티션 생성(ensure_partitions)은 월이 바뀌는 경우가 있으므로 지문과 무관하게 매번 실행 (자체 advisory 락)
+# - BOOTSTRAP_FORCE=1 이면 지문이 같아도 다시 적용
+
+BOOTSTRAP_LOCK_KEY = 0x4D45530002
+META_KEY = 'bootstrap'
+FORCE = os.getenv('BOOTSTRAP_FORCE', '0') == '1'
+
+
+def schema_fingerprint() -> str:
+    dialect = postgresql.dialect()
+    tables = []
+    for table in Base.metadata.sorted_tables:
+        tables.append({
+            'name': table.name,
+            'columns': [
+                [c.name, str(c.type.compile(dialect=dialect)), c.nullable, c.primary_key] for c in table.columns
+            ],
+            'indexes': sorted(
+                [i.name or '', [str(e) for e in i.expressions], bool(i.unique)] for i in table.indexes
+            ),
+            'constraints': sorted(c.name or type(c).__name__ for c in table.constraints),
+            'options': {k: str(v) for k, v in sorted(table.dialect_kwargs.items())},
+        })
+    masters = [[model.__tablename__, rows] for model, rows in master_rows()]
+    payload = json.dumps({'tables': tables, 'masters': masters}, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def current_marker(conn) -> str | None:
+    if conn.execute(text("SELECT to_regclass('schema_meta')")).scalar() is None:
+        return None
+    return conn.execute(select(SchemaMeta.value).where(SchemaMeta.key == META_KEY)).scalar()
+
+
+def bootstrap(bind=engine, force: bool = FORCE) -> dict:
+    """스키마/마스터 데이터 적용 (지문이 같으면 생략), 반환: {"mode", "elapsed_ms", ...}"""
+    started = time.perf_counter()
+    fingerprint = schema_fingerprint()
+    stats = {'mode': 'skipped', 'fingerprint': fingerprint[:12]}
+
+    with bind.connect() as conn:
+        current = None if force else current_marker(conn)
+
+    if current != fingerprint:
+        with bind.begin() as conn:
+            conn.execute(text("SELECT pg_advisory_xact_lock(:k)"), {'k': BOOTSTRAP_LOCK_KEY})
+            # 락 대기 중 다른 워커가 적용했으면 생략
+            if force or current_marker(conn) != fingerprint:
+                Base.metadata.create_all(bind=conn)
+                stats['inserted'] = seed_master_data(conn)
+                stmt = insert(SchemaMeta).values(key=META_KEY, value=fingerprint, updated_ts=datetime.utcnow())
+                conn.execute(stmt.on_conflict_do_update(
+                    index_elements=['key'],
+                    set_={'value': stmt.excluded.value, 'updated_ts': stmt.excluded.updated_ts},
+                ))
+                stats['mode'] = 'applied'
+
+    if PARTITIONING_ENABLED:
+        # 실적 테이블 월 파티션 (DEFAULT + 과거 데이터 월 ~ 미래 N개월)
+        created = ensure_partitions(bind)
+        if created:
+            stats['partitions'] = created
+
+    stats['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    return stats
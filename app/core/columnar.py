@@ -0,0 +1,42 @@
+from decimal import Decimal
+import orjson
+from fastapi.responses import Response
+
+# 컬럼형(column-oriented) JSON 응답
+# - 쿼리 결과 행 튜플을 행별 dict 로 바꾸지 않고 zip(*rows) 로 필드별 배열로 전치
+#   {"fields": [...], "columns": [[필드1 값...], [필드2 값...]], "count": n}
+#   키 이름이 행마다 반복되지 않아 응답 크기와 중간 객체 할당이 줄어듦
+# - orjson 으로 직렬화 (UUID/datetime/date 는 orjson 이 직접 처리, Decimal 은 float)
+
+
+def _default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError
+
+
+def columnar(fields: list, rows) -> dict:
+    """행 튜플 목록 -> 필드별 배열"""
+    rows = rows if isinstance(rows, list) else list(rows)
+    columns = [list(col) for col in zip(*rows)] if rows else [[] for _ in fields]
+    return {"fields": list(fields), "columns": columns, "count": len(rows)}
+
+
+def query_columnar(q, limit: int | None = None, offset: int = 0) -> dict:
+    """ORM 쿼리 결과를 컬럼형으로 (필드 이름은 SELECT 컬럼/라벨 이름)"""
+    if limit is not None:
+        q = q.limit(limit)
+    if offset:
+        q = q.offset(offset)
+    return columnar([c["name"] for c in q.column_descriptions], q.all())
+
+
+def dumps(content) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+class ColumnarResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return dumps(content)
@@ -14,10 +14,28 @@ POSTGRES_PORT = os.getenv("POSTGRES_PORT", "5432")
 
 DATABASE_URL = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DB}"
 
+# 읽기 복제본 (선택) - POSTGRES_REPLICA_HOST 가 없으면 읽기도 primary 사용 (core/db_routing.py)
+POSTGRES_REPLICA_HOST = os.getenv("POSTGRES_REPLICA_HOST")
+POSTGRES_REPLICA_PORT = os.getenv("POSTGRES_REPLICA_PORT", POSTGRES_PORT)
+REPLICA_DATABASE_URL = (
+    f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_REPLICA_HOST}:{POSTGRES_REPLICA_PORT}/{POSTGRES_DB}"
+    if POSTGRES_REPLICA_HOST else None
+)
+
 # SQLAlchemy 엔진과 세션 생성
 engine = create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 읽기 전용 엔진/세션 (복제본 장애 감지를 위해 pre_ping)
+# 응답 없는 복제본 호스트에 OS TCP 타임아웃까지 묶이지 않도록 접속 타임아웃 지정
+REPLICA_CONNECT_TIMEOUT_SEC = int(os.getenv("REPLICA_CONNECT_TIMEOUT_SEC", "2"))
+read_engine = (
+    create_engine(REPLICA_DATABASE_URL, pool_pre_ping=True,
+                  connect_args={"connect_timeout": REPLICA_CONNECT_TIMEOUT_SEC})
+    if REPLICA_DATABASE_URL else engine
+)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
 # 베이스 클래스 정의
 Base = declarative_base()
 
@@ -0,0 +1,146 @@
+import os
+import threading
+import time
+from fastapi import Request
+from sqlalchemy import text
+
+from core.database import engine, read_engine, SessionLocal, ReadSessionLocal
+
+# 읽기/쓰기 세션 라우팅 (읽기 복제본)
+# - 쓰기와 스테이션 OLTP 경로: get_db (primary)
+# - 읽기 전용 조회(대시보드/분석/예측 이력/목록/API): get_read_db -> 다음 경우가 아니면 복제본
+#   1) 복제본 미설정 (POSTGRES_REPLICA_HOST 없음)
+#   2) read-your-writes: 최근 READ_YOUR_WRITES_SEC 초 안에 쓰기 요청(POST/PUT/PATCH/DELETE 성공)을 한 클라이언트
+#      (ReadYourWritesMiddleware 가 쿠키로 표시 -> 등록 후 목록으로 redirect 되면 primary 에서 조회)
+#   3) 복제 지연 > REPLICA_MAX_LAG_SEC 또는 복제본 접속 실패 -> primary 로 failover
+# - 지연 확인은 워커별 백그라운드 스레드가 REPLICA_CHECK_SEC(1초) 마다 수행, 요청은 마지막 결과만 읽음
+#   (복제본 호스트가 응답하지 않아도 요청 경로는 막히지 않음, 첫 확인 전에는 primary)
+#   지연 = primary WAL 위치까지 재생했으면 0, 아니면 마지막 재생 트랜잭션 이후 경과 시간
+#   접속은 REPLICA_CONNECT_TIMEOUT_SEC, 조회는 PROBE_STATEMENT_TIMEOUT_MS 로 제한
+
+REPLICA_ENABLED = read_engine is not engine
+REPLICA_MAX_LAG_SEC = float(os.getenv('REPLICA_MAX_LAG_SEC', '5'))
+REPLICA_CHECK_SEC = 1.0
+PROBE_STATEMENT_TIMEOUT_MS = 1000
+READ_YOUR_WRITES_SEC = int(os.getenv('READ_YOUR_WRITES_SEC', '10'))
+READ_YOUR_WRITES_COOKIE = 'mes_wrote_at'
+WRITE_METHODS = {'POST', 'PUT', 'PATCH', 'DELETE'}
+
+_lock = threading.Lock()
+_replica = {'checked_at': None, 'usable': False, 'lag_sec': None, 'error': None}
+_probe = {'pid': None}          # 확인 스레드를 시작한 프로세스 (fork 후 워커에서 다시 시작)
+
+
+def _statement_timeout(conn):
+    # 트랜잭션 범위 설정 (커넥션이 풀로 반환될 때 롤백되어 다른 조회에는 영향 없음)
+    conn.execute(text(f"SET LOCAL statement_timeout = {PROBE_STATEMENT_TIMEOUT_MS}"))
+
+
+def replica_lag_sec() -> float:
+    """복제본 지연(초) - 복제 중이 아닌 독립 인스턴스(로컬 대체용)는 0"""
+    with engine.connect() as conn:
+        _statement_timeout(conn)
+        primary_lsn = conn.execute(text("SELECT pg_current_wal_lsn()::text")).scalar()
+    with read_engine.connect() as conn:
+        _statement_timeout(conn)
+        in_recovery, behind_bytes, since_replay = conn.execute(text(
+            "SELECT pg_is_in_recovery(),"
+            " pg_wal_lsn_diff(CAST(:lsn AS pg_lsn), pg_last_wal_replay_lsn()),"
+            " EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())"
+        ), {'lsn': primary_lsn}).one()
+    if not in_recovery or (behind_bytes is not None and behind_bytes <= 0):
+        return 0.0
+    return float(since_replay) if since_replay is not None else float('inf')
+
+
+def check_replica() -> bool:
+    """복제 지연 1회 확인 후 상태 갱신"""
+    try:
+        lag, error = replica_lag_sec(), None
+    except Exception as e:
+        lag, error = None, str(e)
+    usable = lag is not None and lag <= REPLICA_MAX_LAG_SEC
+
+    with _lock:
+        if _replica['usable'] != usable or (error and error != _replica['error']):
+            print(f"읽기 복제본 {'사용' if usable else 'failover -> primary'} (지연 {lag}초{', ' + error if error else ''})")
+        _replica.update(checked_at=time.monotonic(), usable=usable, lag_sec=lag, error=error)
+    return usable
+
+
+def _probe_loop():
+    while True:
+        started = time.monotonic()
+        check_replica()
+        time.sleep(max(0.0, REPLICA_CHECK_SEC - (time.monotonic() - started)))
+
+
+def _ensure_probe():
+    pid = os.getpid()
+    with _lock:
+        if _probe['pid'] == pid:
+            return
+        _probe['pid'] = pid
+    threading.Thread(target=_probe_loop, name='replica-lag-probe', daemon=True).start()
+
+
+def replica_usable() -> bool:
+    """복제본 사용 가능 여부 (백그라운드 확인 결과, 마지막 확인이 오래되었으면 사용 안 함)"""
+    if not REPLICA_ENABLED:
+        return False
+    _ensure_probe()
+    with _lock:
+        checked_at = _replica['checked_at']
+        # 확인이 멈춘 경우(조회가 타임아웃까지 걸리는 중 등) 오래된 결과로 복제본을 쓰지 않음
+        fresh = checked_at is not None and time.monotonic() - checked_at < REPLICA_CHECK_SEC + REPLICA_MAX_LAG_SEC
+        return _replica['usable'] and fresh
+
+
+def replica_status() -> dict:
+    with _lock:
+        return {'enabled': REPLICA_ENABLED, 'max_lag_sec': REPLICA_MAX_LAG_SEC, **_replica}
+
+
+def recently_wrote(request) -> bool:
+    value = request.cookies.get(READ_YOUR_WRITES_COOKIE) if request is not None else None
+    try:
+        return value is not None and float(value) + READ_YOUR_WRITES_SEC > time.time()
+    except ValueError:
+        return False
+
+
+def read_session(request=None):
+    """읽기 전용 조회 세션 (복제본 또는 primary)"""
+    if not recently_wrote(request) and replica_usable():
+        return ReadSessionLocal()
+    return SessionLocal()
+
+
+# 읽기 전용 요청 단위 세션 의존성 (get_db 와 같은 방식으로 사용, 이 세션으로는 쓰지 않음)
+def get_read_db(request: Request):
+    db = read_session(request)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+class ReadYourWritesMiddleware:
+    """성공한 쓰기 요청 응답에 쓰기 시각 쿠키 설정 (복제본 사용 시에만)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if not REPLICA_ENABLED or scope['type'] != 'http' or scope['method'] not in WRITE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message):
+            if message['type'] == 'http.response.start' and message['status'] < 400:
+                cookie = (f"{READ_YOUR_WRITES_COOKIE}={time.time():.3f}; Max-Age={READ_YOUR_WRITES_SEC};"
+                          f" Path=/; HttpOnly; SameSite=Lax")
+                message = {**message, 'headers': [*message.get('headers', []), (b'set-cookie', cookie.encode())]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
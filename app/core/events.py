@@ -0,0 +1,112 @@
+import asyncio
+import itertools
+import json
+import threading
+from datetime import datetime
+
+from core import fanout
+
+# 프로세스 내 pub/sub 이벤트 버스 (공정진행/작업지시/품질 변경 delta -> SSE 클라이언트)
+# - publish 는 어느 스레드에서든 호출 가능 (동기 라우트 스레드풀, 그룹 커밋 버퍼 스레드)
+# - 이벤트는 1회만 JSON 직렬화하고, 구독자 필터(line/product_id/status/type)는 발행 시점에 메모리에서 검사
+#   -> 클라이언트 수와 무관하게 DB 조회 없음
+# - 구독자 큐는 이벤트 루프별로 모아 call_soon_threadsafe 1회로 전달
+# - 느린 클라이언트: 큐가 가득 차면 비우고 resync 이벤트 전달 (클라이언트가 전체 새로고침)
+# - 워커 프로세스별 버스 -> 다중 워커 배포 시 발행한 이벤트를 core/fanout.py 로 다른 워커에도 전달
+#   (다른 워커에서 온 이벤트는 로컬 구독자에게만 전달, event id 는 워커별 순번)
+
+FILTER_KEYS = ('type', 'line', 'product_id', 'status')
+CLIENT_QUEUE_SIZE = 256
+RESYNC = 'resync'
+
+
+class Subscription:
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, filters: dict):
+        self.loop = loop
+        # 필터 값은 집합 (예: status=S1_READY,S2_ASSEMBLY)
+        self.filters = {k: set(v) for k, v in filters.items() if k in FILTER_KEYS and v}
+        self.queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        self.dropped = 0
+
+    def matches(self, event: dict) -> bool:
+        for key, wanted in self.filters.items():
+            if key == 'status':
+                # 상태 필터는 이전 상태도 검사 (필터 대상에서 빠져나가는 오더도 전달)
+                if event.get('status') not in wanted and event.get('prev_status') not in wanted:
+                    return False
+            elif key in event and event[key] is not None and event[key] not in wanted:
+                # 해당 속성이 없는 이벤트(예: 라인 정보 없는 작업지시 생성)는 통과
+                return False
+        return True
+
+    def offer(self, item: tuple):
+        # 이벤트 루프 스레드에서 실행
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait((0, RESYNC, '{}'))
+
+
+class EventBus:
+
+    def __init__(self):
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._seq = itertools.count(1)
+        self.published = 0
+
+    def subscribe(self, filters: dict | None = None) -> Subscription:
+        """이벤트 루프 안에서 호출"""
+        sub = Subscription(asyncio.get_running_loop(), filters or {})
+        with self._lock:
+            self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    def client_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, event_type: str, event: dict, forward: bool = True):
+        """event_type: SSE event 이름 (order / quality / alert ...), forward: 다른 워커에도 전달"""
+        event_id = next(self._seq)
+        event = {'type': event_type, 'ts': datetime.utcnow().isoformat(timespec='milliseconds'), **event}
+        if forward:
+            fanout.send('event', event)
+        with self._lock:
+            targets = [sub for sub in self._subscribers if sub.matches(event)]
+        self.published += 1
+        if not targets:
+            return
+
+        item = (event_id, event_type, json.dumps(event, default=str, ensure_ascii=False))
+        by_loop = {}
+        for sub in targets:
+            by_loop.setdefault(sub.loop, []).append(sub)
+        for loop, subs in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(_deliver, subs, item)
+            except RuntimeError:
+                # 종료된 이벤트 루프
+                for sub in subs:
+                    self.unsubscribe(sub)
+
+
+def _deliver(subs: list, item: tuple):
+    for sub in subs:
+        sub.offer(item)
+
+
+def format_sse(event_id: int, event_type: str, data: str) -> str:
+    return f"id: {event_id}\nevent: {event_type}\ndata: {data}\n\n"
+
+
+# 전역 이벤트 버스
+bus = EventBus()
+fanout.register('event', lambda event: bus.publish(event['type'], event, forward=False))
@@ -0,0 +1,153 @@
+import json
+import os
+import queue
+import select
+import threading
+import psycopg2
+from sqlalchemy import text
+
+from core.database import DATABASE_URL, engine
+
+# 워커 프로세스 간 변경 알림 fan-out (Postgres LISTEN/NOTIFY, 운영 모드 멀티 워커용)
+# - 이벤트 버스(SSE), OEE/지연 위험 dirty 표시, 품질 분석 캐시 무효화는 워커 프로세스별 상태
+#   -> 변경을 처리한 워커가 NOTIFY 로 알리고 다른 워커는 자기 메모리에 같은 처리를 적용
+# - 보내기: 호출 스레드는 큐에만 넣음 (요청 경로에서 DB 왕복 없음)
+#   송신 스레드가 모아서 1 트랜잭션의 pg_notify x N 으로 전송
+# - 받기: 워커별 LISTEN 전용 커넥션 스레드, 자기 pid 가 보낸 알림은 무시
+#   핸들러는 kind 별로 register() - 수신 측은 로컬 처리 함수만 호출 (다시 보내지 않음)
+# - EVENT_FANOUT=1 일 때만 동작 (gunicorn.conf.py 가 워커 2개 이상이면 기본 1 로 설정)
+# - 재접속 중 놓친 알림은 복구하지 않음 (OEE 진행 중 교대 / 지연 위험 전체 재계산 주기로 보정)
+
+EVENT_FANOUT = os.getenv('EVENT_FANOUT', '0') == '1'
+CHANNEL = 'mes_fanout'
+MAX_QUEUE = 10_000
+MAX_BATCH = 500
+MAX_PAYLOAD = 7_900           # NOTIFY 페이로드 상한 8000 bytes
+RECONNECT_SEC = 2.0
+
+_handlers = {}                # kind -> handler(data)
+_queue = queue.Queue(maxsize=MAX_QUEUE)
+_stop = threading.Event()
+_threads = []
+_stats = {'sent': 0, 'received': 0, 'dropped': 0, 'errors': 0, 'listening': False}
+
+
+def register(kind: str, handler):
+    """다른 워커에서 온 알림 처리 함수 (data 는 send 에 넘긴 JSON 직렬화 가능한 값)"""
+    _handlers[kind] = handler
+
+
+def send(kind: str, data=None):
+    """다른 워커에 알림 (fan-out 미사용 또는 미기동 시 무시)"""
+    if not _threads:
+        return
+    try:
+        _queue.put_nowait((kind, data))
+    except queue.Full:
+        _stats['dropped'] += 1
+
+
+def _encode(kind: str, data) -> str | None:
+    payload = json.dumps({'pid': os.getpid(), 'kind': kind, 'data': data}, default=str, ensure_ascii=False)
+    if len(payload.encode()) > MAX_PAYLOAD:
+        print(f"fanout: 페이로드 상한 초과로 전달 안 함 ({kind}, {len(payload.encode())} bytes)")
+        _stats['dropped'] += 1
+        return None
+    return payload
+
+
+def _send_loop():
+    while True:
+        item = _queue.get()
+        if item is None:
+            break
+        batch = [item]
+        while len(batch) < MAX_BATCH:
+            try:
+                item = _queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                _queue.put(None)
+                break
+            batch.append(item)
+
+        payloads = [p for p in (_encode(kind, data) for kind, data in batch) if p is not None]
+        if not payloads:
+            continue
+        try:
+            with engine.begin() as conn:
+                conn.execute(
+                    text("SELECT pg_notify(:channel, p) FROM unnest(CAST(:payloads AS text[])) AS p"),
+                    {'channel': CHANNEL, 'payloads': payloads},
+                )
+            _stats['sent'] += len(payloads)
+        except Exception as e:
+            _stats['errors'] += 1
+            _stats['dropped'] += len(payloads)
+            print(f"fanout: 전송 실패 ({len(payloads)}건): {e}")
+
+
+def _dispatch(payload: str):
+    try:
+        message = json.loads(payload)
+        if message['pid'] == os.getpid():
+            return
+        handler = _handlers.get(message['kind'])
+        if handler is not None:
+            handler(message['data'])
+            _stats['received'] += 1
+    except Exception as e:
+        _stats['errors'] += 1
+        print(f"fanout: 수신 처리 실패: {e!r}")
+
+
+def _listen_loop():
+    while not _stop.is_set():
+        conn = None
+        try:
+            conn = psycopg2.connect(DATABASE_URL, connect_timeout=5)
+            conn.autocommit = True
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {CHANNEL}")
+            _stats['listening'] = True
+            while not _stop.is_set():
+                if select.select([conn], [], [], 1.0) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    _dispatch(conn.notifies.pop(0).payload)
+        except Exception as e:
+            _stats['errors'] += 1
+            print(f"fanout: LISTEN 연결 오류, {RECONNECT_SEC}초 후 재접속: {e}")
+        finally:
+            _stats['listening'] = False
+            if conn is not None:
+                conn.close()
+        _stop.wait(RECONNECT_SEC)
+
+
+def start():
+    """워커 startup 에서 호출 (fork 후 - 스레드/커넥션은 워커별)"""
+    if not EVENT_FANOUT or _threads:
+        return
+    _stop.clear()
+    for target, name in ((_send_loop, 'fanout-send'), (_listen_loop, 'fanout-listen')):
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        _threads.append(thread)
+    print(f"fanout 시작 (LISTEN {CHANNEL}, pid {os.getpid()})")
+
+
+def stop(timeout: float = 5):
+    if not _threads:
+        return
+    _stop.set()
+    _queue.put(None)
+    for thread in _threads:
+        thread.join(timeout)
+    _threads.clear()
+
+
+def status() -> dict:
+    return {'enabled': EVENT_FANOUT, 'pending': _queue.qsize(), **_stats}
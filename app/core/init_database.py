@@ -1,4 +1,5 @@
 from core.database import Base, engine
+from core.partitioning import PARTITIONING_ENABLED, ensure_partitions
 
 # 생산관리 마스터
 from models import master_product
@@ -12,9 +13,30 @@ from models import master_inspection_item
 
 from models.work_order import WorkOrder
 from models.work_result import WorkResult
+from models.order_status_history import OrderStatusHistory
 
 from models.quality_inspection import QualityInspection
 from models.quality_result import QualityResult
 
+# 검사항목 측정값 / SPC 부분군 통계
+from models.quality_measurement import QualityMeasurement
+from models.spc_subgroup import SpcSubgroup
+from models.spc_item_stats import SpcItemStats
+
+# 보관기간 경과 실적 일별 집계
+from models.work_result_daily import WorkResultDaily
+from models.quality_result_daily import QualityResultDaily
+
+# 설비 x 교대 OEE 집계
+from models.oee_shift import OeeShift
+
+# 스키마/마스터 데이터 적용 버전 표식
+from models.schema_meta import SchemaMeta
+
 def create_tables():
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    Base.metadata.create_all(bind=engine)
+    if PARTITIONING_ENABLED:
+        # 실적 테이블 월 파티션 (DEFAULT + 과거 데이터 월 ~ 미래 N개월)
+        created = ensure_partitions(engine)
+        if created:
+            print(f"파티션 생성: {created}")
\ No newline at end of file
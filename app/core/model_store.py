@@ -0,0 +1,87 @@
+import os
+import json
+import numpy as np
+from datetime import datetime
+from pathlib import Path
+
+# 모델 아티팩트를 NumPy 배열(.npy) 단위로 저장/로드
+# - .npy 는 np.load(mmap_mode='r') 로 페이지 캐시에 읽기 전용 매핑되므로
+#   같은 파일을 여는 모든 워커 프로세스가 물리 메모리를 공유함
+# - 배포 시 scripts/convert_model_artifacts.py 로 pkl/keras -> mmap 디렉토리 변환
+
+MANIFEST_NAME = 'manifest.json'
+MMAP_DIR_NAME = 'mmap'
+
+# MODEL_MMAP=0 이면 mmap 아티팩트가 있어도 기존 pkl/keras 로드
+MODEL_MMAP_ENABLED = os.getenv('MODEL_MMAP', '1') != '0'
+
+
+def mmap_artifact_dir(model_dir: Path, name: str) -> Path:
+    return Path(model_dir) / MMAP_DIR_NAME / name
+
+
+def has_artifact(directory: Path) -> bool:
+    return MODEL_MMAP_ENABLED and (Path(directory) / MANIFEST_NAME).exists()
+
+
+def save_arrays(directory: Path, arrays: dict, meta: dict | None = None):
+    """배열 dict 를 디렉토리에 .npy 파일들 + manifest.json 으로 저장"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    for name, arr in arrays.items():
+        arr = np.ascontiguousarray(arr)
+        if arr.dtype == object:
+            raise ValueError(f"object 배열은 mmap 저장 불가: {name}")
+        np.save(directory / f'{name}.npy', arr, allow_pickle=False)
+
+    manifest = {'arrays': list(arrays.keys()), 'meta': meta or {}}
+    with open(directory / MANIFEST_NAME, 'w') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+
+def load_arrays(directory: Path, mmap_mode: str | None = 'r') -> tuple[dict, dict]:
+    """저장된 배열을 읽기 전용 메모리 매핑으로 로드 -> (arrays, meta)"""
+    directory = Path(directory)
+    with open(directory / MANIFEST_NAME, 'r') as f:
+        manifest = json.load(f)
+
+    arrays = {
+        name: np.load(directory / f'{name}.npy', mmap_mode=mmap_mode, allow_pickle=False)
+        for name in manifest['arrays']
+    }
+    return arrays, manifest['meta']
+
+
+# 버전 디렉토리 레이아웃: <root>/<version>/..., <root>/LATEST 에 현재 서비스 버전 기록
+LATEST_NAME = 'LATEST'
+
+
+def new_version_dir(root: Path) -> Path:
+    """학습 시각 기반 새 버전 디렉토리 생성 (예: v20251019-093000)"""
+    root = Path(root)
+    version = datetime.now().strftime('v%Y%m%d-%H%M%S')
+    path = root / version
+    suffix = 1
+    while path.exists():
+        path = root / f'{version}-{suffix}'
+        suffix += 1
+    path.mkdir(parents=True)
+    return path
+
+
+def promote_version(root: Path, version: str):
+    """LATEST 포인터를 원자적으로 교체 (읽는 워커는 항상 완전한 버전만 봄)"""
+    root = Path(root)
+    if not (root / version).is_dir():
+        raise FileNotFoundError(f"버전 디렉토리 없음: {root / version}")
+    tmp = root / f'.{LATEST_NAME}.tmp'
+    tmp.write_text(version)
+    os.replace(tmp, root / LATEST_NAME)
+
+
+def latest_version_dir(root: Path) -> Path | None:
+    latest = Path(root) / LATEST_NAME
+    if not latest.exists():
+        return None
+    return Path(root) / latest.read_text().strip()
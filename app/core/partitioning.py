@@ -0,0 +1,154 @@
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+from sqlalchemy import text
+
+# work_results / quality_results 월 단위 range 파티셔닝 (옵트인: DB_PARTITIONING=1)
+# - 모델: PARTITION BY RANGE (start_ts), 파티션 키 포함 PK (result_id, start_ts)
+# - 파티션: <table>_pYYYYMM (해당 월), <table>_default (범위 밖 데이터)
+# - 기동 시(core/bootstrap.py) 와 create_tables() 에서 DEFAULT 에 남은 데이터 월 ~ 현재 + PARTITION_MONTHS_AHEAD 개월 파티션 생성,
+#   이후 하루 1회 백그라운드에서 미래 파티션 추가
+# - 기존 비파티션 테이블 전환: python -m scripts.partition_tables
+# - 파티션 프루닝 확인: python -m scripts.check_partition_pruning
+
+PARTITIONING_ENABLED = os.getenv('DB_PARTITIONING', '0') == '1'
+PARTITIONED_TABLES = ('work_results', 'quality_results')
+PARTITION_KEY = 'start_ts'
+PARTITION_MONTHS_AHEAD = int(os.getenv('PARTITION_MONTHS_AHEAD', '3'))
+MAINTENANCE_INTERVAL_SEC = 24 * 3600
+
+# 실적 목록/대시보드 기본 조회 기간 (일, 0 = 전체) - 최근 파티션만 스캔
+DEFAULT_LOOKBACK_DAYS = int(os.getenv('RESULT_LOOKBACK_DAYS', '31'))
+
+# 여러 워커가 동시에 파티션을 만들지 않도록 advisory lock 사용
+_ADVISORY_LOCK_KEY = 0x4D45530001
+
+
+def partitioned_table_args() -> dict:
+    """모델 __table_args__ (파티셔닝 비활성 시 빈 dict)"""
+    if not PARTITIONING_ENABLED:
+        return {}
+    return {'postgresql_partition_by': f'RANGE ({PARTITION_KEY})'}
+
+
+def month_start(d: date) -> date:
+    return date(d.year, d.month, 1)
+
+
+def add_months(d: date, months: int) -> date:
+    month = d.month - 1 + months
+    return date(d.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f'{table}_p{month:%Y%m}'
+
+
+def month_range(first: date, last: date) -> list:
+    """first ~ last 가 속한 월 시작일 목록"""
+    months, m = [], month_start(first)
+    while m <= last:
+        months.append(m)
+        m = add_months(m, 1)
+    return months
+
+
+def is_partitioned(conn, table: str) -> bool:
+    return conn.execute(
+        text("SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = :t"),
+        {'t': table},
+    ).first() is not None
+
+
+def existing_partitions(conn, table: str) -> set:
+    rows = conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = :t"
+        ),
+        {'t': table},
+    )
+    return {r[0] for r in rows}
+
+
+def _create_month_partition(conn, table: str, month: date):
+    name = partition_name(table, month)
+    lower, upper = month, add_months(month, 1)
+    default = f'{table}_default'
+    bounds = {'lower': datetime.combine(lower, datetime.min.time()), 'upper': datetime.combine(upper, datetime.min.time())}
+
+    in_default = conn.execute(
+        text(f"SELECT 1 FROM {default} WHERE {PARTITION_KEY} >= :lower AND {PARTITION_KEY} < :upper LIMIT 1"),
+        bounds,
+    ).first() is not None
+
+    if not in_default:
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+        ))
+        return
+
+    # DEFAULT 파티션에 이미 해당 월 행이 있으면 새 테이블로 옮긴 뒤 ATTACH
+    conn.execute(text(f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+    conn.execute(text(
+        f"WITH moved AS (DELETE FROM {default} WHERE {PARTITION_KEY} >= :lower AND {PARTITION_KEY} < :upper "
+        f"RETURNING *) INSERT INTO {name} SELECT * FROM moved"
+    ), bounds)
+    conn.execute(text(f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES FROM ('{lower}') TO ('{upper}')"))
+
+
+def ensure_partitions(engine, months_ahead: int = PARTITION_MONTHS_AHEAD, today: date | None = None) -> dict:
+    """
+    파티션 테이블마다 DEFAULT 파티션 + (기존 데이터 최초 월 ~ 현재 + months_ahead) 월 파티션 생성
+    반환: {table: [생성된 파티션 이름, ...]}
+    """
+    today = today or date.today()
+    created = {}
+    with engine.begin() as conn:
+        conn.execute(text("SELECT pg_advisory_xact_lock(:k)"), {'k': _ADVISORY_LOCK_KEY})
+        for table in PARTITIONED_TABLES:
+            if not is_partitioned(conn, table):
+                print(f"{table}: 파티션 테이블 아님 - python -m scripts.partition_tables 로 전환 필요")
+                continue
+
+            existing = existing_partitions(conn, table)
+            if f'{table}_default' not in existing:
+                conn.execute(text(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT"))
+                created.setdefault(table, []).append(f'{table}_default')
+
+            # 월 파티션이 없는 기간의 행은 DEFAULT 에 있으므로 DEFAULT 만 조회 (전체 스캔 없음)
+            first = conn.execute(text(f"SELECT min({PARTITION_KEY}) FROM {table}_default")).scalar()
+            first = min(first.date(), today) if first else today
+            for month in month_range(first, add_months(month_start(today), months_ahead)):
+                name = partition_name(table, month)
+                if name not in existing:
+                    _create_month_partition(conn, table, month)
+                    created.setdefault(table, []).append(name)
+    return created
+
+
+def start_partition_maintenance(engine, interval_sec: int = MAINTENANCE_INTERVAL_SEC):
+    """주기적으로 미래 파티션 생성 (daemon 스레드)"""
+    def run():
+        while True:
+            time.sleep(interval_sec)
+            try:
+                created = ensure_partitions(engine)
+                if created:
+                    print(f"파티션 생성: {created}")
+            except Exception as e:
+                print(f"파티션 유지보수 실패: {e}")
+
+    thread = threading.Thread(target=run, name='partition-maintenance', daemon=True)
+    thread.start()
+    return thread
+
+
+def lookback_start(days: int | None, now: datetime | None = None) -> datetime | None:
+    """목록/대시보드 조회 기간 하한 (days=None 또는 0 이면 전체 기간)"""
+    if not days:
+        return None
+    return (now or datetime.now()) - timedelta(days=days)
@@ -0,0 +1,91 @@
+import gc
+import os
+import time
+from pathlib import Path
+
+from core import fanout
+from core.database import engine
+from core.model_store import has_artifact, mmap_artifact_dir
+from services.ai_tflite import DNN_BACKEND
+
+# 멀티 프로세스 운영 모드 (gunicorn.conf.py, preload_app)
+# - 마스터: 앱 import 후 fork 전에 스키마 부트스트랩 + 모델 로드 -> gc.freeze() 로 로드된 객체를
+#   GC 추적 대상에서 제외 (워커에서 GC 가 객체 헤더를 건드려 공유 페이지가 복사되는 것 방지)
+# - TF 런타임이 필요한 모델(mmap 아티팩트 없음)은 fork 안전하지 않으므로 마스터에서 로드하지 않고 워커 기동 시 로드
+# - 워커: fork 직후 상속된 DB 커넥션 풀 폐기, 기동(startup) 완료 시 ready 표시 -> /health 에서 워커별 상태 확인
+# - 워커별 메모리 상태(이벤트 버스, dirty 표시, 캐시)는 core/fanout.py (LISTEN/NOTIFY) 로 워커 간 공유
+
+_state = {
+    'preloaded': [],           # 마스터에서 로드되어 copy-on-write 로 공유되는 모델
+    'ready': False,
+    'started_at': time.time(),
+    'ready_at': None,
+}
+
+# (서비스 getter 모듈, 함수, TF 없이 로드 가능 여부 판단용 (모델 디렉토리, 아티팩트 이름) 또는 None)
+# - DNN_BACKEND=tflite 면 DNN 은 워커 기동 시 로드 (인터프리터 수십 KB, fork 전 공유 이득 없음)
+PRELOAD_MODELS = [
+    ('services.ai_production_qty_prediction', 'get_production_qty_sklearn_service', None),
+    ('services.ai_work_time_prediction', 'get_work_time_sklearn_service', None),
+]
+if DNN_BACKEND == 'tensorflow':
+    PRELOAD_MODELS += [
+        ('services.ai_production_qty_prediction', 'get_production_qty_tensorflow_service',
+         ('ai_models/production_qty', 'dnn_production_qty_model')),
+        ('services.ai_work_time_prediction', 'get_work_time_tensorflow_service',
+         ('ai_models/work_time', 'dnn_work_time_model')),
+    ]
+
+
+def preload_master() -> dict:
+    """gunicorn 마스터에서 fork 전에 1회 실행"""
+    import importlib
+    from core.bootstrap import bootstrap
+
+    stats = {'bootstrap': bootstrap()}
+    for module, getter, tf_artifact in PRELOAD_MODELS:
+        if tf_artifact is not None and not has_artifact(mmap_artifact_dir(Path(tf_artifact[0]), tf_artifact[1])):
+            continue
+        try:
+            getattr(importlib.import_module(module), getter)()
+            _state['preloaded'].append(getter)
+        except Exception as e:
+            # 워커 기동 시 다시 시도 (실패 시 워커 로그에 원인 출력)
+            print(f"preload 실패 ({getter}): {e}")
+
+    # 마스터가 사용한 DB 커넥션을 워커가 공유하지 않도록 fork 전에 정리
+    engine.dispose()
+    gc.collect()
+    gc.freeze()
+    stats['preloaded'] = list(_state['preloaded'])
+    stats['frozen_objects'] = gc.get_freeze_count()
+    return stats
+
+
+def after_fork():
+    """워커 fork 직후 (gunicorn post_fork)"""
+    # 상속된 풀의 커넥션은 닫지 않고 버림 (닫으면 마스터/다른 워커와 공유된 소켓이 끊김)
+    engine.dispose(close=False)
+    _state['ready'] = False
+    _state['started_at'] = time.time()
+    _state['ready_at'] = None
+
+
+def mark_ready():
+    """워커 startup 완료"""
+    _state['ready'] = True
+    _state['ready_at'] = time.time()
+
+
+def worker_status() -> dict:
+    now = time.time()
+    return {
+        'pid': os.getpid(),
+        'ready': _state['ready'],
+        'uptime_sec': round(now - _state['started_at'], 1),
+        'startup_sec': round(_state['ready_at'] - _state['started_at'], 2) if _state['ready_at'] else None,
+        'preloaded': _state['preloaded'],
+        'dnn_backend': DNN_BACKEND,
+        'frozen_objects': gc.get_freeze_count(),
+        'fanout': fanout.status(),
+    }
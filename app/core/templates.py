@@ -1,2 +1,48 @@
+import os
+from pathlib import Path
+import jinja2
+from fastapi.responses import StreamingResponse
 from fastapi.templating import Jinja2Templates
-templates = Jinja2Templates(directory="templates")
\ No newline at end of file
+
+# 템플릿 환경
+# - 컴파일된 템플릿 바이트코드를 파일로 캐시 (재기동 후 첫 렌더링 시 파싱/컴파일 생략)
+#   템플릿 파일이 바뀌면 체크섬이 달라져 자동으로 다시 컴파일
+# - stream_template: 페이지 전체를 메모리에 만들지 않고 Template.generate() 로 조각 단위 전송
+#   (목록 행 루프가 DB 커서를 읽는 동안 응답이 나감)
+
+TEMPLATE_DIR = "templates"
+BYTECODE_CACHE_DIR = Path(os.getenv("TEMPLATE_BYTECODE_CACHE_DIR", ".jinja_cache"))
+STREAM_BUFFER_SIZE = 64     # 스트리밍 시 전송 단위 (generate() 조각 수)
+
+
+def _bytecode_cache() -> jinja2.BytecodeCache | None:
+    try:
+        BYTECODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None     # 쓰기 불가 환경에서는 캐시 없이 동작
+    return jinja2.FileSystemBytecodeCache(str(BYTECODE_CACHE_DIR))
+
+
+templates = Jinja2Templates(env=jinja2.Environment(
+    loader=jinja2.FileSystemLoader(TEMPLATE_DIR),
+    autoescape=jinja2.select_autoescape(),
+    bytecode_cache=_bytecode_cache(),
+))
+
+
+def stream_template(name: str, context: dict, status_code: int = 200, on_close=None) -> StreamingResponse:
+    """
+    템플릿 스트리밍 응답 (context 의 목록은 generator 가능 - 렌더링하면서 소비)
+    on_close: 전송 종료(완료/중단) 시 호출 (스트리밍용 DB 세션 종료 등)
+    """
+    stream = templates.get_template(name).stream(context)
+    stream.enable_buffering(STREAM_BUFFER_SIZE)
+
+    def body():
+        try:
+            yield from stream
+        finally:
+            if on_close is not None:
+                on_close()
+
+    return StreamingResponse(body(), status_code=status_code, media_type="text/html; charset=utf-8")
@@ -0,0 +1,57 @@
+"""
+운영 모드 gunicorn 설정 - 멀티 워커(uvicorn worker) + preload (core/serving.py)
+
+사용법 (app 디렉토리에서 실행):
+    gunicorn -c gunicorn.conf.py main:app
+    WEB_CONCURRENCY=4 gunicorn -c gunicorn.conf.py main:app
+
+환경변수:
+    WEB_CONCURRENCY              워커 수 (기본: 사용 가능한 CPU 수)
+    BIND                         기본 0.0.0.0:8000
+    WORKER_MAX_REQUESTS          워커 재시작 주기 (요청 수, 0 = 재시작 안 함, 기본 5000)
+    WORKER_MAX_REQUESTS_JITTER   재시작 시점 분산 (기본 max_requests 의 10%)
+    EVENT_FANOUT                 워커 간 이벤트/dirty 표시 공유 (LISTEN/NOTIFY, 기본: 워커 2개 이상이면 1)
+"""
+import os
+
+
+def _cpu_count() -> int:
+    # 컨테이너 CPU 제한(affinity) 반영
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = os.getenv('BIND', '0.0.0.0:8000')
+workers = int(os.getenv('WEB_CONCURRENCY', '0')) or _cpu_count()
+worker_class = 'uvicorn_worker.UvicornWorker'
+
+# SSE 이벤트 버스/OEE·지연 위험 dirty 표시/품질 분석 캐시는 워커 프로세스별 -> 워커 간 fan-out (core/fanout.py)
+# 앱 import(preload) 전에 설정되어야 함
+os.environ.setdefault('EVENT_FANOUT', '1' if workers > 1 else '0')
+
+# 마스터에서 앱 import + 모델 로드 후 fork -> 읽기 전용 페이지를 워커들이 copy-on-write 로 공유
+preload_app = True
+
+# 워커 재시작 (메모리 증가 누적 방지) - jitter 로 워커들이 동시에 재시작하지 않도록 분산
+# 재시작/종료 시 진행 중 요청 처리 후 shutdown 이벤트(그룹 커밋 버퍼 flush)까지 graceful_timeout 초 대기
+max_requests = int(os.getenv('WORKER_MAX_REQUESTS', '5000'))
+max_requests_jitter = int(os.getenv('WORKER_MAX_REQUESTS_JITTER', str(max_requests // 10)))
+graceful_timeout = 30
+timeout = 60
+keepalive = 5
+
+accesslog = '-'
+errorlog = '-'
+
+
+def when_ready(server):
+    # 마스터, fork 전 (preload_app 이므로 앱 import 완료 상태)
+    from core.serving import preload_master
+    server.log.info(f"preload: {preload_master()}")
+
+
+def post_fork(server, worker):
+    from core.serving import after_fork
+    after_fork()
@@ -2,30 +2,62 @@ from fastapi import FastAPI, Depends, HTTPException, Request
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 from core.database import get_db 
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from core.templates import templates
-from core.init_database import create_tables
-from core.init_master_data import seed_master_data
+from core.bootstrap import bootstrap
+from core.serving import worker_status, mark_ready
+from core.db_routing import ReadYourWritesMiddleware, replica_status
 # 라우터 등록
 from routers import work
 from routers import dashboard
 from routers import quality
+from routers import api_v1
 
 app = FastAPI(title="MES Project")
+# 쓰기 요청 후 일정 시간 동안 읽기 조회를 primary 로 (읽기 복제본 사용 시)
+app.add_middleware(ReadYourWritesMiddleware)
 
 
 @app.on_event("startup")
 def startup_event():
-    create_tables()
-    seed_master_data()
-    print("데이터베이스 테이블 초기화 완료")
-    from services.ai_production_qty_prediction import get_production_qty_sklearn_service, get_production_qty_tensorflow_service
-    get_production_qty_sklearn_service()
-    get_production_qty_tensorflow_service()
-    from services.ai_work_time_prediction import get_work_time_sklearn_service, get_work_time_tensorflow_service
-    get_work_time_sklearn_service()
-    get_work_time_tensorflow_service()
+    # 스키마/마스터 데이터는 지문이 바뀐 경우에만 적용 (advisory 락으로 워커 1개만 수행)
+    print(f"데이터베이스 초기화: {bootstrap()}")
+    from core.partitioning import PARTITIONING_ENABLED, start_partition_maintenance
+    if PARTITIONING_ENABLED:
+        from core.database import engine
+        start_partition_maintenance(engine)
+    # DNN 모델은 DNN_BACKEND (tensorflow | tflite) 로 로드, 다른 백엔드는 첫 요청 시 로드
+    from services.ai_tflite import DNN_BACKEND
+    from services.ai_production_qty_prediction import get_production_qty_service
+    get_production_qty_service('sklearn')
+    get_production_qty_service(DNN_BACKEND)
+    from services.ai_work_time_prediction import get_work_time_service
+    get_work_time_service('sklearn')
+    get_work_time_service(DNN_BACKEND)
+    from services.cycle_anomaly import get_cycle_detector
+    from core.database import SessionLocal
+    db = SessionLocal()
+    try:
+        print(f"사이클타임 이상 감지 통계 재구성: {get_cycle_detector().rebuild(db)}개 키")
+    finally:
+        db.close()
+    from services.event_buffer import start_progress_buffer
+    from services.work import progress_committed
+    start_progress_buffer(on_commit=progress_committed)
+    # 멀티 워커 운영 모드: 이벤트/dirty 표시/캐시 무효화를 다른 워커와 공유 (EVENT_FANOUT=1)
+    from core import fanout
+    fanout.start()
+    mark_ready()
+
+
+@app.on_event("shutdown")
+def shutdown_event():
+    # 그룹 커밋 버퍼에 남은 공정 이벤트 커밋 후 종료
+    from services.event_buffer import stop_progress_buffer
+    stop_progress_buffer()
+    from core import fanout
+    fanout.stop()
     
 
 @app.get("/", response_class=HTMLResponse)
@@ -37,14 +69,18 @@ def read_root(request: Request):
 @app.get("/health")
 def health():
 		# 해당 요청((http://localhost:8000/health/)에 대해 JSON 형식의 응답을 반환
-    return {"status": "ok"}
+    # 응답한 워커 프로세스의 준비 상태 포함 (startup 완료 전이면 503)
+    worker = worker_status()
+    if not worker["ready"]:
+        return JSONResponse({"status": "starting", "worker": worker}, status_code=503)
+    return {"status": "ok", "worker": worker}
 
 # DB 헬스 체크 엔드포인트
 @app.get("/db-health")
 def db_health(db: Session = Depends(get_db)):
     try:
         db.execute(text("SELECT 1"))  # 연결 및 간단 쿼리
-        return {"db": "ok"}
+        return {"db": "ok", "replica": replica_status()}
     except Exception:
         raise HTTPException(status_code=500, detail="database error")
 
@@ -52,4 +88,5 @@ def db_health(db: Session = Depends(get_db)):
 
 app.include_router(work.router, prefix="/work")
 app.include_router(dashboard.router, prefix="/dashboard")
-app.include_router(quality.router, prefix="/quality")
\ No newline at end of file
+app.include_router(quality.router, prefix="/quality")
+app.include_router(api_v1.router, prefix="/api/v1")
\ No newline at end of file
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, String, Integer, Float, DateTime, PrimaryKeyConstraint
+from datetime import datetime
+from core.database import Base
+
+# 설비 x 교대 OEE 집계 (services/oee.py 가 재계산 후 upsert)
+# 비율이 아닌 합계를 저장하므로 기간/설비 단위 합산 후 비율 계산
+#   가동률(A) = run_sec / planned_sec, 성능(P) = ideal_sec / run_sec, 품질(Q) = good_qty / total_qty
+class OeeShift(Base):
+    __tablename__ = "oee_shift"
+
+    equipment_id = Column(String(50), nullable=False)
+    shift_start = Column(DateTime, nullable=False)
+    shift_end = Column(DateTime, nullable=False)
+
+    planned_sec = Column(Float, nullable=False, default=0.0)   # 계획 가동시간 (진행 중 교대는 경과 시간)
+    run_sec = Column(Float, nullable=False, default=0.0)       # 실적 구간 병합 가동시간
+    ideal_sec = Column(Float, nullable=False, default=0.0)     # 표준 사이클타임 x 수량
+    total_qty = Column(Integer, nullable=False, default=0)
+    good_qty = Column(Float, nullable=False, default=0.0)      # 수량 x 오더 품질 양품률
+    updated_ts = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("equipment_id", "shift_start", name="pk_oee_shift"),
+    )
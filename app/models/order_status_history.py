@@ -0,0 +1,36 @@
+from sqlalchemy import Column, String, BigInteger, DateTime, Index, func
+from sqlalchemy.dialects.postgresql import UUID
+
+from core.database import Base
+from models.work_order import OrderStatus
+
+# 작업지시 상태 전이 이력 (append-only, services/order_transitions.transition 에서 기록)
+# - 1행 = 1회 전이: from_status 에 머문 구간 [from_ts, changed_ts) + 새 상태 to_status
+#   from_ts = 직전 전이 시각 (첫 전이는 작업지시 생성 시각)
+# - 작업지시 삭제 후에도 이력은 유지 (FK 없음), 분석용 product_id 비정규화
+class OrderStatusHistory(Base):
+    __tablename__ = "order_status_history"
+
+    history_id = Column(BigInteger, primary_key=True, autoincrement=True)
+    order_id = Column(UUID(as_uuid=True), nullable=False)
+    product_id = Column(String(100), nullable=False)
+
+    from_status = Column(OrderStatus, nullable=False)
+    to_status = Column(OrderStatus, nullable=False)
+    from_ts = Column(DateTime, nullable=False)      # from_status 진입 시각
+    changed_ts = Column(DateTime, nullable=False)   # 전이 시각 (= to_status 진입 시각)
+
+    __table_args__ = (
+        # 오더별 직전 전이 조회
+        Index("ix_osh_order_changed", "order_id", "changed_ts"),
+        # 상태별 체류시간 (예: 기간 내 S2_ASSEMBLY 를 벗어난 구간, 제품별)
+        Index("ix_osh_from_status_changed", "from_status", "changed_ts", "product_id"),
+        # 리드타임/처리량 (기간 내 S5_DONE 진입)
+        Index("ix_osh_to_status_changed", "to_status", "changed_ts"),
+        # 시점 T 의 WIP: 구간 [from_ts, changed_ts) 이 T 를 포함하는 행 (GiST range 검색)
+        Index(
+            "ix_osh_interval",
+            func.tsrange(from_ts, changed_ts),
+            postgresql_using="gist",
+        ),
+    )
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, String, BigInteger, DateTime, Float, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID, ARRAY
+from datetime import datetime
+
+from core.database import Base
+
+# 검사항목 측정값 (배열 저장: 1행 = 한 번에 수집된 항목별 측정값 배열)
+# 측정값 1개당 1행 대비 행 수/인덱스 크기가 작고, 적재 시 부분군 통계(spc_subgroups)를 함께 계산
+class QualityMeasurement(Base):
+    __tablename__ = "quality_measurements"
+
+    measurement_id = Column(BigInteger, primary_key=True, autoincrement=True)
+    inspection_id = Column(UUID(as_uuid=True), ForeignKey("quality_inspections.inspection_id"), nullable=True)
+    item_id = Column(String(50), ForeignKey("master_inspection_items.item_id"), nullable=False)
+    product_id = Column(String(50), nullable=False)
+    measured_ts = Column(DateTime, nullable=False, default=datetime.utcnow)
+    values = Column(ARRAY(Float), nullable=False)
+
+    __table_args__ = (
+        Index("ix_quality_measurements_item_product_ts", "item_id", "product_id", "measured_ts"),
+    )
@@ -3,9 +3,12 @@ from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
 import uuid
 from core.database import Base
+from core.partitioning import PARTITIONING_ENABLED, partitioned_table_args
 
 class QualityResult(Base):
     __tablename__ = "quality_results"
+    # DB_PARTITIONING=1: start_ts 월 단위 range 파티션 (PK 에 파티션 키 포함)
+    __table_args__ = partitioned_table_args()
     
     result_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     inspection_id = Column(UUID(as_uuid=True), ForeignKey("quality_inspections.inspection_id"), nullable=False)
@@ -14,7 +17,7 @@ class QualityResult(Base):
     defect_qty = Column(Integer, nullable=False, default=0)
     defect_code = Column(String(20), ForeignKey("master_defect_codes.defect_code"), nullable=True)
     defect_rate = Column(Numeric(5, 2), nullable=True)
-    start_ts = Column(DateTime, nullable=False)
+    start_ts = Column(DateTime, nullable=False, primary_key=PARTITIONING_ENABLED)
     end_ts = Column(DateTime, nullable=False)
     inspection_time = Column(Integer, nullable=True)
     notes = Column(String(500), nullable=True)
\ No newline at end of file
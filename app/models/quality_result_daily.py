@@ -0,0 +1,23 @@
+from sqlalchemy import Column, String, Integer, BigInteger, Float, Date, PrimaryKeyConstraint
+from core.database import Base
+
+# 보관기간이 지난 품질검사 결과(quality_results)의 일별 집계 (scripts/archive_results.py 가 생성)
+# 원본 행은 archive/quality_results/*.parquet 로 이동
+class QualityResultDaily(Base):
+    __tablename__ = "quality_result_daily"
+
+    day = Column(Date, nullable=False)                        # 검사 시작일
+    product_id = Column(String(50), nullable=False)
+    inspector = Column(String(50), nullable=False)
+    defect_code = Column(String(20), nullable=False, default="")     # 불량 없음 = ""
+
+    result_count = Column(Integer, nullable=False, default=0)
+    passed_qty = Column(BigInteger, nullable=False, default=0)
+    defect_qty = Column(BigInteger, nullable=False, default=0)
+    inspection_time_sum = Column(Float, nullable=False, default=0.0)
+    inspection_time_min = Column(Float, nullable=True)
+    inspection_time_max = Column(Float, nullable=True)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("day", "product_id", "inspector", "defect_code", name="pk_quality_result_daily"),
+    )
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String, DateTime
+from datetime import datetime
+from core.database import Base
+
+# 스키마/마스터 데이터 적용 버전 표식 (core/bootstrap.py)
+# value = 모델 메타데이터 + 마스터 데이터 지문(sha256), 같으면 기동 시 create_all/시딩 생략
+class SchemaMeta(Base):
+    __tablename__ = "schema_meta"
+
+    key = Column(String(50), primary_key=True)
+    value = Column(String(128), nullable=False)
+    updated_ts = Column(DateTime, nullable=False, default=datetime.utcnow)
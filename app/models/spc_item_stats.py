@@ -0,0 +1,25 @@
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, Float, PrimaryKeyConstraint
+from datetime import datetime
+from core.database import Base
+
+# 검사항목 x 제품 누적 SPC 합계 (부분군 적재 시 가산 upsert -> 전체 기간 공정능력은 1행 조회)
+class SpcItemStats(Base):
+    __tablename__ = "spc_item_stats"
+
+    item_id = Column(String(50), nullable=False)
+    product_id = Column(String(50), nullable=False)
+
+    subgroups = Column(Integer, nullable=False, default=0)
+    within_subgroups = Column(Integer, nullable=False, default=0)   # n >= 2 부분군 수
+    n_total = Column(BigInteger, nullable=False, default=0)
+    sum = Column(Float, nullable=False, default=0.0)
+    sumsq = Column(Float, nullable=False, default=0.0)
+    sum_r_over_d2 = Column(Float, nullable=False, default=0.0)
+    sum_s_over_c4 = Column(Float, nullable=False, default=0.0)
+    min = Column(Float, nullable=True)
+    max = Column(Float, nullable=True)
+    updated_ts = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("item_id", "product_id", name="pk_spc_item_stats"),
+    )
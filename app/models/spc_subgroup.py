@@ -0,0 +1,28 @@
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, Float, Index
+from core.database import Base
+
+# SPC 부분군 통계 (측정값 적재 시 계산, 관리도/공정능력 조회는 이 테이블만 읽음)
+# r_over_d2 / s_over_c4: 부분군별 군내 표준편차 추정치 (부분군 크기가 달라도 평균으로 합산 가능)
+class SpcSubgroup(Base):
+    __tablename__ = "spc_subgroups"
+
+    subgroup_id = Column(BigInteger, primary_key=True, autoincrement=True)
+    measurement_id = Column(BigInteger, nullable=False)
+    item_id = Column(String(50), nullable=False)
+    product_id = Column(String(50), nullable=False)
+    measured_ts = Column(DateTime, nullable=False)
+
+    n = Column(Integer, nullable=False)
+    mean = Column(Float, nullable=False)
+    range = Column(Float, nullable=False)
+    std = Column(Float, nullable=True)              # 표본 표준편차 (n >= 2)
+    sum = Column(Float, nullable=False)
+    sumsq = Column(Float, nullable=False)
+    min = Column(Float, nullable=False)
+    max = Column(Float, nullable=False)
+    r_over_d2 = Column(Float, nullable=True)
+    s_over_c4 = Column(Float, nullable=True)
+
+    __table_args__ = (
+        Index("ix_spc_subgroups_item_product_ts", "item_id", "product_id", "measured_ts"),
+    )
@@ -16,6 +16,9 @@ OrderStatus = Enum(
     name="order_status",
 )
 
+# 상태 -> 완료된 공정 단계 번호 (S0_PLANNED=0 ... S5_DONE=5)
+STATUS_STEP = {status: step for step, status in enumerate(OrderStatus.enums)}
+
 class WorkOrder(Base):
     __tablename__ = "work_orders"
 
@@ -4,15 +4,18 @@ from datetime import datetime
 import uuid
 
 from core.database import Base
+from core.partitioning import PARTITIONING_ENABLED, partitioned_table_args
 
 
 class WorkResult(Base):
     __tablename__ = "work_results"
+    # DB_PARTITIONING=1: start_ts 월 단위 range 파티션 (PK 에 파티션 키 포함)
+    __table_args__ = partitioned_table_args()
 
     result_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     order_id = Column(UUID(as_uuid=True), ForeignKey("work_orders.order_id"), nullable=False)
     operation_seq = Column(Integer, ForeignKey("master_operations.operation_seq"), nullable=False)
     equipment_id = Column(String(50), ForeignKey("master_equipment.equipment_id"), nullable=True)
 
-    start_ts = Column(DateTime, nullable=False)
+    start_ts = Column(DateTime, nullable=False, primary_key=PARTITIONING_ENABLED)
     end_ts = Column(DateTime, nullable=False)
\ No newline at end of file
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, String, Integer, BigInteger, Float, Date, PrimaryKeyConstraint
+from core.database import Base
+
+# 보관기간이 지난 작업실적(work_results)의 일별 집계 (scripts/archive_results.py 가 생성)
+# 원본 행은 archive/work_results/*.parquet 로 이동
+class WorkResultDaily(Base):
+    __tablename__ = "work_result_daily"
+
+    day = Column(Date, nullable=False)                        # 실적 시작일
+    product_id = Column(String(100), nullable=False)
+    operation_seq = Column(Integer, nullable=False)
+    equipment_id = Column(String(50), nullable=False, default="")   # 설비 미지정 = ""
+
+    result_count = Column(Integer, nullable=False, default=0)
+    qty_sum = Column(BigInteger, nullable=False, default=0)           # 작업지시 계획수량 합
+    duration_sec_sum = Column(Float, nullable=False, default=0.0)
+    duration_sec_min = Column(Float, nullable=True)
+    duration_sec_max = Column(Float, nullable=True)
+
+    __table_args__ = (
+        PrimaryKeyConstraint("day", "product_id", "operation_seq", "equipment_id", name="pk_work_result_daily"),
+    )
@@ -0,0 +1,79 @@
+from typing import Literal
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from core.db_routing import get_read_db
+from core.columnar import ColumnarResponse, query_columnar
+from core.partitioning import DEFAULT_LOOKBACK_DAYS, lookback_start
+from models.work_order import OrderStatus, WorkOrder
+from models.quality_inspection import QualityInspection
+from services import work
+from services import quality
+
+# 기계 판독용 JSON API (v1) - 컬럼형 응답 {"fields", "columns", "count"} (core/columnar.py)
+# 목록 화면과 같은 쿼리를 사용하고, 행별 dict 변환 없이 행 튜플을 바로 필드별 배열로 직렬화
+# 라우트는 ColumnarResponse 를 직접 반환 (dict 를 반환하면 FastAPI 가 jsonable_encoder 로 전체 값을 다시 변환/복사)
+
+router = APIRouter(tags=["api-v1"], default_response_class=ColumnarResponse)
+
+DEFAULT_LIMIT = 10_000
+MAX_LIMIT = 200_000
+# order_status enum 값만 허용 (그 외 값은 DB 오류 대신 422)
+OrderStatusName = Literal[tuple(OrderStatus.enums)]
+
+
+# GET localhost:8080/api/v1/orders
+@router.get("/orders")
+def orders(
+    status: OrderStatusName | None = None,
+    product_id: str | None = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db),
+):
+    # 작업지시 목록 (납기순)
+    q = work.orders_query(db)
+    if status is not None:
+        q = q.filter(WorkOrder.status == status)
+    if product_id is not None:
+        q = q.filter(WorkOrder.product_id == product_id)
+    return ColumnarResponse(query_columnar(q, limit, offset))
+
+
+# GET localhost:8080/api/v1/results
+@router.get("/results")
+def work_results(
+    days: int = DEFAULT_LOOKBACK_DAYS,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db),
+):
+    # 생산실적 목록 (최근 days 일, 0 = 전체, 시작시각 최신순)
+    return ColumnarResponse(query_columnar(work.results_query(db, since=lookback_start(days)), limit, offset))
+
+
+# GET localhost:8080/api/v1/inspections
+@router.get("/inspections")
+def inspections(
+    status: str | None = None,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db),
+):
+    # 품질검사 목록 (검사일 최신순)
+    q = quality.inspections_query(db)
+    if status is not None:
+        q = q.filter(QualityInspection.status == status)
+    return ColumnarResponse(query_columnar(q, limit, offset))
+
+
+# GET localhost:8080/api/v1/quality/results
+@router.get("/quality/results")
+def quality_results(
+    days: int = DEFAULT_LOOKBACK_DAYS,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_read_db),
+):
+    # 품질검사 결과 목록 (최근 days 일, 0 = 전체, 시작시각 최신순)
+    return ColumnarResponse(query_columnar(quality.results_query(db, since=lookback_start(days)), limit, offset))
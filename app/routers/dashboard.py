@@ -1,20 +1,27 @@
+from datetime import datetime, timedelta
+from typing import Literal
 from fastapi import APIRouter, Request, Depends
 from fastapi.responses import HTMLResponse
 from sqlalchemy.orm import Session
 
 from core.database import get_db
+from core.db_routing import get_read_db
 from core.templates import templates
+from core.partitioning import DEFAULT_LOOKBACK_DAYS, lookback_start
 from services import dashboard as svc
+from services import utilization
+from services import oee
 
-from services.ai_production_qty_prediction import get_production_qty_sklearn_service, get_production_qty_tensorflow_service
+from services.ai_production_qty_prediction import get_production_qty_service, get_production_qty_sklearn_service
+from services.ai_product_forecast import get_product_forecast_service
 
 
 router = APIRouter(tags=["dashboard"])
 
 @router.get("/", response_class=HTMLResponse)
-def dashboard(request: Request, db: Session = Depends(get_db)):
-    # 대시보드 페이지
-    data = svc.get_dashboard_data(db)
+def dashboard(request: Request, days: int = DEFAULT_LOOKBACK_DAYS, db: Session = Depends(get_read_db)):
+    # 대시보드 페이지 (작업실적 차트는 최근 days 일, 0 = 전체)
+    data = svc.get_dashboard_data(db, since=lookback_start(days))
 
         # 생산량 AI 예측(sklearn 모델 사용)
     production_qty_service = get_production_qty_sklearn_service()
@@ -30,3 +37,71 @@ def dashboard(request: Request, db: Session = Depends(get_db)):
         "dashboard.html",
         {"request": request, **data}
     )
+
+
+@router.get("/forecast")
+def forecast(
+    start_date: str,
+    n_days: int = 7,
+    recursive: bool = False,
+    model_type: Literal["sklearn", "tensorflow", "tflite"] = "sklearn",
+    db: Session = Depends(get_read_db),
+):
+    # 다일 생산량 예측 (이력 조회 1회 + 일괄 예측), tflite 는 TF 런타임 없이 경량 인터프리터로 추론
+    production_qty_service = get_production_qty_service(model_type)
+    predictions = production_qty_service.predict_horizon(db, start_date, n_days, recursive=recursive)
+    return {"start_date": start_date, "n_days": n_days, "recursive": recursive, "predictions": predictions}
+
+
+@router.get("/forecast/products")
+def forecast_products(start_date: str, n_days: int = 1, db: Session = Depends(get_read_db)):
+    # 제품별 생산량 예측 (전 제품 일괄)
+    return get_product_forecast_service().forecast_all(db, start_date, n_days)
+
+
+def utilization_window(start: datetime | None, end: datetime | None, days: int) -> tuple:
+    # 기본 조회 구간: 현재(UTC, 실적 기록 기준)로부터 최근 days 일
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(days=days)
+    return start, end
+
+
+@router.get("/utilization")
+def station_utilization(
+    start: datetime | None = None,
+    end: datetime | None = None,
+    days: int = 7,
+    bucket: Literal["day", "shift"] = "day",
+    timeline: bool = False,
+    equipment_id: str | None = None,
+    db: Session = Depends(get_read_db),
+):
+    # 설비별 가동률 (일/교대 버킷), timeline=true 면 Gantt 용 병합 구간 포함
+    start, end = utilization_window(start, end, days)
+    if end <= start:
+        return HTMLResponse("end must be after start", status_code=400)
+    return utilization.station_utilization(db, start, end, bucket=bucket, timeline=timeline,
+                                           equipment_id=equipment_id)
+
+
+@router.get("/oee")
+def station_oee(
+    start: datetime | None = None,
+    end: datetime | None = None,
+    days: int = 7,
+    group: Literal["shift", "day", "equipment"] = "shift",
+    equipment_id: str | None = None,
+    db: Session = Depends(get_db),
+):
+    # 설비별 OEE (가동률 x 성능 x 품질), oee_shift 집계 조회 (변경된 교대만 재계산)
+    start, end = utilization_window(start, end, days)
+    return oee.oee_summary(db, start, end, group=group, equipment_id=equipment_id)
+
+
+@router.get("/utilization/gantt", response_class=HTMLResponse)
+def utilization_gantt(request: Request, days: int = 1, bucket: Literal["day", "shift"] = "shift"):
+    # 설비 가동 Gantt 화면 (데이터는 /dashboard/utilization?timeline=true 로 조회)
+    return templates.TemplateResponse(
+        "utilization_gantt.html",
+        {"request": request, "days": days, "bucket": bucket}
+    )
@@ -1,16 +1,23 @@
+from datetime import datetime
+from typing import Literal
 from fastapi import APIRouter, Request, Depends, Form
 from fastapi.responses import HTMLResponse, RedirectResponse
+from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
 from core.database import get_db
-from core.templates import templates
+from core.db_routing import get_read_db, read_session
+from core.templates import templates, stream_template
+from core.partitioning import DEFAULT_LOOKBACK_DAYS, lookback_start
 from services import quality as svc
+from services import spc
+from services import quality_analytics
 
 router = APIRouter(tags=["quality"])
 
 # GET localhost:8080/quality/inspections
 @router.get("/inspections", response_class=HTMLResponse)
-def list_inspections(request: Request, db: Session = Depends(get_db)):
+def list_inspections(request: Request, db: Session = Depends(get_read_db)):
     # 품질검사 목록 조회
     data = svc.list_inspections(db)
     return templates.TemplateResponse(
@@ -74,12 +81,19 @@ def inspection_delete(inspection_id: str, db: Session = Depends(get_db)):
 
 # GET localhost:8080/quality/results
 @router.get("/results", response_class=HTMLResponse)
-def list_results(request: Request, db: Session = Depends(get_db)):
-    # 품질검사 결과 목록 조회
-    data = svc.list_results(db)
-    return templates.TemplateResponse(
+def list_results(request: Request, days: int = DEFAULT_LOOKBACK_DAYS):
+    # 품질검사 결과 목록 조회 (최근 days 일, 0 = 전체) - 결과 행은 DB 커서에서 읽으면서 스트리밍 렌더링
+    db = read_session(request)
+    try:
+        options = svc.result_form_options(db)
+    except Exception:
+        db.close()
+        raise
+    items = svc.iter_results(db, since=lookback_start(days))
+    return stream_template(
         "quality_results_list.html",
-        {"request": request, **data}
+        {"request": request, "days": days, "items": items, **options},
+        on_close=db.close,
     )
 
 # POST localhost:8080/quality/results
@@ -99,3 +113,89 @@ def create_result(
     svc.create_result(db, inspection_id, inspector, passed_qty, 
                      defect_qty, defect_code, start_ts, end_ts, notes)
     return RedirectResponse(url="/quality/results", status_code=303)
+
+
+MAX_BATCH_ITEMS = 10_000
+
+
+class ResultBatch(BaseModel):
+    # 결과 항목 목록 (항목 키: inspection_id, inspector, passed_qty, defect_qty, defect_code, start_ts, end_ts, notes)
+    # 항목별 검증은 서비스에서 수행 (잘못된 항목이 있어도 나머지는 등록, atomic=true 면 전체 거부)
+    items: list[dict]
+    atomic: bool = False
+
+
+# POST localhost:8080/quality/results/batch
+@router.post("/results/batch")
+def create_results_batch(batch: ResultBatch, db: Session = Depends(get_db)):
+    # 품질검사 결과 일괄 등록 (multi-row INSERT + 검사 상태 일괄 갱신), 항목별 오류 반환
+    if len(batch.items) > MAX_BATCH_ITEMS:
+        return HTMLResponse(f"Too many items (max {MAX_BATCH_ITEMS})", status_code=413)
+    return svc.create_results_batch(db, batch.items, atomic=batch.atomic)
+
+
+# GET localhost:8080/quality/analytics
+@router.get("/analytics")
+def quality_analytics_data(start: datetime | None = None, end: datetime | None = None,
+                           days: int = DEFAULT_LOOKBACK_DAYS, product_id: str | None = None,
+                           db: Session = Depends(get_read_db)):
+    # 품질 KPI + 불량코드 Pareto + 제품별 불량률 추이 + 검사자별 처리량 (기본 최근 days 일, 0 = 전체)
+    if start is None:
+        start = quality_analytics.window_start(days)
+    return quality_analytics.quality_kpi(db, start, end, product_id)
+
+
+# GET localhost:8080/quality/analytics/dashboard
+@router.get("/analytics/dashboard", response_class=HTMLResponse)
+def quality_analytics_dashboard(request: Request, days: int = DEFAULT_LOOKBACK_DAYS, product_id: str | None = None):
+    # 품질 분석 화면 (데이터는 /quality/analytics 로 조회)
+    return templates.TemplateResponse(
+        "quality_analytics.html",
+        {"request": request, "days": days, "product_id": product_id or ""}
+    )
+
+
+class MeasurementBatch(BaseModel):
+    # 검사항목별 측정값 배열 (예: {"product_id": "TEMP-100", "items": {"SENSITIVITY": [5.01, 4.98, ...]}})
+    product_id: str
+    items: dict[str, list[float]]
+    inspection_id: str | None = None
+    measured_ts: datetime | None = None
+    subgroup_size: int = spc.SUBGROUP_SIZE
+
+
+# POST localhost:8080/quality/measurements
+@router.post("/measurements")
+def ingest_measurements(batch: MeasurementBatch, db: Session = Depends(get_db)):
+    # 측정값 배열 적재 + 부분군 통계 계산
+    try:
+        subgroups = spc.ingest(db, batch.product_id, batch.items, measured_ts=batch.measured_ts,
+                               inspection_id=batch.inspection_id, subgroup_size=batch.subgroup_size)
+    except ValueError as e:
+        db.rollback()
+        return HTMLResponse(str(e), status_code=400)
+    return {"product_id": batch.product_id, "subgroups": subgroups}
+
+
+# GET localhost:8080/quality/spc/{item_id}?product_id=...
+@router.get("/spc/{item_id}")
+def control_chart(item_id: str, product_id: str, chart: Literal["xbar_r", "xbar_s"] = "xbar_r",
+                  start: datetime | None = None, end: datetime | None = None, days: int = DEFAULT_LOOKBACK_DAYS,
+                  db: Session = Depends(get_read_db)):
+    # X̄-R / X̄-S 관리도 + 공정능력 + Western Electric 규칙 위반 (기본 최근 days 일)
+    data = spc.control_chart(db, item_id, product_id, chart=chart,
+                             start=start or lookback_start(days), end=end)
+    if data is None:
+        return HTMLResponse("Inspection item not found", status_code=404)
+    return data
+
+
+# GET localhost:8080/quality/spc/{item_id}/capability?product_id=...
+@router.get("/spc/{item_id}/capability")
+def item_capability(item_id: str, product_id: str, db: Session = Depends(get_read_db)):
+    # 전체 기간 공정능력 (누적 합계)
+    data = spc.item_capability(db, item_id, product_id)
+    if data is None:
+        return HTMLResponse("No measurements", status_code=404)
+    return data
+
@@ -1,15 +1,28 @@
-from fastapi import APIRouter, Request, Depends, Form
-from fastapi.responses import HTMLResponse, RedirectResponse
+import asyncio
+from datetime import datetime
+from typing import Literal
+from fastapi import APIRouter, Request, Depends, Form, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse
 from sqlalchemy.orm import Session
 
 from core.database import get_db
-from core.templates import templates
+from core.db_routing import get_read_db, read_session
+from core.templates import templates, stream_template
+from core.events import bus, format_sse
+from core.partitioning import DEFAULT_LOOKBACK_DAYS, lookback_start
 from services import work as svc
+from services import scheduling
+from services import order_risk
+from services import order_transitions
+from services import order_history
+from services.cycle_anomaly import get_cycle_detector
+from services import event_buffer
 
 router = APIRouter(tags=["work"])
 
 @router.get("/orders", response_class=HTMLResponse)
-def list_orders(request: Request, db: Session = Depends(get_db)):
+def list_orders(request: Request, db: Session = Depends(get_read_db)):
 		# services/work.py 의 list_orders 함수 호출
     data = svc.list_orders(db)
 
@@ -63,13 +76,15 @@ def order_delete(order_id: str, db: Session = Depends(get_db)):
     return RedirectResponse(url="/work/orders", status_code=303)    
 
 @router.get("/results", response_class=HTMLResponse)
-def list_results(request: Request, db: Session = Depends(get_db)):
-    # services/work.py 의 list_results 함수 호출
-    data = svc.list_results(db)
-    # results_list.html에 request, data 변수를 전달하여 최종 HTML 문서를 완성
-    return templates.TemplateResponse(
+def list_results(request: Request, days: int = DEFAULT_LOOKBACK_DAYS):
+    # 생산실적 목록 (최근 days 일, 0 = 전체) - DB 커서에서 행을 읽으면서 results_list.html 을 스트리밍 렌더링
+    # 요청 의존성 세션은 응답 전송 전에 닫힐 수 있으므로 전용 읽기 세션(복제본/primary)을 열고 전송 종료 시 닫음
+    db = read_session(request)
+    items = svc.iter_results(db, since=lookback_start(days))
+    return stream_template(
         "results_list.html",
-        {"request": request, **data}
+        {"request": request, "days": days, "items": items},
+        on_close=db.close,
     )
 
 
@@ -84,11 +99,122 @@ def list_progress(request: Request, db: Session = Depends(get_db)):
     )    
 
 @router.post("/progress")
-def advance_progress(
+async def advance_progress(
     db: Session = Depends(get_db),
     order_id: str = Form(...),
     operation_seq: str = Form(...),
     equipment_id: str = Form(None)
 ):
-    svc.advance_progress(db, order_id, operation_seq, equipment_id)
+    # 공정 단계는 1~5 만 허용 (그 외 값은 상태 전이 전에 400)
+    try:
+        seq = int(operation_seq)
+    except ValueError:
+        seq = None
+    if seq not in order_transitions.STEP_TO_STATUS:
+        return HTMLResponse("Invalid operation_seq", status_code=400)
+
+    buffer = event_buffer.get_progress_buffer()
+    future = None
+    if buffer is not None:
+        # 그룹 커밋 버퍼: 이벤트가 포함된 배치가 커밋될 때까지 대기 (이벤트 루프는 블로킹하지 않음)
+        try:
+            future = buffer.submit(order_id, seq, equipment_id)
+        except event_buffer.BufferFull:
+            return HTMLResponse("Too many progress events", status_code=503, headers={"Retry-After": "1"})
+        except event_buffer.BufferClosed:
+            # 종료(shutdown) 중 버퍼가 닫힌 뒤 도착한 요청은 직접 커밋
+            pass
+    if future is not None:
+        result = await asyncio.wrap_future(future)
+    else:
+        result = await run_in_threadpool(svc.advance_progress, db, order_id, seq, equipment_id)
+    if result.outcome == order_transitions.NOT_FOUND:
+        return HTMLResponse("Order not found", status_code=404)
     return RedirectResponse(url="/work/progress", status_code=303)
+
+
+@router.get("/schedule")
+def schedule(
+    use_predictor: bool = False,
+    model_type: Literal["sklearn", "tensorflow", "tflite"] = "sklearn",
+    limit: int = 500,
+    db: Session = Depends(get_db),
+):
+    # 미완료 작업지시 유한능력 스케줄 (설비 배정/시작/종료/납기지연)
+    # use_predictor=true 면 공정 소요시간을 model_type 작업시간 예측 모델로 계산
+    return scheduling.build_schedule(db, use_predictor=use_predictor, model_type=model_type, limit=limit)
+
+
+@router.get("/risk")
+def risk(sort: Literal["probability", "slack", "due_date"] = "probability", limit: int = 100, min_probability: float = 0.0,
+         full: bool = False, db: Session = Depends(get_db)):
+    # 미완료 작업지시 납기 위험 목록 (변경된 오더만 재계산, full=true 면 전체 재계산)
+    return order_risk.at_risk_orders(db, sort=sort, limit=limit, min_probability=min_probability, full=full)
+
+
+@router.get("/analytics/wip")
+def wip(at: datetime | None = None, product_id: str | None = None, db: Session = Depends(get_read_db)):
+    # 시점 at(UTC, 기본 현재)의 상태별 WIP 수
+    return order_history.wip_at(db, at=at, product_id=product_id)
+
+
+@router.get("/analytics/time-in-status")
+def time_in_status(status: Literal["S0_PLANNED", "S1_READY", "S2_ASSEMBLY", "S3_INSPECTION", "S4_PACK"],
+                   start: datetime | None = None, end: datetime | None = None,
+                   product_id: str | None = None, db: Session = Depends(get_read_db)):
+    # 기간(기본 최근 RESULT_LOOKBACK_DAYS 일) 내 status 를 벗어난 오더의 체류시간 통계
+    return order_history.time_in_status(db, status, start=start, end=end, product_id=product_id)
+
+
+@router.get("/analytics/lead-time")
+def lead_time(start: datetime | None = None, end: datetime | None = None, product_id: str | None = None,
+              bucket_hours: float = Query(8, gt=0), db: Session = Depends(get_read_db)):
+    # 기간 내 완료된 오더의 리드타임 분포
+    return order_history.lead_time(db, start=start, end=end, product_id=product_id, bucket_hours=bucket_hours)
+
+
+@router.get("/anomalies")
+def anomalies(limit: int = 100, equipment_id: str | None = None, product_id: str | None = None,
+              include_stats: bool = False):
+    # 최근 사이클타임 이상 경보 (실시간 수신: /work/events?type=alert)
+    detector = get_cycle_detector()
+    data = {"alerts": detector.alerts(limit=limit, equipment_id=equipment_id, product_id=product_id)}
+    if include_stats:
+        data["stats"] = detector.stats()
+        data["standard_rule"] = detector.standard_rule()
+    return data
+
+
+SSE_HEARTBEAT_SEC = 15
+
+
+@router.get("/events")
+async def events(request: Request, line: str | None = None, product_id: str | None = None,
+                 status: str | None = None, event_type: str | None = Query(None, alias="type")):
+    # 공정진행/작업지시/품질 변경 delta 스트림 (Server-Sent Events)
+    # 필터는 쉼표 구분 다중값 (예: ?status=S1_READY,S2_ASSEMBLY&line=LINE-1)
+    filters = {
+        key: value.split(",")
+        for key, value in {"line": line, "product_id": product_id, "status": status, "type": event_type}.items()
+        if value
+    }
+    sub = bus.subscribe(filters)
+
+    async def stream():
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event_id, event_type, data = await asyncio.wait_for(sub.queue.get(), SSE_HEARTBEAT_SEC)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                yield format_sse(event_id, event_type, data)
+        finally:
+            bus.unsubscribe(sub)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,44 @@
+"""
+보관기간 경과 실적 보관: work_results / quality_results -> Parquet + 일별 집계, 원본 삭제
+
+사용법 (app 디렉토리에서 실행, cron 등으로 하루 1회):
+    python -m scripts.archive_results                     # ARCHIVE_RETENTION_DAYS(기본 180일) 이전 실적
+    python -m scripts.archive_results --retention-days 90 --batch-size 10000
+    python -m scripts.archive_results --dry-run           # 대상 행 수만 출력
+"""
+import argparse
+
+from core.database import SessionLocal
+from services.archive import (
+    RETENTION_DAYS, BATCH_SIZE, ARCHIVE_DIR,
+    retention_cutoff, pending_counts, archive_work_results, archive_quality_results,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--retention-days', type=int, default=RETENTION_DAYS)
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--max-batches', type=int, default=None, help='테이블별 최대 batch 수 (실행 시간 제한)')
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+
+    cutoff = retention_cutoff(args.retention_days)
+    db = SessionLocal()
+    try:
+        print(f"보관 기준: {cutoff} 이전 시작 실적 -> {ARCHIVE_DIR}/")
+        if args.dry_run:
+            print(f"대상 행: {pending_counts(db, cutoff)}")
+            return
+
+        for archive in (archive_work_results, archive_quality_results):
+            stats = archive(db, cutoff, batch_size=args.batch_size, max_batches=args.max_batches)
+            rate = stats['rows'] / stats['elapsed_sec'] if stats['elapsed_sec'] else 0
+            print(f"{stats['table']}: {stats['rows']}행, batch {stats['batches']}개, "
+                  f"파일 {len(stats['files'])}개, {stats['elapsed_sec']}s ({rate:.0f} rows/s)")
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+order_status_history 초기 적재 (기존 work_results 로 상태 전이 재구성)
+
+- 이력이 1건도 없는 작업지시만 대상 (반복 실행 가능)
+- 오더별 실적을 start_ts 순으로 보며 공정 단계 최대값이 커질 때마다 전이 1건
+  (늦게 도착한 이전 공정 실적은 상태를 되돌리지 않으므로 제외)
+- from_ts = 직전 전이 시각, 첫 전이는 작업지시 생성 시각 (실적보다 늦게 생성된 데이터는 전이 시각으로 보정)
+- 윈도우 함수 1회 실행 (이후에는 transition() 이 이력을 직접 기록)
+
+사용법 (app 디렉토리에서 실행):
+    python -m scripts.backfill_status_history
+"""
+import time
+from sqlalchemy import text
+
+from core.database import engine
+from models.work_order import STATUS_STEP
+import core.init_database  # noqa: F401  (모델 등록)
+
+STATUS_ARRAY = "ARRAY[" + ", ".join(f"'{s}'" for s in STATUS_STEP) + "]::order_status[]"
+
+BACKFILL_SQL = f"""
+WITH results AS (
+    SELECT r.order_id, o.product_id, o.created_ts, r.operation_seq, r.start_ts,
+           max(r.operation_seq) OVER (
+               PARTITION BY r.order_id ORDER BY r.start_ts, r.operation_seq
+               ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+           ) AS prev_max
+    FROM work_results r
+    JOIN work_orders o ON o.order_id = r.order_id
+    WHERE NOT EXISTS (SELECT 1 FROM order_status_history h WHERE h.order_id = r.order_id)
+),
+steps AS (
+    SELECT order_id, product_id, created_ts, operation_seq, start_ts,
+           coalesce(prev_max, 0) AS from_step,
+           lag(start_ts) OVER (PARTITION BY order_id ORDER BY start_ts, operation_seq) AS prev_changed
+    FROM results
+    WHERE operation_seq > coalesce(prev_max, 0)
+)
+INSERT INTO order_status_history (order_id, product_id, from_status, to_status, from_ts, changed_ts)
+SELECT order_id, product_id,
+       ({STATUS_ARRAY})[from_step + 1],
+       ({STATUS_ARRAY})[operation_seq + 1],
+       least(coalesce(prev_changed, created_ts), start_ts),
+       start_ts
+FROM steps
+"""
+
+
+def main():
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        inserted = conn.execute(text(BACKFILL_SQL)).rowcount
+    print(f"order_status_history: {inserted}건 적재 ({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+기간 제한 조회의 파티션 프루닝 확인 (EXPLAIN)
+
+- services/work, services/quality, services/dashboard 의 results_query(db, since) 를
+  EXPLAIN (FORMAT JSON) 으로 실행 계획만 뽑아 스캔 대상 파티션을 확인
+- 기대: since 가 속한 월 이후 파티션 + DEFAULT 만 스캔 (상한이 없으므로 DEFAULT 는 항상 포함)
+
+사용법 (app 디렉토리에서 실행):
+    DB_PARTITIONING=1 python -m scripts.check_partition_pruning
+    DB_PARTITIONING=1 python -m scripts.check_partition_pruning --days 7 31 90
+"""
+import argparse
+from datetime import date
+
+from core.database import SessionLocal
+from core.partitioning import existing_partitions, lookback_start, month_start
+from services import work, quality, dashboard
+
+QUERIES = {
+    'work.list_results': (work.results_query, 'work_results'),
+    'quality.list_results': (quality.results_query, 'quality_results'),
+    'dashboard.get_dashboard_data': (dashboard.results_query, 'work_results'),
+}
+
+
+def scanned_relations(plan: dict) -> set:
+    relations = set()
+    if 'Relation Name' in plan:
+        relations.add(plan['Relation Name'])
+    for child in plan.get('Plans', []):
+        relations |= scanned_relations(child)
+    return relations
+
+
+def explain(db, query) -> dict:
+    compiled = query.statement.compile(dialect=db.bind.dialect)
+    result = db.connection().exec_driver_sql("EXPLAIN (FORMAT JSON) " + compiled.string, compiled.params)
+    return result.scalar()[0]['Plan']
+
+
+def expected_partitions(table: str, partitions: set, since) -> set:
+    if since is None:
+        return set(partitions)
+    expected = {f'{table}_default'}
+    first = month_start(since.date())
+    for name in partitions:
+        suffix = name[len(table) + 2:]
+        if name.startswith(f'{table}_p') and suffix.isdigit():
+            if date(int(suffix[:4]), int(suffix[4:]), 1) >= first:
+                expected.add(name)
+    return expected
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--days', type=int, nargs='*', default=[31])
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    failed = False
+    try:
+        for days in args.days:
+            since = lookback_start(days)
+            for name, (build, table) in QUERIES.items():
+                partitions = existing_partitions(db.connection(), table)
+                if not partitions:
+                    print(f"{table}: 파티션 없음 (DB_PARTITIONING=1 / scripts.partition_tables 확인)")
+                    failed = True
+                    continue
+
+                scanned = {r for r in scanned_relations(explain(db, build(db, since))) if r in partitions}
+                expected = expected_partitions(table, partitions, since)
+                ok = scanned <= expected
+                failed |= not ok
+                print(f"[{'OK' if ok else 'FAIL'}] {name} (최근 {days}일): "
+                      f"{len(scanned)}/{len(partitions)} 파티션 스캔 {sorted(scanned)}")
+                if not ok:
+                    print(f"    예상 외 스캔: {sorted(scanned - expected)}")
+    finally:
+        db.close()
+
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""
+작업시간 RandomForest 모델을 추론 전용 평탄 배열(npz)로 컴파일
+
+사용법 (app 디렉토리에서 실행):
+    python -m scripts.compile_work_time_forest
+"""
+import itertools
+import joblib
+import numpy as np
+from pathlib import Path
+
+from services.ai_compiled_forest import CompiledForestRegressor
+
+MODEL_DIR = Path('ai_models/work_time')
+
+
+def verification_grid(le_product, le_equipment) -> np.ndarray:
+    # 제품 x 공정 x 설비 x 수량 조합으로 검증용 입력 생성
+    products = range(len(le_product.classes_))
+    equipments = range(len(le_equipment.classes_))
+    qtys = [1, 5, 10, 20, 35, 50, 75, 100, 150, 200]
+    return np.array(list(itertools.product(products, [1, 2, 3, 4], equipments, qtys)), dtype=np.float64)
+
+
+def main():
+    model = joblib.load(MODEL_DIR / 'rf_work_time_model.pkl')
+    compiled = CompiledForestRegressor.from_sklearn(model)
+
+    le_product = joblib.load(MODEL_DIR / 'label_encoder_product.pkl')
+    le_equipment = joblib.load(MODEL_DIR / 'label_encoder_equipment.pkl')
+    X = verification_grid(le_product, le_equipment)
+
+    expected = model.predict(X)
+    actual = compiled.predict(X)
+    if not np.array_equal(expected, actual):
+        diff = np.max(np.abs(expected - actual))
+        raise SystemExit(f"컴파일 모델 예측 불일치 (최대 오차 {diff})")
+
+    out_path = MODEL_DIR / 'rf_work_time_model_compiled.npz'
+    compiled.save(out_path)
+    print(f"트리 {compiled.n_trees}개, 노드 {len(compiled.value)}개, 최대 깊이 {compiled.max_depth}")
+    print(f"검증 {len(X)}건 비트 단위 일치")
+    print(f"저장 완료: {out_path} ({compiled.nbytes / 1024:.1f} KiB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+ai_models/ 의 pkl/keras 아티팩트를 mmap 가능한 .npy 디렉토리로 변환 (배포 시 1회 실행)
+
+변환 결과: ai_models/<모델>/mmap/<아티팩트>/{*.npy, manifest.json}
+서비스는 mmap 디렉토리가 있으면 np.load(mmap_mode='r') 로 로드하므로
+모든 워커가 같은 페이지 캐시를 읽기 전용으로 공유함 (MODEL_MMAP=0 으로 비활성화)
+
+사용법 (app 디렉토리에서 실행):
+    python -m scripts.convert_model_artifacts
+"""
+import joblib
+from pathlib import Path
+
+from core.model_store import mmap_artifact_dir, save_arrays
+from services.ai_compiled_forest import CompiledForestRegressor
+from services.ai_model_arrays import ArrayLinearRegressor, ArrayStandardScaler, ArrayLabelEncoder, ArrayDenseNet
+
+PRODUCTION_QTY_DIR = Path('ai_models/production_qty')
+WORK_TIME_DIR = Path('ai_models/work_time')
+
+
+def export(model_dir: Path, name: str, arrays: dict, meta: dict | None = None):
+    out_dir = mmap_artifact_dir(model_dir, name)
+    save_arrays(out_dir, arrays, meta)
+    size = sum(p.stat().st_size for p in out_dir.glob('*.npy'))
+    print(f"{out_dir} ({len(arrays)}개 배열, {size / 1024:.1f} KiB)")
+
+
+def convert_keras(model_dir: Path, name: str):
+    from tensorflow import keras
+
+    net = ArrayDenseNet.from_keras(keras.models.load_model(model_dir / f'{name}.keras'))
+    export(model_dir, name, net.to_arrays(), net.to_meta())
+
+
+def main():
+    # 생산량 예측 모델
+    lr = ArrayLinearRegressor.from_sklearn(joblib.load(PRODUCTION_QTY_DIR / 'lr_production_qty_model.pkl'))
+    export(PRODUCTION_QTY_DIR, 'lr_production_qty_model', lr.to_arrays())
+
+    scaler = ArrayStandardScaler.from_sklearn(joblib.load(PRODUCTION_QTY_DIR / 'dnn_production_qty_model_scaler.pkl'))
+    export(PRODUCTION_QTY_DIR, 'dnn_production_qty_model_scaler', scaler.to_arrays())
+    convert_keras(PRODUCTION_QTY_DIR, 'dnn_production_qty_model')
+
+    # 작업시간 예측 모델
+    compiled_path = WORK_TIME_DIR / 'rf_work_time_model_compiled.npz'
+    if compiled_path.exists():
+        forest = CompiledForestRegressor.load(compiled_path)
+    else:
+        forest = CompiledForestRegressor.from_sklearn(joblib.load(WORK_TIME_DIR / 'rf_work_time_model.pkl'))
+    export(WORK_TIME_DIR, 'rf_work_time_model_compiled', forest.to_arrays())
+
+    scaler = ArrayStandardScaler.from_sklearn(joblib.load(WORK_TIME_DIR / 'dnn_work_time_model_scaler.pkl'))
+    export(WORK_TIME_DIR, 'dnn_work_time_model_scaler', scaler.to_arrays())
+    convert_keras(WORK_TIME_DIR, 'dnn_work_time_model')
+
+    for name in ['label_encoder_product', 'label_encoder_equipment']:
+        encoder = ArrayLabelEncoder.from_sklearn(joblib.load(WORK_TIME_DIR / f'{name}.pkl'))
+        export(WORK_TIME_DIR, name, encoder.to_arrays())
+
+    print("mmap 아티팩트 변환 완료")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+"""
+DNN 모델(keras) -> TFLite 변환 및 정확도/지연시간 리포트
+
+- 정밀도: float32 / float16 (가중치 반정밀) / int8 (전체 정수 양자화, float 입출력)
+- int8 보정(representative dataset) 및 평가용 데이터는 sample_data/work_results.csv
+  (+ work_orders.csv 의 제품/수량/완료일)에서 생성
+- 결과: ai_models/<모델>/<이름>_<정밀도>.tflite, <이름>_<정밀도>_tflite_info.json
+
+사용법 (app 디렉토리에서 실행):
+    python -m scripts.export_tflite_models
+    python -m scripts.export_tflite_models --precision int8 --model work_time
+"""
+import argparse
+import json
+import time
+import joblib
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from pathlib import Path
+
+import tensorflow as tf
+from tensorflow import keras
+
+from services.ai_production_qty_prediction import build_feature_row, collect_past_production
+from services.ai_tflite import TFLITE_PRECISIONS, TFLiteRegressor, tflite_model_path
+
+SAMPLE_DIR = Path('sample_data')
+MODELS = {
+    'production_qty': Path('ai_models/production_qty'),
+    'work_time': Path('ai_models/work_time'),
+}
+REPRESENTATIVE_SAMPLES = 200
+MIN_NONZERO_DAYS = 6            # production_qty 평가 행: 과거 24 영업일 중 생산 실적이 있는 최소 일수
+
+
+def load_samples() -> tuple[pd.DataFrame, pd.DataFrame]:
+    orders = pd.read_csv(SAMPLE_DIR / 'work_orders.csv', parse_dates=['end_ts'])
+    results = pd.read_csv(SAMPLE_DIR / 'work_results.csv', parse_dates=['start_ts', 'end_ts'])
+    return results.merge(
+        orders[['order_id', 'product_id', 'planned_qty', 'status']].rename(columns={'status': 'order_status'}),
+        on='order_id',
+    ), orders
+
+
+def work_time_dataset(model_dir: Path) -> tuple[np.ndarray, np.ndarray]:
+    results, _ = load_samples()
+    le_product = joblib.load(model_dir / 'label_encoder_product.pkl')
+    le_equipment = joblib.load(model_dir / 'label_encoder_equipment.pkl')
+    results = results[
+        results['product_id'].isin(le_product.classes_) & results['equipment_id'].isin(le_equipment.classes_)
+    ]
+
+    # 서비스 입력 순서: [product, operation_seq, equipment, planned_qty]
+    X = np.column_stack([
+        le_product.transform(results['product_id']),
+        results['operation_seq'],
+        le_equipment.transform(results['equipment_id']),
+        results['planned_qty'],
+    ]).astype(np.float64)
+    y = (results['end_ts'] - results['start_ts']).dt.total_seconds().to_numpy()
+    return X, y
+
+
+def production_qty_dataset() -> tuple[np.ndarray, np.ndarray]:
+    # 완료 작업지시의 완료일 기준 일별 생산량
+    _, orders = load_samples()
+    done = orders[orders['status'] == 'S5_DONE'].copy()
+    done['date'] = done['end_ts'].dt.date
+    daily_qty = done.groupby('date')['planned_qty'].sum().to_dict()
+
+    dates = sorted(daily_qty)
+    X, y = [], []
+    for d in pd.date_range(dates[0], dates[-1], freq='D'):
+        target = datetime(d.year, d.month, d.day)
+        if target.weekday() == 6:
+            continue
+        # 서비스(ai_product_forecast)와 같은 방식으로 feature 생성, 이력이 너무 적은 초반 날짜만 제외
+        past = collect_past_production(daily_qty, target)
+        if sum(1 for q in past if q > 0) < MIN_NONZERO_DAYS:
+            continue
+        features, _ = build_feature_row(target, past, zero_safe_trend=True)
+        X.append(features)
+        y.append(float(daily_qty.get(target.date(), 0.0)))
+    return np.array(X, dtype=np.float64), np.array(y)
+
+
+def convert(model, precision: str, representative_x: np.ndarray) -> bytes:
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    if precision == 'float16':
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+    elif precision == 'int8':
+        def representative_dataset():
+            for row in representative_x[:REPRESENTATIVE_SAMPLES]:
+                yield [row.reshape(1, -1).astype(np.float32)]
+
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    return converter.convert()
+
+
+def metrics(y_true: np.ndarray, y_pred: np.ndarray) -> dict:
+    err = y_pred - y_true
+    return {'mae': round(float(np.mean(np.abs(err))), 2), 'rmse': round(float(np.sqrt(np.mean(err ** 2))), 2)}
+
+
+def latency_ms(predict, X: np.ndarray, repeat: int = 100) -> dict:
+    predict(X[:1])
+    start = time.perf_counter()
+    for i in range(repeat):
+        predict(X[i % len(X):i % len(X) + 1])
+    single = (time.perf_counter() - start) / repeat
+
+    predict(X)
+    start = time.perf_counter()
+    for _ in range(10):
+        predict(X)
+    batch = (time.perf_counter() - start) / 10
+    return {'single_row_ms': round(single * 1000, 3), f'batch_{len(X)}_ms': round(batch * 1000, 3)}
+
+
+def export_model(key: str, precisions: list):
+    model_dir = MODELS[key]
+    name = f'dnn_{key}_model'
+    model = keras.models.load_model(model_dir / f'{name}.keras')
+    scaler = joblib.load(model_dir / f'{name}_scaler.pkl')
+    with open(model_dir / f'{name}_info.json', 'r') as f:
+        reference = json.load(f)
+
+    X, y = work_time_dataset(model_dir) if key == 'work_time' else production_qty_dataset()
+    if len(X) == 0:
+        raise SystemExit(f"[{key}] 평가/보정 데이터 없음 - {SAMPLE_DIR} 의 샘플 데이터를 확인하세요")
+    scaled_x = scaler.transform(X).astype(np.float32)
+
+    keras_predict = lambda x: model.predict(x, verbose=0)[:, 0]
+    keras_pred = keras_predict(scaled_x)
+    keras_metrics = metrics(y, keras_pred)
+    keras_latency = latency_ms(keras_predict, scaled_x)
+    keras_size = (model_dir / f'{name}.keras').stat().st_size
+
+    print(f"[{key}] 평가 {len(X)}건, 참조 MAE {reference['mae']} / RMSE {reference['rmse']}")
+    print(f"  keras   : {keras_metrics} {keras_latency} {keras_size / 1024:.1f} KiB")
+
+    for precision in precisions:
+        out_path = tflite_model_path(model_dir, name, precision)
+        out_path.write_bytes(convert(model, precision, scaled_x))
+
+        tflite_model = TFLiteRegressor(out_path)
+        tflite_predict = lambda x: tflite_model.predict(x)[:, 0]
+        tflite_pred = tflite_predict(scaled_x)
+        tflite_metrics = metrics(y, tflite_pred)
+
+        report = {
+            'precision': precision,
+            'n_eval': int(len(X)),
+            'reference': {'mae': reference['mae'], 'rmse': reference['rmse']},
+            'keras': keras_metrics,
+            'tflite': tflite_metrics,
+            'delta_vs_keras': {
+                'mae': round(tflite_metrics['mae'] - keras_metrics['mae'], 2),
+                'rmse': round(tflite_metrics['rmse'] - keras_metrics['rmse'], 2),
+                'max_abs_pred_diff': round(float(np.max(np.abs(tflite_pred - keras_pred))), 4),
+            },
+            'latency': {'keras': keras_latency, 'tflite': latency_ms(tflite_predict, scaled_x)},
+            'size_bytes': {'keras': keras_size, 'tflite': out_path.stat().st_size},
+        }
+        with open(model_dir / f'{name}_{precision}_tflite_info.json', 'w') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+        print(f"  {precision:<8}: {tflite_metrics} Δ{report['delta_vs_keras']} "
+              f"{report['latency']['tflite']} {report['size_bytes']['tflite'] / 1024:.1f} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--model', choices=list(MODELS), nargs='*', default=list(MODELS))
+    parser.add_argument('--precision', choices=TFLITE_PRECISIONS, nargs='*', default=list(TFLITE_PRECISIONS))
+    args = parser.parse_args()
+
+    for key in args.model:
+        export_model(key, args.precision)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+기존 work_results / quality_results (일반 테이블) -> 월 단위 파티션 테이블 전환
+
+- DB_PARTITIONING=1 환경에서 실행 (모델이 파티션 테이블 정의를 사용하도록)
+- 테이블별 1 트랜잭션: 기존 테이블 이름 변경(<table>_legacy) -> 파티션 테이블 생성 ->
+  DEFAULT + 데이터 기간 월 파티션 생성 -> 데이터 복사 -> 기존 테이블 삭제(--keep-legacy 시 유지)
+- 복사 중에는 테이블 잠금이 유지되므로 서비스 중지 후 실행
+
+사용법 (app 디렉토리에서 실행):
+    DB_PARTITIONING=1 python -m scripts.partition_tables
+    DB_PARTITIONING=1 python -m scripts.partition_tables --keep-legacy
+"""
+import argparse
+import time
+from sqlalchemy import text
+
+from core.database import Base, engine
+from core.partitioning import (
+    PARTITIONING_ENABLED, PARTITIONED_TABLES, PARTITION_KEY,
+    is_partitioned, month_range, partition_name, add_months, ensure_partitions,
+)
+import core.init_database  # noqa: F401  (모델 등록)
+
+
+def convert(table_name: str, keep_legacy: bool):
+    table = Base.metadata.tables[table_name]
+    columns = ", ".join(c.name for c in table.columns)
+    legacy = f"{table_name}_legacy"
+
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        if is_partitioned(conn, table_name):
+            print(f"{table_name}: 이미 파티션 테이블")
+            return
+
+        conn.execute(text(f"ALTER TABLE {table_name} RENAME TO {legacy}"))
+        conn.execute(text(f"ALTER TABLE {legacy} RENAME CONSTRAINT {table_name}_pkey TO {legacy}_pkey"))
+        table.create(conn)
+        conn.execute(text(f"CREATE TABLE {table_name}_default PARTITION OF {table_name} DEFAULT"))
+
+        first, last = conn.execute(text(f"SELECT min({PARTITION_KEY}), max({PARTITION_KEY}) FROM {legacy}")).first()
+        months = month_range(first.date(), last.date()) if first else []
+        for month in months:
+            conn.execute(text(
+                f"CREATE TABLE {partition_name(table_name, month)} PARTITION OF {table_name} "
+                f"FOR VALUES FROM ('{month}') TO ('{add_months(month, 1)}')"
+            ))
+
+        copied = conn.execute(text(
+            f"INSERT INTO {table_name} ({columns}) SELECT {columns} FROM {legacy}"
+        )).rowcount
+        if not keep_legacy:
+            conn.execute(text(f"DROP TABLE {legacy}"))
+
+    print(f"{table_name}: {copied}행, 월 파티션 {len(months)}개 ({time.perf_counter() - started:.1f}s)"
+          + (f", 기존 테이블 {legacy} 유지" if keep_legacy else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--keep-legacy', action='store_true')
+    args = parser.parse_args()
+
+    if not PARTITIONING_ENABLED:
+        raise SystemExit("DB_PARTITIONING=1 환경에서 실행해야 함")
+
+    for table_name in PARTITIONED_TABLES:
+        convert(table_name, args.keep_legacy)
+
+    # 미래 파티션
+    print(f"추가 파티션: {ensure_partitions(engine)}")
+
+
+if __name__ == '__main__':
+    main()
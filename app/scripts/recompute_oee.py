@@ -0,0 +1,51 @@
+"""
+OEE 집계(oee_shift) 배치 재계산 - 백필/마스터 변경 후 재집계
+
+- 구간을 --chunk-days 단위로 나누어 recompute() 실행 (청크별 1회 조회 + NumPy 집계 + upsert)
+- 표준 사이클타임/품질 결과가 바뀐 과거 구간도 같은 방식으로 재계산
+
+사용법 (app 디렉토리에서 실행):
+    python -m scripts.recompute_oee --days 31
+    python -m scripts.recompute_oee --start 2025-01-01 --end 2025-04-01 --chunk-days 7
+"""
+import argparse
+import time
+from datetime import datetime, timedelta
+
+from core.database import SessionLocal
+from services import oee
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--days', type=int, default=31)
+    parser.add_argument('--start', type=datetime.fromisoformat, default=None)
+    parser.add_argument('--end', type=datetime.fromisoformat, default=None)
+    parser.add_argument('--chunk-days', type=int, default=7)
+    args = parser.parse_args()
+
+    end = args.end or datetime.utcnow()
+    start = args.start or end - timedelta(days=args.days)
+
+    db = SessionLocal()
+    started = time.perf_counter()
+    total_rows = total_results = 0
+    try:
+        chunk_start = oee.shift_floor(start)
+        while chunk_start < end:
+            chunk_end = min(chunk_start + timedelta(days=args.chunk_days), end)
+            t0 = time.perf_counter()
+            stats = oee.recompute(db, chunk_start, chunk_end)
+            total_rows += stats['rows']
+            total_results += stats.get('results', 0)
+            print(f"{stats['start']} ~ {stats['end']}: 실적 {stats.get('results', 0)}건 -> "
+                  f"{stats['rows']}행 ({time.perf_counter() - t0:.1f}s)")
+            chunk_start = stats['end']
+    finally:
+        db.close()
+
+    print(f"합계: 실적 {total_results}건, oee_shift {total_rows}행 ({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
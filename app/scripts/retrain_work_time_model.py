@@ -0,0 +1,55 @@
+"""
+작업시간 RandomForest 모델 재학습 (work_results 스트리밍, 증분)
+
+사용법 (app 디렉토리에서 실행):
+    python -m scripts.retrain_work_time_model                  # 최신 버전 이후 실적만 증분 학습
+    python -m scripts.retrain_work_time_model --full --promote # 전체 재학습 후 서비스 위치에 반영
+    (trained_until 이 없는 배포 기본 모델 위에는 증분 불가 - 최초 1회는 --full)
+"""
+import argparse
+
+from core.database import SessionLocal
+from services.ai_work_time_training import MAX_ESTIMATORS, retrain, promote
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--chunk-size', type=int, default=50_000)
+    parser.add_argument('--trees-per-chunk', type=int, default=10)
+    parser.add_argument('--max-estimators', type=int, default=MAX_ESTIMATORS, help='트리 수 상한 (초과 시 오래된 트리 제거)')
+    parser.add_argument('--max-depth', type=int, default=None)
+    parser.add_argument('--n-jobs', type=int, default=-1)
+    parser.add_argument('--full', action='store_true', help='기존 모델 없이 전체 이력으로 학습')
+    parser.add_argument('--promote', action='store_true', help='학습 후 서비스 모델로 반영')
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        info = retrain(
+            db,
+            chunk_size=args.chunk_size,
+            trees_per_chunk=args.trees_per_chunk,
+            incremental=not args.full,
+            n_jobs=args.n_jobs,
+            max_depth=args.max_depth,
+            max_estimators=args.max_estimators,
+        )
+    finally:
+        db.close()
+
+    training = info['training']
+    print(f"버전 {info['version']} (기반 {info['base_version']}), 학습 종료시각 {info['trained_until']}")
+    print(f"행 {training['rows']} (미등록 제외 {training['skipped_unknown_rows']}), "
+          f"chunk {training['chunks']}개, 트리 {info['n_estimators']}개 "
+          f"(+{info['new_estimators']} / -{info['dropped_estimators']})")
+    print(f"소요 {training['total_sec']}초 (조회 {training['fetch_sec']} / 학습 {training['fit_sec']}), "
+          f"100k 행당 {training['sec_per_100k_rows']}초, 최대 RSS {training['peak_rss_mib']} MiB")
+    print(f"평가 {info['n_test']}행: MAE {info.get('mae')} / RMSE {info.get('rmse')} / R2 {info.get('score')}")
+
+    if args.promote:
+        promote(info['version'])
+        print("서비스 모델 반영 완료 (서버 재시작 후 적용)")
+
+
+if __name__ == '__main__':
+    main()
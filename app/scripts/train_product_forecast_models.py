@@ -0,0 +1,34 @@
+"""
+제품별 생산량 예측 모델 학습 (프로세스 풀 병렬)
+
+사용법 (app 디렉토리에서 실행):
+    python -m scripts.train_product_forecast_models
+    python -m scripts.train_product_forecast_models --workers 4 --no-promote
+"""
+import argparse
+
+from core.database import SessionLocal
+from services.ai_product_forecast import train_all_products
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=None, help='프로세스 수 (기본: CPU 코어 수)')
+    parser.add_argument('--no-promote', action='store_true', help='LATEST 포인터를 갱신하지 않음')
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        info = train_all_products(db, n_workers=args.workers, promote=not args.no_promote)
+    finally:
+        db.close()
+
+    print(f"버전 {info['version']} (워커 {info['n_workers']}개, {info['wall_time_sec']}초)")
+    for product_id, perf in info['products'].items():
+        print(f"  {product_id:<10} MAE {perf['mae']} / RMSE {perf['rmse']} (n={perf['n_train']}, {perf['train_sec']}초)")
+    for product_id, reason in info['skipped'].items():
+        print(f"  {product_id:<10} 건너뜀: {reason}")
+
+
+if __name__ == '__main__':
+    main()
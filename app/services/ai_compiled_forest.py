@@ -0,0 +1,173 @@
+import os
+import threading
+import numpy as np
+from pathlib import Path
+
+# 이 배치 크기 이상은 sklearn 추정기(C 구현)로 위임 - NumPy 탐색은 (샘플 x 트리) 배열 연산이라
+# 소배치는 빠르지만 대배치는 sklearn 보다 느림 (benchmarks/bench_compiled_forest.py, 교차점 약 300행)
+SKLEARN_MIN_BATCH = int(os.getenv('COMPILED_FOREST_SKLEARN_MIN_BATCH', '300'))
+
+
+class CompiledForestRegressor:
+    """
+    sklearn RandomForestRegressor 의 추론 전용 컴파일 형태
+    - 모든 트리의 노드를 하나의 평탄 배열(feature/threshold/children/value)로 합침
+    - 배치 입력을 NumPy 로 (샘플 x 트리) 동시에 탐색, 리프에 도달한 쌍은 다음 깊이부터 제외
+    - set_fallback() 으로 sklearn 추정기 로더를 지정하면 SKLEARN_MIN_BATCH 이상 배치는 sklearn 으로 예측
+    - 예측값은 sklearn predict(n_jobs=None) 와 비트 단위로 동일
+    """
+
+    def __init__(self, feature, threshold, left, right, value, missing_left, roots, max_depth, n_features):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.missing_left = missing_left
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+        self.n_trees = len(roots)
+        self.is_leaf = left == np.arange(len(left), dtype=left.dtype)
+        self._fallback_loader = None
+        self._fallback = None
+        self._fallback_lock = threading.Lock()
+
+    def set_fallback(self, loader, min_batch: int = SKLEARN_MIN_BATCH):
+        """대배치용 sklearn 추정기 로더 (최초 대배치 예측 시 1회 호출)"""
+        self._fallback_loader = loader
+        self.fallback_min_batch = min_batch
+
+    def _fallback_model(self):
+        with self._fallback_lock:
+            if self._fallback is None:
+                self._fallback = self._fallback_loader()
+            return self._fallback
+
+    @classmethod
+    def from_sklearn(cls, model) -> "CompiledForestRegressor":
+        if getattr(model, "n_outputs_", 1) != 1:
+            raise ValueError("단일 출력 회귀 모델만 지원합니다")
+
+        features, thresholds, lefts, rights, values, missings, roots = [], [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for est in model.estimators_:
+            t = est.tree_
+            n = t.node_count
+            node_ids = np.arange(n, dtype=np.int32)
+            is_leaf = t.children_left == -1
+
+            # 리프는 자기 자신을 가리키게 하여 고정 깊이 루프에서 그대로 머무르게 함
+            left = np.where(is_leaf, node_ids, t.children_left).astype(np.int32) + offset
+            right = np.where(is_leaf, node_ids, t.children_right).astype(np.int32) + offset
+            feature = np.where(is_leaf, 0, t.feature).astype(np.int32)
+            missing = getattr(t, "missing_go_to_left", None)
+            missing = np.zeros(n, dtype=bool) if missing is None else np.asarray(missing, dtype=bool)
+
+            features.append(feature)
+            thresholds.append(t.threshold.astype(np.float64))
+            lefts.append(left)
+            rights.append(right)
+            values.append(t.value[:, 0, 0].astype(np.float64))
+            missings.append(missing & ~is_leaf)
+            roots.append(offset)
+
+            offset += n
+            max_depth = max(max_depth, t.max_depth)
+
+        return cls(
+            feature=np.concatenate(features),
+            threshold=np.concatenate(thresholds),
+            left=np.concatenate(lefts),
+            right=np.concatenate(rights),
+            value=np.concatenate(values),
+            missing_left=np.concatenate(missings),
+            roots=np.asarray(roots, dtype=np.int32),
+            max_depth=max_depth,
+            n_features=model.n_features_in_,
+        )
+
+    def apply(self, X) -> np.ndarray:
+        """각 (샘플, 트리) 의 도달 리프 노드 번호 (n_samples, n_trees)"""
+        # sklearn 과 동일하게 float32 로 변환 후 float64 임계값과 비교
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"입력 feature 수 불일치: {X.shape} (기대값 {self.n_features})")
+
+        n = X.shape[0]
+        flat_x = X.astype(np.float64).ravel()
+        base = np.repeat(np.arange(n, dtype=np.int64) * self.n_features, self.n_trees)
+        node = np.tile(self.roots, n)
+        check_missing = bool(self.missing_left.any())
+
+        # 아직 리프에 도달하지 않은 (샘플, 트리) 쌍만 탐색 (pos: 결과 배열 위치)
+        leaves = node.copy()
+        pos = np.arange(n * self.n_trees)
+        active = ~self.is_leaf[node]
+        if not active.all():
+            pos, node, base = pos[active], node[active], base[active]
+        while pos.size:
+            x = flat_x[base + self.feature[node]]
+            go_left = x <= self.threshold[node]
+            if check_missing:
+                go_left |= np.isnan(x) & self.missing_left[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+            done = self.is_leaf[node]
+            if done.any():
+                leaves[pos[done]] = node[done]
+                active = ~done
+                pos, node, base = pos[active], node[active], base[active]
+
+        return leaves.reshape(n, self.n_trees)
+
+    def predict(self, X) -> np.ndarray:
+        if self._fallback_loader is not None and len(X) >= self.fallback_min_batch:
+            return self._fallback_model().predict(np.asarray(X, dtype=np.float64))
+        leaf_values = self.value[self.apply(X)]
+        # 트리 순서대로 순차 누적 (sklearn 의 out += prediction 과 동일한 합산 순서)
+        y = np.cumsum(leaf_values, axis=1)[:, -1]
+        y /= self.n_trees
+        return y
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in (
+            self.feature, self.threshold, self.left, self.right,
+            self.value, self.missing_left, self.roots,
+        ))
+
+    def to_arrays(self) -> dict:
+        return {
+            'feature': self.feature,
+            'threshold': self.threshold,
+            'left': self.left,
+            'right': self.right,
+            'value': self.value,
+            'missing_left': self.missing_left,
+            'roots': self.roots,
+            'meta': np.array([self.max_depth, self.n_features], dtype=np.int64),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays) -> "CompiledForestRegressor":
+        max_depth, n_features = np.asarray(arrays['meta']).tolist()
+        return cls(
+            feature=arrays['feature'],
+            threshold=arrays['threshold'],
+            left=arrays['left'],
+            right=arrays['right'],
+            value=arrays['value'],
+            missing_left=arrays['missing_left'],
+            roots=arrays['roots'],
+            max_depth=max_depth,
+            n_features=n_features,
+        )
+
+    def save(self, path):
+        np.savez(path, **self.to_arrays())
+
+    @classmethod
+    def load(cls, path) -> "CompiledForestRegressor":
+        with np.load(Path(path)) as data:
+            return cls.from_arrays({name: data[name] for name in data.files})
@@ -0,0 +1,142 @@
+import numpy as np
+
+# sklearn/keras 객체를 대신하는 NumPy 배열 기반 추론기
+# - 모든 상태가 배열이므로 core/model_store 로 mmap 로드하여 워커 간 공유 가능
+# - to_arrays()/from_arrays() 로 저장 형식과 변환
+
+
+class ArrayLinearRegressor:
+    """sklearn LinearRegression.predict 와 동일한 연산 (X @ coef + intercept)"""
+
+    def __init__(self, coef, intercept):
+        self.coef = coef
+        self.intercept = intercept
+
+    @classmethod
+    def from_sklearn(cls, model) -> "ArrayLinearRegressor":
+        return cls(np.asarray(model.coef_, dtype=np.float64),
+                   np.atleast_1d(np.asarray(model.intercept_, dtype=np.float64)))
+
+    def predict(self, X) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        return X @ self.coef.T + self.intercept[0]
+
+    def to_arrays(self) -> dict:
+        return {'coef': self.coef, 'intercept': self.intercept}
+
+    @classmethod
+    def from_arrays(cls, arrays) -> "ArrayLinearRegressor":
+        return cls(arrays['coef'], arrays['intercept'])
+
+
+class ArrayStandardScaler:
+    """sklearn StandardScaler.transform 과 동일한 연산 ((X - mean) / scale)"""
+
+    def __init__(self, mean, scale):
+        self.mean = mean
+        self.scale = scale
+
+    @classmethod
+    def from_sklearn(cls, scaler) -> "ArrayStandardScaler":
+        return cls(np.asarray(scaler.mean_, dtype=np.float64),
+                   np.asarray(scaler.scale_, dtype=np.float64))
+
+    def transform(self, X) -> np.ndarray:
+        X = np.array(X, dtype=np.float64)
+        X -= self.mean
+        X /= self.scale
+        return X
+
+    def to_arrays(self) -> dict:
+        return {'mean': self.mean, 'scale': self.scale}
+
+    @classmethod
+    def from_arrays(cls, arrays) -> "ArrayStandardScaler":
+        return cls(arrays['mean'], arrays['scale'])
+
+
+class ArrayLabelEncoder:
+    """sklearn LabelEncoder.transform 대체 (정렬된 classes_ 에 대한 이진 탐색)"""
+
+    def __init__(self, classes):
+        self.classes_ = classes
+
+    @classmethod
+    def from_sklearn(cls, encoder) -> "ArrayLabelEncoder":
+        # object 배열은 mmap 불가하므로 고정 길이 유니코드 배열로 변환
+        return cls(np.asarray(encoder.classes_.tolist(), dtype=str))
+
+    def transform(self, values) -> np.ndarray:
+        values = np.asarray(values, dtype=str)
+        idx = np.searchsorted(self.classes_, values)
+        idx_clipped = np.minimum(idx, len(self.classes_) - 1)
+        unknown = self.classes_[idx_clipped] != values
+        if unknown.any():
+            raise ValueError(f"y contains previously unseen labels: {values[unknown].tolist()}")
+        return idx
+
+    def to_arrays(self) -> dict:
+        return {'classes': self.classes_}
+
+    @classmethod
+    def from_arrays(cls, arrays) -> "ArrayLabelEncoder":
+        return cls(arrays['classes'])
+
+
+class ArrayDenseNet:
+    """
+    Dense(relu/linear) 레이어만으로 구성된 keras Sequential 모델의 NumPy 순전파
+    - keras 와 같이 float32 로 연산
+    """
+
+    ACTIVATIONS = {
+        'relu': lambda x: np.maximum(x, 0, out=x),
+        'linear': lambda x: x,
+    }
+
+    def __init__(self, kernels: list, biases: list, activations: list):
+        self.kernels = kernels
+        self.biases = biases
+        self.activations = activations
+
+    @classmethod
+    def from_keras(cls, model) -> "ArrayDenseNet":
+        kernels, biases, activations = [], [], []
+        for layer in model.layers:
+            weights = layer.get_weights()
+            if not weights:
+                continue
+            activation = layer.get_config().get('activation', 'linear')
+            if activation not in cls.ACTIVATIONS:
+                raise ValueError(f"지원하지 않는 활성함수: {activation}")
+            kernels.append(np.asarray(weights[0], dtype=np.float32))
+            biases.append(np.asarray(weights[1], dtype=np.float32))
+            activations.append(activation)
+        return cls(kernels, biases, activations)
+
+    def predict(self, X, verbose=0) -> np.ndarray:
+        x = np.asarray(X, dtype=np.float32)
+        for kernel, bias, activation in zip(self.kernels, self.biases, self.activations):
+            x = x @ kernel
+            x += bias
+            x = self.ACTIVATIONS[activation](x)
+        return x
+
+    def to_arrays(self) -> dict:
+        arrays = {}
+        for i, (kernel, bias) in enumerate(zip(self.kernels, self.biases)):
+            arrays[f'kernel_{i}'] = kernel
+            arrays[f'bias_{i}'] = bias
+        return arrays
+
+    def to_meta(self) -> dict:
+        return {'activations': self.activations}
+
+    @classmethod
+    def from_arrays(cls, arrays, meta) -> "ArrayDenseNet":
+        n_layers = len(meta['activations'])
+        return cls(
+            kernels=[arrays[f'kernel_{i}'] for i in range(n_layers)],
+            biases=[arrays[f'bias_{i}'] for i in range(n_layers)],
+            activations=list(meta['activations']),
+        )
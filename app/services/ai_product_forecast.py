@@ -0,0 +1,222 @@
+import os
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from sqlalchemy.orm import Session
+from sqlalchemy import func, and_
+
+from core.model_store import new_version_dir, promote_version, latest_version_dir, save_arrays, load_arrays
+from services.ai_production_qty_prediction import build_feature_row, collect_past_production
+
+# 제품별 생산량 예측 모델
+# - 제품(MasterProduct)마다 LinearRegression 1개, 학습은 프로세스 풀에서 제품 단위 병렬 실행
+# - 저장: ai_models/production_qty_by_product/<version>/ (계수 행렬 .npy + manifest.json), LATEST 로 서비스 버전 지정
+# - 서빙: 전 제품 feature 행렬 x 제품별 계수 행렬을 한 번에 계산 (이력 조회 1회)
+
+MODEL_ROOT = Path('ai_models/production_qty_by_product')
+FEATURES = [
+    'month', 'day', 'day_of_week', 'week_of_year',
+    'production_lag_1', 'production_lag_6', 'production_lag_12',
+    'production_rolling_6', 'production_rolling_24', 'production_trend_6',
+]
+MIN_TRAIN_ROWS = 30
+
+
+def load_product_history(db: Session, start: datetime | None = None, end: datetime | None = None) -> dict:
+    """완료 작업지시의 제품별 일별 생산량 {product_id: {date: qty}} (쿼리 1회)"""
+    from models.work_order import WorkOrder
+
+    completion_date = func.date(WorkOrder.end_ts)
+    conditions = [WorkOrder.status == 'S5_DONE', WorkOrder.end_ts.isnot(None)]
+    if start is not None:
+        conditions.append(WorkOrder.end_ts >= start)
+    if end is not None:
+        conditions.append(WorkOrder.end_ts < end)
+
+    rows = (
+        db.query(WorkOrder.product_id, completion_date, func.sum(WorkOrder.planned_qty))
+        .filter(and_(*conditions))
+        .group_by(WorkOrder.product_id, completion_date)
+        .all()
+    )
+
+    history = {}
+    for product_id, d, qty in rows:
+        history.setdefault(product_id, {})[d] = float(qty or 0)
+    return history
+
+
+def build_training_set(daily_qty: dict) -> tuple[np.ndarray, np.ndarray]:
+    """일별 생산량 이력 -> (X, y). 첫 실적일 이후 모든 영업일 (실적 없는 날은 0)"""
+    if not daily_qty:
+        return np.zeros((0, len(FEATURES))), np.zeros(0)
+
+    first, last = min(daily_qty), max(daily_qty)
+    X, y = [], []
+    d = datetime.combine(first, datetime.min.time()) + timedelta(days=7)
+    end = datetime.combine(last, datetime.min.time())
+    while d <= end:
+        if d.weekday() != 6:
+            features, _ = build_feature_row(d, collect_past_production(daily_qty, d), zero_safe_trend=True)
+            X.append(features)
+            y.append(daily_qty.get(d.date(), 0.0))
+        d += timedelta(days=1)
+    return np.array(X, dtype=np.float64), np.array(y, dtype=np.float64)
+
+
+def train_product_model(product_id: str, daily_qty: dict, backtest_days: int = 20) -> dict:
+    """
+    제품 1개 학습 (프로세스 풀 워커에서 실행되므로 모듈 최상위 함수)
+    - 마지막 backtest_days 영업일에 대해 rolling-origin 재학습/예측으로 MAE/RMSE 산출
+    - 전체 이력으로 최종 학습
+    """
+    from sklearn.linear_model import LinearRegression
+
+    started = time.perf_counter()
+    X, y = build_training_set(daily_qty)
+    if len(X) < MIN_TRAIN_ROWS:
+        return {'product_id': product_id, 'skipped': f"학습 데이터 부족 ({len(X)}행)"}
+
+    backtest_days = min(backtest_days, len(X) - MIN_TRAIN_ROWS // 2)
+    errors = []
+    for i in range(len(X) - backtest_days, len(X)):
+        model = LinearRegression().fit(X[:i], y[:i])
+        errors.append(model.predict(X[i:i + 1])[0] - y[i])
+    errors = np.array(errors)
+
+    model = LinearRegression().fit(X, y)
+    return {
+        'product_id': product_id,
+        'coef': model.coef_.astype(np.float64),
+        'intercept': float(model.intercept_),
+        'mae': round(float(np.mean(np.abs(errors))), 2) if len(errors) else None,
+        'rmse': round(float(np.sqrt(np.mean(errors ** 2))), 2) if len(errors) else None,
+        'n_train': int(len(X)),
+        'train_sec': round(time.perf_counter() - started, 3),
+    }
+
+
+def train_all_products(db: Session, n_workers: int | None = None, promote: bool = True,
+                       root: Path = MODEL_ROOT) -> dict:
+    """
+    전 제품 모델을 프로세스 풀에서 병렬 학습 후 새 버전으로 저장
+    - DB 조회는 메인 프로세스에서 1회, 워커에는 제품별 이력 dict 만 전달
+    """
+    from models.master_product import MasterProduct
+
+    started = time.perf_counter()
+    product_ids = [p.product_id for p in db.query(MasterProduct.product_id).order_by(MasterProduct.product_id)]
+    history = load_product_history(db)
+    n_workers = n_workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        futures = [pool.submit(train_product_model, pid, history.get(pid, {})) for pid in product_ids]
+        results = [f.result() for f in futures]
+
+    trained = [r for r in results if 'coef' in r]
+    skipped = {r['product_id']: r['skipped'] for r in results if 'skipped' in r}
+    if not trained:
+        raise RuntimeError(f"학습 가능한 제품 없음: {skipped}")
+
+    version_dir = new_version_dir(root)
+    save_arrays(
+        version_dir,
+        {
+            'product_ids': np.array([r['product_id'] for r in trained], dtype=str),
+            'coef': np.vstack([r['coef'] for r in trained]),
+            'intercept': np.array([r['intercept'] for r in trained], dtype=np.float64),
+        },
+        meta={
+            'version': version_dir.name,
+            'trained_at': datetime.now().isoformat(timespec='seconds'),
+            'features': FEATURES,
+            'model': 'LinearRegression',
+            'n_workers': n_workers,
+            'wall_time_sec': round(time.perf_counter() - started, 3),
+            'products': {
+                r['product_id']: {k: r[k] for k in ('mae', 'rmse', 'n_train', 'train_sec')}
+                for r in trained
+            },
+            'skipped': skipped,
+        },
+    )
+    if promote:
+        promote_version(root, version_dir.name)
+
+    return load_arrays(version_dir)[1]
+
+
+class ProductForecastService:
+
+    def __init__(self, root: Path = MODEL_ROOT):
+        version_dir = latest_version_dir(root)
+        if version_dir is None:
+            raise RuntimeError(f"제품별 예측 모델 없음: {root} (scripts/train_product_forecast_models.py 실행 필요)")
+
+        arrays, self.model_info = load_arrays(version_dir)
+        self.product_ids = arrays['product_ids'].tolist()
+        self.coef = arrays['coef']
+        self.intercept = arrays['intercept']
+        self.version = self.model_info['version']
+        print(f"product_forecast_model({self.version}) 로드 완료")
+
+    def forecast_all(self, db: Session, start_date: str, n_days: int = 1) -> dict:
+        """
+        전 제품 x n_days 일 생산량 일괄 예측
+        이력 조회 1회, (제품 x 일자) feature 행렬과 행별 제품 계수의 내적 1회
+        """
+        first_date = datetime.strptime(start_date, '%Y-%m-%d')
+        target_dates = [
+            first_date + timedelta(days=i) for i in range(n_days)
+            if (first_date + timedelta(days=i)).weekday() != 6
+        ]
+        if not target_dates:
+            return {'version': self.version, 'forecasts': []}
+
+        history = load_product_history(db, first_date - timedelta(days=50), target_dates[-1])
+
+        rows, coef_idx, keys = [], [], []
+        for idx, product_id in enumerate(self.product_ids):
+            daily_qty = history.get(product_id, {})
+            for d in target_dates:
+                past = collect_past_production(daily_qty, d)
+                features, _ = build_feature_row(d, past, zero_safe_trend=True)
+                rows.append(features)
+                coef_idx.append(idx)
+                keys.append((product_id, d))
+
+        X = np.array(rows, dtype=np.float64)
+        coef_idx = np.array(coef_idx)
+        y = np.einsum('ij,ij->i', X, self.coef[coef_idx]) + self.intercept[coef_idx]
+
+        forecasts = {}
+        for (product_id, d), qty in zip(keys, y):
+            forecasts.setdefault(product_id, []).append({
+                'target_date': d.strftime('%Y-%m-%d'),
+                'predicted_production_qty': round(max(float(qty), 0.0), 0),
+            })
+
+        return {
+            'version': self.version,
+            'forecasts': [
+                {
+                    'product_id': product_id,
+                    'model_performance': self.model_info['products'].get(product_id, {}),
+                    'predictions': forecasts[product_id],
+                }
+                for product_id in self.product_ids
+            ],
+        }
+
+
+# 전역 서비스 인스턴스 (최초 요청 시 한 번만 로드)
+_product_forecast_service = None
+
+
+def get_product_forecast_service() -> ProductForecastService:
+    global _product_forecast_service
+    if _product_forecast_service is None:
+        _product_forecast_service = ProductForecastService()
+    return _product_forecast_service
@@ -2,12 +2,83 @@ import joblib
 import numpy as np
 import json
 from pathlib import Path
-import tensorflow as tf
-from tensorflow import keras
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_
 
+from core.model_store import mmap_artifact_dir, has_artifact, load_arrays
+from services.ai_model_arrays import ArrayLinearRegressor, ArrayStandardScaler, ArrayDenseNet
+from services.ai_tflite import TFLITE_PRECISION, TFLiteRegressor, tflite_model_path
+
+
+def build_feature_row(date_obj: datetime, past_production: list,
+                      zero_safe_trend: bool = False) -> tuple[list, dict]:
+    """
+    예측 입력 feature 1행 생성
+    past_production: 대상일 직전 영업일부터 역순으로 나열한 일별 생산량 (최대 24일)
+    zero_safe_trend: 6 영업일 전 생산량이 0 일 때 trend 를 0 으로 (기본은 ZeroDivisionError)
+    반환: (feature 리스트, 과거 생산량 요약 dict)
+    """
+    if len(past_production) < 6:
+        raise ValueError(f"과거 생산 데이터 부족 (최소 6일 필요, 현재 {len(past_production)}일)")
+
+    # 시간 features 추출
+    month = date_obj.month
+    day = date_obj.day
+    day_of_week = date_obj.weekday()  # 0=월, 5=토
+    week_of_year = date_obj.isocalendar()[1]
+
+    # Lag features 계산
+    production_lag_1 = past_production[0]   # 전 영업일
+    production_lag_6 = past_production[5]   # 6 영업일 전 (지난주 같은 요일)
+    production_lag_12 = past_production[11] if len(past_production) > 11 else past_production[5]
+
+    production_rolling_6 = np.mean(past_production[:6])
+    production_rolling_24 = np.mean(past_production[:24]) if len(past_production) >= 24 else np.mean(past_production)
+
+    if zero_safe_trend and production_lag_6 == 0:
+        production_trend_6 = 0.0
+    else:
+        production_trend_6 = (production_lag_1 - production_lag_6) / (production_lag_6)
+
+    features = [
+        month, day, day_of_week, week_of_year,
+        # 과거 생산량
+        production_lag_1,
+        production_lag_6,
+        production_lag_12,
+        production_rolling_6,
+        production_rolling_24,
+        production_trend_6
+    ]
+    past_data = {
+        'lag_1': float(production_lag_1),
+        'lag_6': float(production_lag_6),
+        'lag_12': float(production_lag_12),
+        'rolling_6': float(production_rolling_6),
+        'rolling_24': float(production_rolling_24),
+        'trend_6': float(production_trend_6)
+    }
+    return features, past_data
+
+
+def collect_past_production(daily_qty: dict, target_date: datetime) -> list:
+    """
+    일자별 생산량 dict({date: qty})에서 대상일 직전 영업일부터 역순으로 최대 24일치 추출
+    (일요일 제외, 최대 50일 전까지, 실적 없는 날은 0)
+    """
+    production_data = []
+    current_date = target_date - timedelta(days=1)
+
+    for _ in range(50):
+        if current_date.weekday() != 6:
+            production_data.append(float(daily_qty.get(current_date.date(), 0.0)))
+            if len(production_data) >= 24:
+                break
+        current_date -= timedelta(days=1)
+
+    return production_data
+
 
 class ProductionQuantityPredictionService:
     
@@ -19,13 +90,20 @@ class ProductionQuantityPredictionService:
             self._load_production_qty_sklearn_model()
         elif model_type == 'tensorflow':
             self._load_production_qty_tensorflow_model()
+        elif model_type == 'tflite':
+            self._load_production_qty_tflite_model()
         else:
             raise ValueError(f"지원하지 않는 모델 타입: {model_type}")
 
     # Scikit-learn 모델 로드    
+    # mmap 아티팩트(scripts/convert_model_artifacts.py)가 있으면 워커 간 공유 매핑으로 로드
     def _load_production_qty_sklearn_model(self):
         try:
-            self.model = joblib.load(self.model_dir / 'lr_production_qty_model.pkl')
+            model_dir = mmap_artifact_dir(self.model_dir, 'lr_production_qty_model')
+            if has_artifact(model_dir):
+                self.model = ArrayLinearRegressor.from_arrays(load_arrays(model_dir)[0])
+            else:
+                self.model = joblib.load(self.model_dir / 'lr_production_qty_model.pkl')
             with open(self.model_dir / 'lr_production_qty_model_info.json', 'r') as f:
                 self.model_info = json.load(f)
 
@@ -34,10 +112,16 @@ class ProductionQuantityPredictionService:
             raise RuntimeError(f"production_qty_sklearn_model 로드 실패: {e}")
     
     # TensorFlow 모델 로드    
+    # mmap 아티팩트가 있으면 TF 런타임 없이 NumPy 순전파로 추론
     def _load_production_qty_tensorflow_model(self):
         try:
-            self.model = keras.models.load_model(self.model_dir / 'dnn_production_qty_model.keras')
-            self.scaler = joblib.load(self.model_dir / 'dnn_production_qty_model_scaler.pkl')
+            net_dir = mmap_artifact_dir(self.model_dir, 'dnn_production_qty_model')
+            if has_artifact(net_dir):
+                self.model = ArrayDenseNet.from_arrays(*load_arrays(net_dir))
+            else:
+                from tensorflow import keras
+                self.model = keras.models.load_model(self.model_dir / 'dnn_production_qty_model.keras')
+            self.scaler = self._load_dnn_scaler()
             with open(self.model_dir / 'dnn_production_qty_model_info.json', 'r') as f:
                 self.model_info = json.load(f)
 
@@ -45,6 +129,25 @@ class ProductionQuantityPredictionService:
         except Exception as e:
             raise RuntimeError(f"production_qty_tensorflow_model 로드 실패: {e}")
 
+    # TFLite 모델 로드 (scripts/export_tflite_models.py 로 변환, 정밀도는 TFLITE_PRECISION)
+    def _load_production_qty_tflite_model(self):
+        try:
+            self.model = TFLiteRegressor(tflite_model_path(self.model_dir, 'dnn_production_qty_model', TFLITE_PRECISION))
+            self.scaler = self._load_dnn_scaler()
+            with open(self.model_dir / 'dnn_production_qty_model_info.json', 'r') as f:
+                self.model_info = json.load(f)
+
+            print(f"production_qty_tflite_model({TFLITE_PRECISION}) 로드 완료")
+        except Exception as e:
+            raise RuntimeError(f"production_qty_tflite_model 로드 실패: {e}")
+
+    # DNN 입력 스케일러 로드 (mmap 아티팩트 우선)
+    def _load_dnn_scaler(self):
+        scaler_dir = mmap_artifact_dir(self.model_dir, 'dnn_production_qty_model_scaler')
+        if has_artifact(scaler_dir):
+            return ArrayStandardScaler.from_arrays(load_arrays(scaler_dir)[0])
+        return joblib.load(self.model_dir / 'dnn_production_qty_model_scaler.pkl')
+
     def predict(self, db: Session, target_date: str) -> dict:
 
         try:
@@ -55,127 +158,161 @@ class ProductionQuantityPredictionService:
             if date_obj.weekday() == 6:
                 raise ValueError("일요일은 생산하지 않습니다")
 
-            # 시간 features 추출
-            month = date_obj.month
-            day = date_obj.day
-            day_of_week = date_obj.weekday()  # 0=월, 5=토
-            week_of_year = date_obj.isocalendar()[1]
-            
             # 과거 생산 데이터 자동 조회
             past_production = self._get_past_production(db, date_obj)
-            
-            if len(past_production) < 6:
-                raise ValueError(f"과거 생산 데이터 부족 (최소 6일 필요, 현재 {len(past_production)}일)")
-            
-            # Lag features 계산
-            production_lag_1 = past_production[0]   # 전 영업일
-            production_lag_6 = past_production[5]   # 6 영업일 전 (지난주 같은 요일)
-            production_lag_12 = past_production[11] if len(past_production) > 11 else past_production[5]
-            
-            production_rolling_6 = np.mean(past_production[:6])
-            production_rolling_24 = np.mean(past_production[:24]) if len(past_production) >= 24 else np.mean(past_production)
-            
-            production_trend_6 = (production_lag_1 - production_lag_6) / (production_lag_6)
-            
-            X = np.array([[
-                month, day, day_of_week, week_of_year,
-                # 과거 생산량
-                production_lag_1,
-                production_lag_6,
-                production_lag_12,
-                production_rolling_6,
-                production_rolling_24,
-                production_trend_6
-            ]])
-            
+            features, past_data = build_feature_row(date_obj, past_production)
+
             # 예측
-            if self.model_type == 'sklearn':
-                predicted_qty = self.model.predict(X)[0]
-            else:  # tensorflow
-                scaled_x = self.scaler.transform(X)
-                predicted_qty = self.model.predict(scaled_x)[0][0]
-
-            # 결과 반환
-            return {
-                'predicted_production_qty': round(float(predicted_qty), 0),
-                'target_date': target_date,
-                'day_of_week': ['월', '화', '수', '목', '금', '토'][day_of_week],
-                'model_type': self.model_type,
-                'model_performance': {
-                    'mae': self.model_info['mae'],
-                    'rmse': self.model_info['rmse'],
-                    'r2_score': self.model_info['score']
-                },
-                'past_production_data': {
-                    'lag_1': float(production_lag_1),
-                    'lag_6': float(production_lag_6),
-                    'lag_12': float(production_lag_12),
-                    'rolling_6': float(production_rolling_6),
-                    'rolling_24': float(production_rolling_24),
-                    'trend_6': float(production_trend_6)
-                },
-                'date_features': {
-                    'month': month,
-                    'day': day,
-                    'week_of_year': week_of_year
-                }
-            }
+            predicted_qty = self._predict_array(np.array([features]))[0]
+
+            return self._format_result(date_obj, features, past_data, predicted_qty)
         
         except Exception as e:
             raise RuntimeError(f"예측 실패: {e}")
+
+    # 예측 결과 dict 구성
+    def _format_result(self, date_obj: datetime, features: list, past_data: dict, predicted_qty) -> dict:
+        month, day, day_of_week, week_of_year = features[:4]
+        return {
+            'predicted_production_qty': round(float(predicted_qty), 0),
+            'target_date': date_obj.strftime('%Y-%m-%d'),
+            'day_of_week': ['월', '화', '수', '목', '금', '토'][day_of_week],
+            'model_type': self.model_type,
+            'model_performance': {
+                'mae': self.model_info['mae'],
+                'rmse': self.model_info['rmse'],
+                'r2_score': self.model_info['score']
+            },
+            'past_production_data': past_data,
+            'date_features': {
+                'month': month,
+                'day': day,
+                'week_of_year': week_of_year
+            }
+        }
     
-    def _get_past_production(self, db: Session, target_date: datetime) -> list:
+    # 모델 타입별 배열 예측
+    def _predict_array(self, X: np.ndarray) -> np.ndarray:
+        if self.model_type == 'sklearn':
+            return self.model.predict(X)
+        # tensorflow / tflite
+        scaled_x = self.scaler.transform(X)
+        return self.model.predict(scaled_x, verbose=0)[:, 0]
 
+    def _get_daily_production(self, db: Session, start: datetime, end: datetime) -> dict:
+        """[start, end) 기간 완료 작업지시의 일별 생산량 {date: qty} (쿼리 1회)"""
         from models.work_order import WorkOrder
-        
-        production_data = []
-        current_date = target_date - timedelta(days=1) 
-        
+
+        completion_date = func.date(WorkOrder.end_ts)
+        rows = (
+            db.query(completion_date, func.sum(WorkOrder.planned_qty))
+            .filter(
+                and_(
+                    WorkOrder.status == 'S5_DONE',
+                    WorkOrder.end_ts >= start,
+                    WorkOrder.end_ts < end,
+                )
+            )
+            .group_by(completion_date)
+            .all()
+        )
+        return {d: float(qty) for d, qty in rows if qty}
+
+    def _get_past_production(self, db: Session, target_date: datetime) -> list:
         # 최대 50일 전까지 조회 (영업일 24일 확보용)
-        for _ in range(50):
-            # 일요일 제외
-            if current_date.weekday() != 6:
-                # 해당 날짜 생산량 조회 (완료된 작업의 planned_qty 합계)
-                daily_qty = db.query(
-                    func.sum(WorkOrder.planned_qty)
-                ).filter(
-                    and_(
-                        WorkOrder.status == 'S5_DONE',
-                        func.date(WorkOrder.end_ts) == current_date.date()
-                    )
-                ).scalar()
-                
-                production_data.append(float(daily_qty) if daily_qty else 0.0)
-                
-                # 24개 영업일 확보되면 종료
-                if len(production_data) >= 24:
-                    break
-            
-            current_date -= timedelta(days=1)
-        
-        return production_data
-    
-    def predict_next_n_days(self, db: Session, start_date: str, n_days: int = 7) -> list:
+        daily_qty = self._get_daily_production(db, target_date - timedelta(days=50), target_date)
+        return collect_past_production(daily_qty, target_date)
+
+    def predict_horizon(self, db: Session, start_date: str, n_days: int = 7,
+                        recursive: bool = False, max_steps: int | None = None,
+                        tol: float = 0.5) -> list:
+        """
+        다일(horizon) 예측 - 이력 조회 1회 + 전체 일자 feature 행렬 일괄 예측
+        - recursive=False: 실적이 없는 날의 lag 는 0 (predict() 를 날짜별로 호출한 것과 동일)
+        - recursive=True : 마지막 실적일 이후 날짜의 lag/rolling 에 앞선 날짜의 예측값을 사용
+          전체 일자를 한 번에 예측하고 예측값을 다시 lag 에 넣는 고정점 반복으로 계산하며,
+          스텝마다 모델 호출은 1회. k 스텝 후 앞쪽 k 일은 순차 예측과 정확히 같고
+          변화량이 tol 미만이면 조기 종료 (max_steps 기본값 = 미래 영업일 수 -> 순차 예측과 동일)
+        """
+        first_date = datetime.strptime(start_date, '%Y-%m-%d')
+
+        # 대상 일자 (일요일 제외, n_days 는 달력 기준)
+        target_dates = [
+            first_date + timedelta(days=i) for i in range(n_days)
+            if (first_date + timedelta(days=i)).weekday() != 6
+        ]
+        if not target_dates:
+            return []
+
+        history_start = first_date - timedelta(days=50)
+        actual_qty = self._get_daily_production(db, history_start, target_dates[-1])
+
+        # 재귀 모드: 마지막 실적일 다음 날부터 예측값으로 채움 (시작일 이전 공백 포함, 최대 50일)
+        forecast_dates = list(target_dates)
+        if recursive:
+            last_actual = max(actual_qty) if actual_qty else history_start.date()
+            gap_day = max(datetime.combine(last_actual, datetime.min.time()) + timedelta(days=1), history_start)
+            gap_dates = []
+            while gap_day < first_date:
+                if gap_day.weekday() != 6:
+                    gap_dates.append(gap_day)
+                gap_day += timedelta(days=1)
+            forecast_dates = gap_dates + forecast_dates
+            future_dates = [d for d in forecast_dates if d.date() > last_actual]
+        else:
+            future_dates = []
 
+        # 초기 추정값: 최근 6 영업일 실적 평균
+        recent = collect_past_production(actual_qty, forecast_dates[0])[:6]
+        initial = float(np.mean(recent)) if recent else 0.0
+        predicted = {d.date(): initial for d in future_dates}
+
+        steps = 0
+        step_limit = max_steps if max_steps is not None else max(1, len(future_dates))
+        while True:
+            daily_qty = {**actual_qty, **predicted}
+            rows, valid_dates, past_list, errors = [], [], [], {}
+            for d in forecast_dates:
+                try:
+                    features, past_data = build_feature_row(d, collect_past_production(daily_qty, d))
+                except (ValueError, ZeroDivisionError) as e:
+                    errors[d] = e
+                    continue
+                rows.append(features)
+                valid_dates.append(d)
+                past_list.append(past_data)
+
+            y = self._predict_array(np.array(rows)) if rows else np.zeros(0)
+            steps += 1
+
+            if not recursive:
+                break
+            change = 0.0
+            for d, qty in zip(valid_dates, y):
+                if d.date() in predicted:
+                    change = max(change, abs(float(qty) - predicted[d.date()]))
+                    predicted[d.date()] = float(qty)
+            if change < tol or steps >= step_limit:
+                break
+
+        for d in target_dates:
+            if d in errors:
+                print(f"예측 실패 ({d.strftime('%Y-%m-%d')}): {errors[d]}")
+
+        target_set = set(target_dates)
         results = []
-        current_date = datetime.strptime(start_date, '%Y-%m-%d')
-        
-        for i in range(n_days):
-            # 일요일은 건너뛰기
-            if current_date.weekday() == 6:
-                current_date += timedelta(days=1)
-                continue
-            
-            try:
-                result = self.predict(db, current_date.strftime('%Y-%m-%d'))
+        for d, features, past_data, qty in zip(valid_dates, rows, past_list, y):
+            if d in target_set:
+                result = self._format_result(d, features, past_data, qty)
+                result['recursive'] = recursive
+                result['forecast_steps'] = steps
                 results.append(result)
-            except Exception as e:
-                print(f"예측 실패 ({current_date.strftime('%Y-%m-%d')}): {e}")
-            
-            current_date += timedelta(days=1)
-        
         return results
     
+    def predict_next_n_days(self, db: Session, start_date: str, n_days: int = 7,
+                            recursive: bool = False) -> list:
+        return self.predict_horizon(db, start_date, n_days, recursive=recursive)
+    
     
     # 모델 정보 반환    
     def get_model_info(self) -> dict:
@@ -185,6 +322,7 @@ class ProductionQuantityPredictionService:
 # 전역 서비스 인스턴스 (서버 시작시 한 번만 로드)
 _production_qty_sklearn_service = None
 _production_qty_tensorflow_service = None
+_production_qty_tflite_service = None
 
 
 def get_production_qty_sklearn_service() -> ProductionQuantityPredictionService:
@@ -198,4 +336,23 @@ def get_production_qty_tensorflow_service() -> ProductionQuantityPredictionServi
     global _production_qty_tensorflow_service
     if _production_qty_tensorflow_service is None:
         _production_qty_tensorflow_service = ProductionQuantityPredictionService(model_type='tensorflow')
-    return _production_qty_tensorflow_service
\ No newline at end of file
+    return _production_qty_tensorflow_service
+
+
+def get_production_qty_tflite_service() -> ProductionQuantityPredictionService:
+    global _production_qty_tflite_service
+    if _production_qty_tflite_service is None:
+        _production_qty_tflite_service = ProductionQuantityPredictionService(model_type='tflite')
+    return _production_qty_tflite_service
+
+
+def get_production_qty_service(model_type: str = 'sklearn') -> ProductionQuantityPredictionService:
+    # 라우트의 model_type 파라미터 -> 서비스 (sklearn | tensorflow | tflite)
+    getters = {
+        'sklearn': get_production_qty_sklearn_service,
+        'tensorflow': get_production_qty_tensorflow_service,
+        'tflite': get_production_qty_tflite_service,
+    }
+    if model_type not in getters:
+        raise ValueError(f"지원하지 않는 모델 타입: {model_type}")
+    return getters[model_type]()
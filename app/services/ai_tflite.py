@@ -0,0 +1,89 @@
+import os
+import threading
+import numpy as np
+from pathlib import Path
+
+# TFLite 추론 백엔드
+# - 경량 인터프리터(ai-edge-litert 또는 tflite-runtime)가 설치되어 있으면 TF 런타임 없이 동작
+# - 둘 다 없으면 tensorflow 의 tf.lite.Interpreter 로 대체
+
+TFLITE_PRECISIONS = ('float32', 'float16', 'int8')
+
+# 서비스(model_type='tflite')가 로드할 변환 정밀도
+TFLITE_PRECISION = os.getenv('TFLITE_PRECISION', 'float32')
+
+# 서버 기동 시 로드할 DNN 백엔드 (tensorflow | tflite)
+# - tflite + 경량 인터프리터 설치 시 서빙 프로세스에 TF 런타임이 필요 없음 (TF 는 .tflite 변환에만 사용)
+DNN_BACKEND = os.getenv('DNN_BACKEND', 'tensorflow')
+if DNN_BACKEND not in ('tensorflow', 'tflite'):
+    raise ValueError(f"지원하지 않는 DNN_BACKEND: {DNN_BACKEND}")
+
+
+def load_interpreter_class():
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    try:
+        from tflite_runtime.interpreter import Interpreter
+        return Interpreter
+    except ImportError:
+        pass
+    import tensorflow as tf
+    return tf.lite.Interpreter
+
+
+def interpreter_backend() -> str:
+    # 실제 사용되는 인터프리터 패키지 (ai_edge_litert / tflite_runtime / tensorflow)
+    return load_interpreter_class().__module__.split('.')[0]
+
+
+def tflite_model_path(model_dir: Path, name: str, precision: str) -> Path:
+    if precision not in TFLITE_PRECISIONS:
+        raise ValueError(f"지원하지 않는 TFLite 정밀도: {precision}")
+    return Path(model_dir) / f'{name}_{precision}.tflite'
+
+
+class TFLiteRegressor:
+    """
+    keras model.predict 와 같은 형태((n, 1) 출력)로 호출하는 TFLite 회귀 모델
+    - 인터프리터는 스레드 안전하지 않으므로 호출을 잠금으로 직렬화
+    - 배치 크기가 바뀔 때만 입력 텐서 크기를 재할당
+    """
+
+    def __init__(self, model_path: Path, num_threads: int = 1):
+        Interpreter = load_interpreter_class()
+        self.model_path = Path(model_path)
+        self.interpreter = Interpreter(model_path=str(self.model_path), num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self._input = self.interpreter.get_input_details()[0]
+        self._output = self.interpreter.get_output_details()[0]
+        self._batch_size = int(self._input['shape'][0])
+        self._lock = threading.Lock()
+
+    def _quantize(self, X: np.ndarray) -> np.ndarray:
+        # 정수 입력 모델(int8 I/O)일 때만 양자화, float I/O 모델은 그대로 전달
+        dtype = self._input['dtype']
+        if dtype == np.float32:
+            return X.astype(np.float32)
+        scale, zero_point = self._input['quantization']
+        return np.clip(np.round(X / scale + zero_point), np.iinfo(dtype).min, np.iinfo(dtype).max).astype(dtype)
+
+    def _dequantize(self, y: np.ndarray) -> np.ndarray:
+        if self._output['dtype'] == np.float32:
+            return y
+        scale, zero_point = self._output['quantization']
+        return (y.astype(np.float32) - zero_point) * scale
+
+    def predict(self, X, verbose=0) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float32)
+        with self._lock:
+            if X.shape[0] != self._batch_size:
+                self.interpreter.resize_tensor_input(self._input['index'], list(X.shape))
+                self.interpreter.allocate_tensors()
+                self._batch_size = X.shape[0]
+            self.interpreter.set_tensor(self._input['index'], self._quantize(X))
+            self.interpreter.invoke()
+            y = self.interpreter.get_tensor(self._output['index']).copy()
+        return self._dequantize(y)
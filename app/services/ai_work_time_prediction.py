@@ -2,8 +2,11 @@ import joblib
 import numpy as np
 import json
 from pathlib import Path
-import tensorflow as tf
-from tensorflow import keras
+
+from core.model_store import mmap_artifact_dir, has_artifact, load_arrays
+from services.ai_compiled_forest import CompiledForestRegressor
+from services.ai_model_arrays import ArrayStandardScaler, ArrayLabelEncoder, ArrayDenseNet
+from services.ai_tflite import TFLITE_PRECISION, TFLiteRegressor, tflite_model_path
 
 
 class WorkTimePredictionService:
@@ -16,16 +19,37 @@ class WorkTimePredictionService:
             self._load_work_time_sklearn_model()
         elif model_type == 'tensorflow':
             self._load_work_time_tensorflow_model()
+        elif model_type == 'tflite':
+            self._load_work_time_tflite_model()
         else:
             raise ValueError(f"지원하지 않는 모델 타입: {model_type}")
         
-        self.le_product = joblib.load(self.model_dir / 'label_encoder_product.pkl')
-        self.le_equipment = joblib.load(self.model_dir / 'label_encoder_equipment.pkl')
+        self.le_product = self._load_label_encoder('label_encoder_product')
+        self.le_equipment = self._load_label_encoder('label_encoder_equipment')
+
+    # Label Encoder 로드 (mmap 아티팩트 우선)
+    def _load_label_encoder(self, name: str):
+        encoder_dir = mmap_artifact_dir(self.model_dir, name)
+        if has_artifact(encoder_dir):
+            return ArrayLabelEncoder.from_arrays(load_arrays(encoder_dir)[0])
+        return joblib.load(self.model_dir / f'{name}.pkl')
 
     # Scikit-learn 모델 로드    
+    # 컴파일된 트리 배열(mmap > npz)이 있으면 우선 사용하고, 없으면 pkl 을 로드해 즉시 컴파일
+    # 대배치(스케줄러/지연 위험 일괄 예측)는 pkl 추정기로 위임 - 필요한 워커에서만 최초 1회 로드
     def _load_work_time_sklearn_model(self):
         try:
-            self.model = joblib.load(self.model_dir / 'rf_work_time_model.pkl')
+            forest_dir = mmap_artifact_dir(self.model_dir, 'rf_work_time_model_compiled')
+            compiled_path = self.model_dir / 'rf_work_time_model_compiled.npz'
+            pkl_path = self.model_dir / 'rf_work_time_model.pkl'
+            if has_artifact(forest_dir):
+                self.model = CompiledForestRegressor.from_arrays(load_arrays(forest_dir)[0])
+            elif compiled_path.exists():
+                self.model = CompiledForestRegressor.load(compiled_path)
+            else:
+                self.model = CompiledForestRegressor.from_sklearn(joblib.load(pkl_path))
+            if pkl_path.exists():
+                self.model.set_fallback(lambda: joblib.load(pkl_path))
             with open(self.model_dir / 'rf_work_time_model_info.json', 'r') as f:
                 self.model_info = json.load(f)
             
@@ -34,16 +58,41 @@ class WorkTimePredictionService:
             raise RuntimeError(f"work_time_scikit_model 로드 실패: {e}")
     
     # TensorFlow 모델 로드    
+    # mmap 아티팩트가 있으면 TF 런타임 없이 NumPy 순전파로 추론
     def _load_work_time_tensorflow_model(self):
         try:
-            self.model = keras.models.load_model(self.model_dir / 'dnn_work_time_model.keras')
-            self.scaler = joblib.load(self.model_dir / 'dnn_work_time_model_scaler.pkl')
+            net_dir = mmap_artifact_dir(self.model_dir, 'dnn_work_time_model')
+            if has_artifact(net_dir):
+                self.model = ArrayDenseNet.from_arrays(*load_arrays(net_dir))
+            else:
+                from tensorflow import keras
+                self.model = keras.models.load_model(self.model_dir / 'dnn_work_time_model.keras')
+            self.scaler = self._load_dnn_scaler()
             with open(self.model_dir / 'dnn_work_time_model_info.json', 'r') as f:
                 self.model_info = json.load(f)
 
             print("work_time_tensorflow_model 로드 완료")
         except Exception as e:
             raise RuntimeError(f"work_time_tensorflow_model 로드 실패: {e}")
+
+    # TFLite 모델 로드 (scripts/export_tflite_models.py 로 변환, 정밀도는 TFLITE_PRECISION)
+    def _load_work_time_tflite_model(self):
+        try:
+            self.model = TFLiteRegressor(tflite_model_path(self.model_dir, 'dnn_work_time_model', TFLITE_PRECISION))
+            self.scaler = self._load_dnn_scaler()
+            with open(self.model_dir / 'dnn_work_time_model_info.json', 'r') as f:
+                self.model_info = json.load(f)
+
+            print(f"work_time_tflite_model({TFLITE_PRECISION}) 로드 완료")
+        except Exception as e:
+            raise RuntimeError(f"work_time_tflite_model 로드 실패: {e}")
+
+    # DNN 입력 스케일러 로드 (mmap 아티팩트 우선)
+    def _load_dnn_scaler(self):
+        scaler_dir = mmap_artifact_dir(self.model_dir, 'dnn_work_time_model_scaler')
+        if has_artifact(scaler_dir):
+            return ArrayStandardScaler.from_arrays(load_arrays(scaler_dir)[0])
+        return joblib.load(self.model_dir / 'dnn_work_time_model_scaler.pkl')
     
     def predict(self, product_id: str, operation_seq: int, 
                 equipment_id: str, planned_qty: int) -> dict:
@@ -57,11 +106,7 @@ class WorkTimePredictionService:
             X = np.array([[product_encoded, operation_seq, equipment_encoded, planned_qty]])
             
             # 예측
-            if self.model_type == 'sklearn':
-                predicted_sec = self.model.predict(X)[0]
-            else:  # tensorflow
-                scaled_x = self.scaler.transform(X)
-                predicted_sec = self.model.predict(scaled_x)[0][0]
+            predicted_sec = self._predict_array(X)[0]
 
             # 결과 반환
             return {
@@ -84,6 +129,33 @@ class WorkTimePredictionService:
         except Exception as e:
             raise RuntimeError(f"예측 실패: {e}")
     
+    def predict_batch(self, rows: list) -> np.ndarray:
+        """
+        여러 건 일괄 예측 (모델 호출 1회)
+        rows: [(product_id, operation_seq, equipment_id, planned_qty), ...]
+        반환: 예측 작업시간(초) 배열
+        """
+        if not rows:
+            return np.zeros(0)
+
+        product_ids, operation_seqs, equipment_ids, planned_qtys = zip(*rows)
+        try:
+            product_encoded = self.le_product.transform(list(product_ids))
+            equipment_encoded = self.le_equipment.transform(list(equipment_ids))
+        except ValueError as e:
+            raise ValueError(f"알 수 없는 제품/설비 ID: {e}")
+
+        X = np.column_stack([product_encoded, operation_seqs, equipment_encoded, planned_qtys])
+        return self._predict_array(X)
+
+    # 모델 타입별 배열 예측
+    def _predict_array(self, X: np.ndarray) -> np.ndarray:
+        if self.model_type == 'sklearn':
+            return self.model.predict(X)
+        # tensorflow / tflite
+        scaled_x = self.scaler.transform(X)
+        return self.model.predict(scaled_x, verbose=0)[:, 0]
+
     # 제품 ID Label Encoding    
     def _encode_product(self, product_id: str) -> int:
         try:
@@ -115,6 +187,7 @@ class WorkTimePredictionService:
 # 전역 서비스 인스턴스 (서버 시작시 한 번만 로드)
 _work_time_sklearn_service = None
 _work_time_tensorflow_service = None
+_work_time_tflite_service = None
 
 
 def get_work_time_sklearn_service() -> WorkTimePredictionService:
@@ -128,4 +201,23 @@ def get_work_time_tensorflow_service() -> WorkTimePredictionService:
     global _work_time_tensorflow_service
     if _work_time_tensorflow_service is None:
         _work_time_tensorflow_service = WorkTimePredictionService(model_type='tensorflow')
-    return _work_time_tensorflow_service
\ No newline at end of file
+    return _work_time_tensorflow_service
+
+
+def get_work_time_tflite_service() -> WorkTimePredictionService:
+    global _work_time_tflite_service
+    if _work_time_tflite_service is None:
+        _work_time_tflite_service = WorkTimePredictionService(model_type='tflite')
+    return _work_time_tflite_service
+
+
+def get_work_time_service(model_type: str = 'sklearn') -> WorkTimePredictionService:
+    # 라우트의 model_type 파라미터 -> 서비스 (sklearn | tensorflow | tflite)
+    getters = {
+        'sklearn': get_work_time_sklearn_service,
+        'tensorflow': get_work_time_tensorflow_service,
+        'tflite': get_work_time_tflite_service,
+    }
+    if model_type not in getters:
+        raise ValueError(f"지원하지 않는 모델 타입: {model_type}")
+    return getters[model_type]()
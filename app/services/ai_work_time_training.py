@@ -0,0 +1,234 @@
+import json
+import resource
+import shutil
+import time
+import joblib
+import numpy as np
+from datetime import datetime
+from pathlib import Path
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from core.model_store import (
+    new_version_dir, promote_version, latest_version_dir, save_arrays, mmap_artifact_dir, MANIFEST_NAME,
+)
+from models.work_order import WorkOrder
+from models.work_result import WorkResult
+from services.ai_compiled_forest import CompiledForestRegressor
+
+# 작업시간 RandomForest 재학습 파이프라인
+# - work_results x work_orders 를 서버사이드 커서로 chunk 단위 스트리밍 (메모리 = chunk 1개 + 트리)
+# - RandomForest warm_start: chunk 마다 trees_per_chunk 개의 트리를 추가 학습 (트리 내부는 n_jobs 병렬)
+# - 이전 버전의 trained_until 이후 실적만 학습하여 기존 모델에 트리를 덧붙이는 증분 모드 지원
+#   (trained_until 이 없는 기반 모델은 학습 범위를 알 수 없으므로 증분 불가 -> 전체 재학습 필요)
+# - 트리 수는 max_estimators 로 제한: 초과 시 가장 오래된(과거 실적으로 학습한) 트리부터 제거
+#   (모델 크기/추론 비용이 재학습마다 무한히 증가하지 않도록, 최근 실적 위주의 이동 윈도우)
+# - 결과: ai_models/work_time/versions/<version>/ (pkl + info json + 컴파일 npz)
+
+MODEL_DIR = Path('ai_models/work_time')
+VERSIONS_DIR = MODEL_DIR / 'versions'
+FEATURES = ['product_encoded', 'operation_seq', 'equipment_encoded', 'planned_qty']  # 서비스 입력 순서
+EVAL_EVERY = 5             # 5행 중 1행은 평가용으로 보류
+EVAL_MAX_ROWS = 50_000     # 평가 보류 행 상한 (메모리 제한)
+MAX_ESTIMATORS = 100       # 트리 수 상한 (배포 기본 모델과 같은 규모)
+
+
+def stream_training_rows(db: Session, chunk_size: int, since: datetime | None = None):
+    """완료된 공정 실적을 종료시각 순으로 chunk 단위 스트리밍 (psycopg2 named cursor)"""
+    stmt = (
+        select(
+            WorkOrder.product_id,
+            WorkResult.operation_seq,
+            WorkResult.equipment_id,
+            WorkOrder.planned_qty,
+            WorkResult.start_ts,
+            WorkResult.end_ts,
+        )
+        .join(WorkOrder, WorkResult.order_id == WorkOrder.order_id)
+        .where(WorkResult.equipment_id.isnot(None), WorkResult.end_ts > WorkResult.start_ts)
+        .order_by(WorkResult.end_ts)
+    )
+    if since is not None:
+        stmt = stmt.where(WorkResult.end_ts > since)
+
+    result = db.execute(stmt.execution_options(stream_results=True, yield_per=chunk_size))
+    yield from result.partitions(chunk_size)
+
+
+def rows_to_arrays(rows, le_product, le_equipment) -> tuple[np.ndarray, np.ndarray, datetime, int]:
+    """chunk -> (X, y, chunk 내 최대 종료시각, 미등록 제품/설비로 제외된 행 수)"""
+    product_ids, operation_seqs, equipment_ids, planned_qtys, start_ts, end_ts = zip(*rows)
+    product_ids = np.asarray(product_ids, dtype=str)
+    equipment_ids = np.asarray(equipment_ids, dtype=str)
+
+    known = np.isin(product_ids, le_product.classes_) & np.isin(equipment_ids, le_equipment.classes_)
+    start = np.asarray(start_ts, dtype='datetime64[us]')
+    end = np.asarray(end_ts, dtype='datetime64[us]')
+    duration_sec = (end - start).astype('timedelta64[us]').astype(np.float64) / 1e6
+
+    X = np.column_stack([
+        le_product.transform(product_ids[known]),
+        np.asarray(operation_seqs, dtype=np.float64)[known],
+        le_equipment.transform(equipment_ids[known]),
+        np.asarray(planned_qtys, dtype=np.float64)[known],
+    ]).astype(np.float64)
+    return X, duration_sec[known], max(end_ts), int((~known).sum())
+
+
+def load_base_model(base_dir: Path):
+    with open(base_dir / 'rf_work_time_model_info.json', 'r') as f:
+        info = json.load(f)
+    model = joblib.load(base_dir / 'rf_work_time_model.pkl')
+    return model, info
+
+
+def retrain(db: Session, chunk_size: int = 50_000, trees_per_chunk: int = 10,
+            incremental: bool = True, n_jobs: int = -1, max_depth: int | None = None,
+            random_state: int = 42, max_estimators: int = MAX_ESTIMATORS) -> dict:
+    """
+    chunk 스트리밍 재학습 후 새 버전 디렉토리에 저장하고 info dict 반환
+    incremental=True 이면 최신 버전(없으면 현재 서비스 모델)에 이어서 trained_until 이후 실적만 학습
+    트리 수가 max_estimators 를 넘으면 오래된 트리부터 제거
+    """
+    from sklearn.ensemble import RandomForestRegressor
+
+    if not 0 < trees_per_chunk <= max_estimators:
+        raise ValueError(f"trees_per_chunk({trees_per_chunk}) 는 1 ~ max_estimators({max_estimators}) 범위여야 함")
+
+    le_product = joblib.load(MODEL_DIR / 'label_encoder_product.pkl')
+    le_equipment = joblib.load(MODEL_DIR / 'label_encoder_equipment.pkl')
+
+    model, base_info, since = None, None, None
+    if incremental:
+        base_dir = latest_version_dir(VERSIONS_DIR) or MODEL_DIR
+        if (base_dir / 'rf_work_time_model.pkl').exists():
+            model, base_info = load_base_model(base_dir)
+            since_raw = base_info.get('trained_until')
+            if not since_raw:
+                # 전체 이력을 다시 읽어 같은 데이터로 학습한 트리를 중복으로 쌓게 됨
+                raise RuntimeError(f"기반 모델({base_dir})에 trained_until 없음 - 전체 재학습(incremental=False) 필요")
+            since = datetime.fromisoformat(since_raw)
+            model.set_params(warm_start=True, n_jobs=n_jobs)
+
+    if model is None:
+        model = RandomForestRegressor(
+            n_estimators=trees_per_chunk, warm_start=True, n_jobs=n_jobs,
+            max_depth=max_depth, random_state=random_state,
+        )
+    initial_trees = len(getattr(model, 'estimators_', []))
+    n_dropped = 0
+
+    started = time.perf_counter()
+    n_rows, n_skipped, n_chunks = 0, 0, 0
+    trained_until = since
+    fetch_sec = fit_sec = 0.0
+    eval_X, eval_y = [], []
+    n_eval = n_fit_rows = 0
+
+    fetch_started = time.perf_counter()
+    for rows in stream_training_rows(db, chunk_size, since):
+        X, y, chunk_until, skipped = rows_to_arrays(rows, le_product, le_equipment)
+        fetch_sec += time.perf_counter() - fetch_started
+        n_skipped += skipped
+        trained_until = chunk_until if trained_until is None else max(trained_until, chunk_until)
+
+        # 평가용 보류 (행 번호 기준 결정적 분할, 상한까지만 보관)
+        holdout = (np.arange(n_rows, n_rows + len(X)) % EVAL_EVERY) == 0
+        holdout[np.flatnonzero(holdout)[max(0, EVAL_MAX_ROWS - n_eval):]] = False
+        if holdout.any():
+            eval_X.append(X[holdout])
+            eval_y.append(y[holdout])
+            n_eval += int(holdout.sum())
+        n_rows += len(X)
+
+        X_train, y_train = X[~holdout], y[~holdout]
+        n_fit_rows += len(X_train)
+        if len(X_train) >= 2:
+            fit_started = time.perf_counter()
+            estimators = getattr(model, 'estimators_', [])
+            excess = len(estimators) + trees_per_chunk - max_estimators
+            if excess > 0:
+                model.estimators_ = estimators[excess:]
+                n_dropped += excess
+            model.set_params(n_estimators=len(getattr(model, 'estimators_', [])) + trees_per_chunk)
+            model.fit(X_train, y_train)
+            fit_sec += time.perf_counter() - fit_started
+            n_chunks += 1
+
+        del rows, X, y, X_train, y_train
+        fetch_started = time.perf_counter()
+
+    if n_chunks == 0:
+        raise RuntimeError(f"학습할 신규 실적 없음 (since={since})")
+
+    total_sec = time.perf_counter() - started
+    # 스레드 병렬 predict 는 누적 순서가 달라질 수 있으므로 저장 모델은 순차 예측으로 고정
+    model.set_params(warm_start=False, n_jobs=None)
+
+    metrics = {}
+    if eval_X:
+        ex, ey = np.vstack(eval_X), np.concatenate(eval_y)
+        pred = model.predict(ex)
+        err = pred - ey
+        ss_tot = float(np.sum((ey - ey.mean()) ** 2))
+        metrics = {
+            'mae': round(float(np.mean(np.abs(err))), 2),
+            'rmse': round(float(np.sqrt(np.mean(err ** 2))), 2),
+            'score': 1 - float(np.sum(err ** 2)) / ss_tot if ss_tot > 0 else 0.0,
+        }
+
+    version_dir = new_version_dir(VERSIONS_DIR)
+    joblib.dump(model, version_dir / 'rf_work_time_model.pkl')
+
+    compiled = CompiledForestRegressor.from_sklearn(model)
+    if eval_X and not np.array_equal(compiled.predict(ex), pred):
+        raise RuntimeError("컴파일 모델 예측 불일치")
+    compiled.save(version_dir / 'rf_work_time_model_compiled.npz')
+
+    info = {
+        'features': FEATURES,
+        'label': 'actual_time_sec',
+        **metrics,
+        'n_train': n_fit_rows + (base_info or {}).get('n_train', 0),
+        'n_test': n_eval,
+        'product_classes': le_product.classes_.tolist(),
+        'equipment_classes': le_equipment.classes_.tolist(),
+        'version': version_dir.name,
+        'base_version': (base_info or {}).get('version'),
+        'trained_until': trained_until.isoformat() if trained_until else None,
+        'n_estimators': len(model.estimators_),
+        'new_estimators': len(model.estimators_) - initial_trees + n_dropped,
+        'dropped_estimators': n_dropped,
+        'max_estimators': max_estimators,
+        'training': {
+            'rows': n_rows,
+            'skipped_unknown_rows': n_skipped,
+            'chunks': n_chunks,
+            'chunk_size': chunk_size,
+            'trees_per_chunk': trees_per_chunk,
+            'total_sec': round(total_sec, 2),
+            'fetch_sec': round(fetch_sec, 2),
+            'fit_sec': round(fit_sec, 2),
+            'sec_per_100k_rows': round(total_sec / n_rows * 100_000, 2) if n_rows else None,
+            'peak_rss_mib': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        },
+    }
+    with open(version_dir / 'rf_work_time_model_info.json', 'w') as f:
+        json.dump(info, f, ensure_ascii=False, indent=2)
+    return info
+
+
+def promote(version: str):
+    """새 버전을 서비스 위치(ai_models/work_time/)로 복사 (서버 재시작 시 반영)"""
+    version_dir = VERSIONS_DIR / version
+    for name in ['rf_work_time_model.pkl', 'rf_work_time_model_info.json', 'rf_work_time_model_compiled.npz']:
+        shutil.copy2(version_dir / name, MODEL_DIR / f'.{name}.tmp')
+        (MODEL_DIR / f'.{name}.tmp').replace(MODEL_DIR / name)
+
+    # mmap 아티팩트가 배포되어 있으면 함께 갱신 (없으면 npz 가 사용됨)
+    forest_dir = mmap_artifact_dir(MODEL_DIR, 'rf_work_time_model_compiled')
+    if (forest_dir / MANIFEST_NAME).exists():
+        compiled = CompiledForestRegressor.load(version_dir / 'rf_work_time_model_compiled.npz')
+        save_arrays(forest_dir, compiled.to_arrays())
+
+    promote_version(VERSIONS_DIR, version)
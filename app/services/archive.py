@@ -0,0 +1,244 @@
+import os
+import time
+import uuid
+import pandas as pd
+from datetime import datetime, date, timedelta
+from pathlib import Path
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from models.work_order import WorkOrder
+from models.work_result import WorkResult
+from models.work_result_daily import WorkResultDaily
+from models.quality_inspection import QualityInspection
+from models.quality_result import QualityResult
+from models.quality_result_daily import QualityResultDaily
+
+# 보관기간 경과 실적 보관(archive) 작업
+# - 보관기간(ARCHIVE_RETENTION_DAYS)보다 오래된 work_results / quality_results 를 batch 단위로
+#   1) 압축 Parquet 파일로 저장 (archive/<table>/<YYYY-MM>/*.parquet, 시작 월별 파일, fsync 후 rename)
+#   2) 일별 집계 테이블에 누적 upsert (건수/수량/소요시간 합·최소·최대, 불량코드별 합계)
+#   3) 원본 행 삭제 - 2) 와 3) 은 같은 트랜잭션이므로 집계는 항상 원본과 일치
+#   Parquet 저장 후 커밋 전에 중단되면 재실행 시 같은 행이 다시 저장될 수 있음 (read_archive 에서 result_id 로 중복 제거)
+# - 리포트는 "실시간 테이블 + 일별 집계" 를 합산 (원본은 둘 중 한 곳에만 존재)
+
+ARCHIVE_DIR = Path(os.getenv('ARCHIVE_DIR', 'archive'))
+RETENTION_DAYS = int(os.getenv('ARCHIVE_RETENTION_DAYS', '180'))
+BATCH_SIZE = 20_000
+PARQUET_COMPRESSION = 'zstd'
+
+WORK_KEYS = ['day', 'product_id', 'operation_seq', 'equipment_id']
+QUALITY_KEYS = ['day', 'product_id', 'inspector', 'defect_code']
+
+
+def retention_cutoff(retention_days: int = RETENTION_DAYS, today: date | None = None) -> datetime:
+    """보관 기준 시각 (이 시각 이전에 시작된 실적이 대상, 자정 기준)"""
+    today = today or date.today()
+    return datetime.combine(today - timedelta(days=retention_days), datetime.min.time())
+
+
+def write_parquet(table: str, df: pd.DataFrame, archive_dir: Path = ARCHIVE_DIR) -> Path:
+    """같은 월의 행들을 Parquet 파일 1개로 저장 (임시 파일 fsync 후 rename)"""
+    first = df['start_ts'].min()
+    directory = Path(archive_dir) / table / f'{first:%Y-%m}'
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f'{table}_{first:%Y%m%d%H%M%S}_{uuid.uuid4().hex[:8]}.parquet'
+
+    tmp = path.with_name(f'.{path.name}.tmp')
+    df.to_parquet(tmp, engine='pyarrow', compression=PARQUET_COMPRESSION, index=False)
+    with open(tmp, 'rb') as f:
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return path
+
+
+def _upsert_rollup(db: Session, model, keys: list, records: list, additive: list, minmax: list):
+    """일별 집계 누적 upsert (합계 컬럼은 더하고, 최소/최대 컬럼은 LEAST/GREATEST)"""
+    if not records:
+        return
+    stmt = insert(model).values(records)
+    update = {c: getattr(model, c) + getattr(stmt.excluded, c) for c in additive}
+    for c in minmax:
+        fn = func.least if c.endswith('_min') else func.greatest
+        update[c] = fn(getattr(model, c), getattr(stmt.excluded, c))
+    db.execute(stmt.on_conflict_do_update(index_elements=keys, set_=update))
+
+
+def _archive_batches(db: Session, table: str, fetch, rollup, delete, max_batches: int | None,
+                     archive_dir: Path) -> dict:
+    stats = {'table': table, 'rows': 0, 'batches': 0, 'files': [], 'elapsed_sec': 0.0}
+    started = time.perf_counter()
+    while max_batches is None or stats['batches'] < max_batches:
+        df = fetch()
+        if df.empty:
+            break
+
+        ids = df['result_id'].tolist()
+        df['result_id'] = df['result_id'].astype(str)
+        for col in ('order_id', 'inspection_id'):
+            if col in df:
+                df[col] = df[col].astype(str)
+
+        # batch 는 정렬 없이 읽으므로 월별로 나누어 저장 (디렉토리 = 파일 내 모든 행의 월)
+        paths = [
+            write_parquet(table, part, archive_dir)
+            for _, part in df.groupby(df['start_ts'].dt.to_period('M'))
+        ]
+        try:
+            rollup(df)
+            delete(ids)
+            db.commit()
+        except Exception:
+            db.rollback()
+            for path in paths:
+                path.unlink(missing_ok=True)
+            raise
+
+        stats['rows'] += len(df)
+        stats['batches'] += 1
+        stats['files'].extend(str(p) for p in paths)
+    stats['elapsed_sec'] = round(time.perf_counter() - started, 2)
+    return stats
+
+
+def archive_work_results(db: Session, cutoff: datetime, batch_size: int = BATCH_SIZE,
+                         max_batches: int | None = None, archive_dir: Path = ARCHIVE_DIR) -> dict:
+    def fetch() -> pd.DataFrame:
+        # ORDER BY 없이 LIMIT (인덱스 없이도 조건을 만족하는 첫 batch 에서 스캔 종료)
+        rows = (
+            db.query(
+                WorkResult.result_id, WorkResult.order_id, WorkResult.operation_seq, WorkResult.equipment_id,
+                WorkResult.start_ts, WorkResult.end_ts, WorkOrder.product_id, WorkOrder.planned_qty,
+            )
+            .join(WorkOrder, WorkResult.order_id == WorkOrder.order_id)
+            .filter(WorkResult.start_ts < cutoff)
+            .limit(batch_size)
+            .all()
+        )
+        return pd.DataFrame([r._asdict() for r in rows])
+
+    def rollup(df: pd.DataFrame):
+        df = df.assign(
+            day=df['start_ts'].dt.date,
+            equipment_id=df['equipment_id'].fillna(''),
+            duration_sec=(df['end_ts'] - df['start_ts']).dt.total_seconds(),
+        )
+        agg = df.groupby(WORK_KEYS).agg(
+            result_count=('result_id', 'size'),
+            qty_sum=('planned_qty', 'sum'),
+            duration_sec_sum=('duration_sec', 'sum'),
+            duration_sec_min=('duration_sec', 'min'),
+            duration_sec_max=('duration_sec', 'max'),
+        ).reset_index()
+        _upsert_rollup(
+            db, WorkResultDaily, WORK_KEYS, agg.to_dict('records'),
+            additive=['result_count', 'qty_sum', 'duration_sec_sum'],
+            minmax=['duration_sec_min', 'duration_sec_max'],
+        )
+
+    def delete(ids: list):
+        db.query(WorkResult).filter(
+            WorkResult.result_id.in_(ids), WorkResult.start_ts < cutoff
+        ).delete(synchronize_session=False)
+
+    return _archive_batches(db, 'work_results', fetch, rollup, delete, max_batches, archive_dir)
+
+
+def archive_quality_results(db: Session, cutoff: datetime, batch_size: int = BATCH_SIZE,
+                            max_batches: int | None = None, archive_dir: Path = ARCHIVE_DIR) -> dict:
+    def fetch() -> pd.DataFrame:
+        rows = (
+            db.query(
+                QualityResult.result_id, QualityResult.inspection_id, QualityResult.inspector,
+                QualityResult.passed_qty, QualityResult.defect_qty, QualityResult.defect_code,
+                QualityResult.defect_rate, QualityResult.start_ts, QualityResult.end_ts,
+                QualityResult.inspection_time, QualityResult.notes,
+                QualityInspection.order_id, QualityInspection.product_id,
+            )
+            .join(QualityInspection, QualityResult.inspection_id == QualityInspection.inspection_id)
+            .filter(QualityResult.start_ts < cutoff)
+            .limit(batch_size)
+            .all()
+        )
+        df = pd.DataFrame([r._asdict() for r in rows])
+        if not df.empty:
+            df['defect_rate'] = df['defect_rate'].astype(float)
+        return df
+
+    def rollup(df: pd.DataFrame):
+        df = df.assign(
+            day=df['start_ts'].dt.date,
+            defect_code=df['defect_code'].fillna(''),
+            inspection_time=df['inspection_time'].astype(float),
+        )
+        agg = df.groupby(QUALITY_KEYS).agg(
+            result_count=('result_id', 'size'),
+            passed_qty=('passed_qty', 'sum'),
+            defect_qty=('defect_qty', 'sum'),
+            inspection_time_sum=('inspection_time', 'sum'),
+            inspection_time_min=('inspection_time', 'min'),
+            inspection_time_max=('inspection_time', 'max'),
+        ).reset_index()
+        agg = agg.astype(object).where(agg.notna(), None)
+        _upsert_rollup(
+            db, QualityResultDaily, QUALITY_KEYS, agg.to_dict('records'),
+            additive=['result_count', 'passed_qty', 'defect_qty', 'inspection_time_sum'],
+            minmax=['inspection_time_min', 'inspection_time_max'],
+        )
+
+    def delete(ids: list):
+        db.query(QualityResult).filter(
+            QualityResult.result_id.in_(ids), QualityResult.start_ts < cutoff
+        ).delete(synchronize_session=False)
+
+    return _archive_batches(db, 'quality_results', fetch, rollup, delete, max_batches, archive_dir)
+
+
+def pending_counts(db: Session, cutoff: datetime) -> dict:
+    """보관 대상 행 수"""
+    return {
+        'work_results': db.query(func.count()).select_from(WorkResult).filter(WorkResult.start_ts < cutoff).scalar(),
+        'quality_results': db.query(func.count()).select_from(QualityResult).filter(QualityResult.start_ts < cutoff).scalar(),
+    }
+
+
+def work_rollup(db: Session, since: datetime | None = None) -> pd.DataFrame:
+    """보관된 작업실적 일별 집계 (리포트에서 실시간 실적과 합산)"""
+    q = db.query(
+        WorkResultDaily.day, WorkResultDaily.product_id, WorkResultDaily.operation_seq,
+        WorkResultDaily.equipment_id, WorkResultDaily.result_count, WorkResultDaily.qty_sum,
+        WorkResultDaily.duration_sec_sum,
+    )
+    if since is not None:
+        q = q.filter(WorkResultDaily.day >= since.date())
+    return pd.DataFrame(
+        [r._asdict() for r in q.all()],
+        columns=['day', 'product_id', 'operation_seq', 'equipment_id', 'result_count', 'qty_sum', 'duration_sec_sum'],
+    )
+
+
+def read_archive(table: str, start: datetime | None = None, end: datetime | None = None,
+                 archive_dir: Path = ARCHIVE_DIR) -> pd.DataFrame:
+    """보관 Parquet 원본 조회 (월 디렉토리 단위로 필요한 파일만 읽음, result_id 중복 제거)"""
+    root = Path(archive_dir) / table
+    if not root.exists():
+        return pd.DataFrame()
+
+    frames = []
+    for month_dir in sorted(p for p in root.iterdir() if p.is_dir()):
+        month = datetime.strptime(month_dir.name, '%Y-%m')
+        if end is not None and month >= end:
+            continue
+        if start is not None and month < datetime(start.year, start.month, 1):
+            continue
+        frames.extend(pd.read_parquet(f) for f in sorted(month_dir.glob('*.parquet')))
+    if not frames:
+        return pd.DataFrame()
+
+    df = pd.concat(frames, ignore_index=True).drop_duplicates('result_id')
+    if start is not None:
+        df = df[df['start_ts'] >= start]
+    if end is not None:
+        df = df[df['start_ts'] < end]
+    return df.reset_index(drop=True)
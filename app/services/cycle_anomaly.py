@@ -0,0 +1,232 @@
+import math
+import os
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from core.database import SessionLocal
+from models.work_order import WorkOrder, STATUS_STEP
+from models.work_result import WorkResult
+from models.order_status_history import OrderStatusHistory
+from models.master_operation_standard import MasterOperationStandard
+
+# 공정 사이클타임 실시간 이상 감지 (설비 x 제품 x 공정)
+# - 관측값 = 단위당 소요시간(초) = 공정 체류시간(직전 상태 진입 ~ 공정 완료 전이) / 계획수량
+#   한 단계씩 전진한 전이만 관측 (여러 단계를 건너뛴 전이는 공정별 시간을 알 수 없음)
+# - 키별 Welford 누적 통계 (n, mean, M2) -> 키당 O(1) 메모리, 관측마다 O(1) 갱신
+# - 판정 (갱신 전 통계 기준):
+#     sigma: 표본 MIN_SAMPLES 이상이고 (x - mean) / std > ANOMALY_K_SIGMA
+#     standard: x > 표준 사이클타임 x ANOMALY_STANDARD_FACTOR (기본 0 = 끔)
+# - standard 규칙을 기본으로 끈 이유: 관측값은 체류시간이라 대기/큐 시간이 포함됨
+#   (실시간 공정 실적은 start_ts == end_ts 라 순수 가동시간을 알 수 없음)
+#   샘플 이력(상태 이력 1700건) 기준 관측값/표준 비율 중앙값 2.9, p99 23 -> 계수 1.0 이면 80% 가 경보
+#   켜려면 rebuild 가 이력으로 계산한 비율 분위수(standard_rule(), /work/anomalies?include_stats=true)
+#   의 p99 이상으로 계수를 설정
+# - 경보는 최근 ALERT_HISTORY 건 보관 + 이벤트 버스 "alert" 발행 (services/work.progress_committed)
+# - 기동 시 최근 REBUILD_DAYS 일 상태 이력으로 통계 재구성 (pandas groupby 1회)
+# - 워커 프로세스별 상태 (각 워커는 자신이 처리한 이벤트로 갱신)
+
+K_SIGMA = float(os.getenv('ANOMALY_K_SIGMA', '3.0'))
+STANDARD_FACTOR = float(os.getenv('ANOMALY_STANDARD_FACTOR', '0'))
+MIN_SAMPLES = int(os.getenv('ANOMALY_MIN_SAMPLES', '10'))
+REBUILD_DAYS = int(os.getenv('ANOMALY_REBUILD_DAYS', '90'))
+ALERT_HISTORY = 500
+
+
+class RunningStats:
+    """Welford 온라인 평균/분산"""
+    __slots__ = ('n', 'mean', 'm2', 'last_ts')
+
+    def __init__(self, n: int = 0, mean: float = 0.0, m2: float = 0.0, last_ts: datetime | None = None):
+        self.n = n
+        self.mean = mean
+        self.m2 = m2
+        self.last_ts = last_ts
+
+    def update(self, x: float, ts: datetime | None = None):
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+        if ts is not None:
+            self.last_ts = ts
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else 0.0
+
+
+def per_unit_seconds(duration_sec: float, qty: int | None) -> float:
+    return duration_sec / qty if qty else duration_sec
+
+
+class CycleTimeDetector:
+
+    def __init__(self, k_sigma: float = K_SIGMA, standard_factor: float = STANDARD_FACTOR,
+                 min_samples: int = MIN_SAMPLES):
+        self.k_sigma = k_sigma
+        self.standard_factor = standard_factor
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._stats = {}            # (equipment_id, product_id, operation_seq) -> RunningStats
+        self._standards = None      # (product_id, operation_seq) -> 표준 사이클타임(초/개)
+        self._alerts = deque(maxlen=ALERT_HISTORY)
+        self._standard_ratios = {}  # 이력의 관측값 / 표준 사이클타임 분위수 (standard 계수 설정 기준)
+
+    def _load_standards(self, db: Session) -> dict:
+        return {
+            (s.product_id, s.operation_seq): s.standard_cycle_time_sec
+            for s in db.query(
+                MasterOperationStandard.product_id,
+                MasterOperationStandard.operation_seq,
+                MasterOperationStandard.standard_cycle_time_sec,
+            )
+        }
+
+    def _standard(self, product_id: str, operation_seq: int) -> float | None:
+        if self._standards is None:
+            db = SessionLocal()
+            try:
+                self._standards = self._load_standards(db)
+            finally:
+                db.close()
+        return self._standards.get((product_id, operation_seq))
+
+    def observe(self, equipment_id: str, product_id: str, operation_seq: int, duration_sec: float,
+                qty: int | None = None, ts: datetime | None = None, order_id=None) -> dict | None:
+        """공정 완료 1건 반영, 이상이면 경보 dict 반환"""
+        x = per_unit_seconds(duration_sec, qty)
+        standard = self._standard(product_id, operation_seq)
+        key = (equipment_id, product_id, operation_seq)
+
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = RunningStats()
+            mean, std, n = stats.mean, stats.std, stats.n
+            stats.update(x, ts)
+
+            reasons = []
+            z = (x - mean) / std if n >= self.min_samples and std > 0 else None
+            if z is not None and z > self.k_sigma:
+                reasons.append('sigma')
+            if self.standard_factor > 0 and standard and x > standard * self.standard_factor:
+                reasons.append('standard')
+            if not reasons:
+                return None
+
+            alert = {
+                'equipment_id': equipment_id,
+                'product_id': product_id,
+                'operation_seq': operation_seq,
+                'order_id': str(order_id) if order_id is not None else None,
+                'ts': ts or datetime.utcnow(),
+                'reasons': reasons,
+                'sec_per_unit': round(x, 2),
+                'mean_sec': round(mean, 2),
+                'std_sec': round(std, 2),
+                'z_score': round(z, 2) if z is not None else None,
+                'standard_sec': standard,
+                'samples': n,
+            }
+            self._alerts.append(alert)
+            return alert
+
+    def alerts(self, limit: int = 100, equipment_id: str | None = None, product_id: str | None = None) -> list:
+        """최근 경보 (최신순)"""
+        with self._lock:
+            items = list(self._alerts)
+        items = [
+            a for a in reversed(items)
+            if (equipment_id is None or a['equipment_id'] == equipment_id)
+            and (product_id is None or a['product_id'] == product_id)
+        ]
+        return items[:limit]
+
+    def standard_rule(self) -> dict:
+        """standard 규칙 설정과 최근 이력의 관측값/표준 비율 분위수 (계수 튜닝용)"""
+        with self._lock:
+            return {
+                'enabled': self.standard_factor > 0,
+                'factor': self.standard_factor,
+                'history_ratio_quantiles': dict(self._standard_ratios),
+            }
+
+    def stats(self) -> list:
+        with self._lock:
+            return [
+                {
+                    'equipment_id': key[0], 'product_id': key[1], 'operation_seq': key[2],
+                    'samples': s.n, 'mean_sec': round(s.mean, 2), 'std_sec': round(s.std, 2),
+                    'last_ts': s.last_ts,
+                }
+                for key, s in sorted(self._stats.items())
+            ]
+
+    def rebuild(self, db: Session, days: int = REBUILD_DAYS, now: datetime | None = None) -> int:
+        """최근 days 일 상태 이력으로 통계 재구성 (키별 count/mean/M2 를 groupby 1회로 계산), 키 수 반환"""
+        since = (now or datetime.utcnow()) - timedelta(days=days)
+        H = OrderStatusHistory
+        history = pd.DataFrame(
+            db.query(H.order_id, H.product_id, H.from_status, H.to_status, H.from_ts, H.changed_ts,
+                     WorkOrder.planned_qty)
+            .join(WorkOrder, WorkOrder.order_id == H.order_id)
+            .filter(H.changed_ts >= since)
+            .all(),
+            columns=['order_id', 'product_id', 'from_status', 'to_status', 'from_ts', 'changed_ts', 'planned_qty'],
+        )
+        results = pd.DataFrame(
+            db.query(WorkResult.order_id, WorkResult.operation_seq, WorkResult.equipment_id, WorkResult.start_ts)
+            .filter(WorkResult.start_ts >= since - timedelta(days=1), WorkResult.equipment_id.isnot(None))
+            .all(),
+            columns=['order_id', 'operation_seq', 'equipment_id', 'start_ts'],
+        )
+        standards = self._load_standards(db)
+
+        stats, ratios = {}, {}
+        if not history.empty and not results.empty:
+            history['operation_seq'] = history['to_status'].map(STATUS_STEP)
+            history = history[history['operation_seq'] == history['from_status'].map(STATUS_STEP) + 1]
+            # 전이를 만든 공정 실적의 설비 (같은 공정 실적이 여러 건이면 가장 이른 실적)
+            equipment = (
+                results.sort_values('start_ts')
+                .drop_duplicates(['order_id', 'operation_seq'])[['order_id', 'operation_seq', 'equipment_id']]
+            )
+            df = history.merge(equipment, on=['order_id', 'operation_seq'])
+            qty = df['planned_qty'].where(df['planned_qty'] > 0, 1)
+            df['x'] = (df['changed_ts'] - df['from_ts']).dt.total_seconds() / qty
+
+            keys = ['equipment_id', 'product_id', 'operation_seq']
+            df['dev2'] = (df['x'] - df.groupby(keys)['x'].transform('mean')) ** 2
+            agg = df.groupby(keys).agg(
+                n=('x', 'size'), mean=('x', 'mean'), m2=('dev2', 'sum'), last_ts=('changed_ts', 'max'),
+            )
+            for key, row in zip(agg.index, agg.itertuples(index=False)):
+                stats[key] = RunningStats(int(row.n), float(row.mean), float(row.m2), row.last_ts.to_pydatetime())
+
+            standard = pd.Series(
+                [standards.get(k) for k in zip(df['product_id'], df['operation_seq'])], index=df.index, dtype=float,
+            )
+            ratio = (df['x'] / standard.where(standard > 0)).dropna()
+            if not ratio.empty:
+                ratios = {f'p{round(q * 100)}': round(float(v), 2)
+                          for q, v in ratio.quantile([0.5, 0.95, 0.99]).items()}
+                ratios['samples'] = int(ratio.size)
+
+        with self._lock:
+            self._stats = stats
+            self._standards = standards
+            self._standard_ratios = ratios
+        return len(stats)
+
+
+_cycle_detector = None
+
+
+def get_cycle_detector() -> CycleTimeDetector:
+    global _cycle_detector
+    if _cycle_detector is None:
+        _cycle_detector = CycleTimeDetector()
+    return _cycle_detector
@@ -8,9 +8,35 @@ from models.master_equipment import MasterEquipment
 from models.master_product import MasterProduct
 from models.master_operation_standard import MasterOperationStandard
 from datetime import datetime, timedelta
+from services import archive
 
 
-def get_dashboard_data(db: Session):
+def results_query(db: Session, since: datetime | None = None):
+    # 대시보드 작업실적 쿼리 (since: start_ts 하한 -> 파티션 프루닝)
+    q = (
+        db.query(
+            WorkResult.result_id,
+            WorkResult.order_id,
+            WorkResult.operation_seq,
+            WorkResult.equipment_id,
+            WorkResult.start_ts,
+            WorkResult.end_ts,
+            WorkOrder.product_id,
+            WorkOrder.planned_qty,
+            MasterOperation.operation_name,
+            MasterEquipment.name.label("equipment_name"),
+        )
+        .join(WorkOrder, WorkResult.order_id == WorkOrder.order_id)
+        .join(MasterOperation, WorkResult.operation_seq == MasterOperation.operation_seq)
+        .outerjoin(MasterEquipment, WorkResult.equipment_id == MasterEquipment.equipment_id)
+    )
+    if since is not None:
+        q = q.filter(WorkResult.start_ts >= since)
+    return q
+
+
+def get_dashboard_data(db: Session, since: datetime | None = None):
+    # since: 작업실적 차트(공정/설비/편차율) 집계 기간 하한 (None 이면 전체)
     
     # 1. 작업지시 데이터 조회
     orders_query = (
@@ -41,24 +67,7 @@ def get_dashboard_data(db: Session):
     } for r in orders_query])
     
     # 2. 작업실적 데이터 조회
-    results_query = (
-        db.query(
-            WorkResult.result_id,
-            WorkResult.order_id,
-            WorkResult.operation_seq,
-            WorkResult.equipment_id,
-            WorkResult.start_ts,
-            WorkResult.end_ts,
-            WorkOrder.product_id,
-            WorkOrder.planned_qty,
-            MasterOperation.operation_name,
-            MasterEquipment.name.label("equipment_name"),
-        )
-        .join(WorkOrder, WorkResult.order_id == WorkOrder.order_id)
-        .join(MasterOperation, WorkResult.operation_seq == MasterOperation.operation_seq)
-        .outerjoin(MasterEquipment, WorkResult.equipment_id == MasterEquipment.equipment_id)
-        .all()
-    )
+    results_rows = results_query(db, since).all()
     
     # DataFrame 변환
     df_results = pd.DataFrame([{
@@ -72,7 +81,7 @@ def get_dashboard_data(db: Session):
         "end_ts": r.end_ts,
         "product_id": r.product_id,
         "planned_qty": r.planned_qty,
-    } for r in results_query])
+    } for r in results_rows])
     
     # 3. 표준시간 데이터 조회
     standards_query = db.query(MasterOperationStandard).all()
@@ -134,11 +143,25 @@ def get_dashboard_data(db: Session):
         "data": status_summary['count'].tolist(),
     }
 
+    # 보관(archive)된 과거 실적의 일별 집계 - 실시간 실적과 합산
+    df_rollup = archive.work_rollup(db, since)
+
     # 7. 공정별 평균 작업시간
+    op_parts = []
     if not df_results.empty:
-        operation_summary = df_results.groupby('operation_name')['actual_time_min'].mean().reset_index()
-        operation_summary.columns = ['operation_name', 'avg_time_min']
-        operation_summary = operation_summary.sort_values('avg_time_min', ascending=False)
+        op_parts.append(df_results.groupby('operation_seq')['actual_time_sec'].agg(['sum', 'count']))
+    if not df_rollup.empty:
+        op_parts.append(
+            df_rollup.groupby('operation_seq')[['duration_sec_sum', 'result_count']].sum()
+            .set_axis(['sum', 'count'], axis=1)
+        )
+    if op_parts:
+        operation_names = dict(db.query(MasterOperation.operation_seq, MasterOperation.operation_name).all())
+        op_totals = pd.concat(op_parts).groupby(level=0).sum()
+        operation_summary = pd.DataFrame({
+            'operation_name': op_totals.index.map(operation_names),
+            'avg_time_min': op_totals['sum'] / op_totals['count'] / 60,
+        }).sort_values('avg_time_min', ascending=False)
         
         operation_chart = {
             "labels": operation_summary['operation_name'].tolist(),
@@ -148,13 +171,18 @@ def get_dashboard_data(db: Session):
         operation_chart = {"labels": [], "data": []}
 
     # 8. 설비별 작업 건수 (Top 10)
-    if not df_results.empty and df_results['equipment_name'].notna().any():
-        equipment_summary = df_results['equipment_name'].value_counts().head(10).reset_index()
-        equipment_summary.columns = ['equipment_name', 'count']
+    eq_parts = []
+    if not df_results.empty and df_results['equipment_id'].notna().any():
+        eq_parts.append(df_results['equipment_id'].value_counts())
+    if not df_rollup.empty:
+        eq_parts.append(df_rollup[df_rollup['equipment_id'] != ''].groupby('equipment_id')['result_count'].sum())
+    if eq_parts:
+        equipment_names = dict(db.query(MasterEquipment.equipment_id, MasterEquipment.name).all())
+        eq_totals = pd.concat(eq_parts).groupby(level=0).sum().sort_values(ascending=False).head(10)
         
         equipment_chart = {
-            "labels": equipment_summary['equipment_name'].tolist(),
-            "data": equipment_summary['count'].tolist(),
+            "labels": [equipment_names.get(eq, eq) for eq in eq_totals.index],
+            "data": [int(c) for c in eq_totals.tolist()],
         }
     else:
         equipment_chart = {"labels": [], "data": []}
@@ -0,0 +1,172 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime
+
+from core.database import SessionLocal
+from services import order_transitions
+
+# 공정 완료 이벤트 그룹 커밋 버퍼 (write-behind, 옵트인: PROGRESS_WRITE_BUFFER=1)
+# - POST /work/progress 이벤트를 bounded 큐에 넣고, 백그라운드 스레드가
+#   flush_ms 경과 또는 max_batch 건마다 1 트랜잭션(커밋/fsync 1회)으로 일괄 처리
+# - 요청은 자기 이벤트가 포함된 배치의 커밋 완료(Future)까지 대기 -> 응답 시점에 영속화 보장
+# - 큐가 가득 차면 BufferFull (라우터에서 503 + Retry-After)
+# - on_commit 콜백/배치 처리 오류는 로그 후 계속 (스레드가 죽으면 모든 요청이 무한 대기)
+# - 종료 시 신규 접수 중단 후 큐에 남은 이벤트를 모두 커밋하고 스레드 종료
+
+PROGRESS_WRITE_BUFFER = os.getenv('PROGRESS_WRITE_BUFFER', '0') == '1'
+MAX_QUEUE = int(os.getenv('PROGRESS_BUFFER_MAX_QUEUE', '10000'))
+MAX_BATCH = int(os.getenv('PROGRESS_BUFFER_MAX_BATCH', '500'))
+FLUSH_MS = float(os.getenv('PROGRESS_BUFFER_FLUSH_MS', '20'))
+
+
+class BufferFull(Exception):
+    pass
+
+
+class BufferClosed(Exception):
+    pass
+
+
+class ProgressEventBuffer:
+
+    def __init__(self, session_factory=SessionLocal, max_queue: int = MAX_QUEUE,
+                 max_batch: int = MAX_BATCH, flush_ms: float = FLUSH_MS, on_commit=None):
+        self._session_factory = session_factory
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._max_batch = max_batch
+        self._flush_sec = flush_ms / 1000
+        self._on_commit = on_commit      # 커밋된 이벤트별 콜백 (order_id, operation_seq, equipment_id, result)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._thread = None
+        self.stats = {'accepted': 0, 'rejected': 0, 'batches': 0, 'events': 0, 'fallback_batches': 0}
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='progress-event-buffer', daemon=True)
+        self._thread.start()
+
+    def submit(self, order_id, operation_seq: int, equipment_id: str | None = None) -> Future:
+        """이벤트 접수 -> 커밋 완료 시 전이 결과(order_transitions.TransitionResult)가 설정되는 Future"""
+        if operation_seq not in order_transitions.STEP_TO_STATUS:
+            raise ValueError(f"알 수 없는 공정 단계: {operation_seq}")
+
+        future = Future()
+        with self._lock:
+            if self._closed or self._thread is None:
+                raise BufferClosed("이벤트 버퍼가 실행 중이 아님")
+            try:
+                self._queue.put_nowait((order_id, operation_seq, equipment_id, datetime.utcnow(), future))
+            except queue.Full:
+                self.stats['rejected'] += 1
+                raise BufferFull(f"이벤트 버퍼 가득 참 ({self._queue.maxsize}건)")
+            self.stats['accepted'] += 1
+        return future
+
+    def stop(self, timeout: float | None = 30):
+        """신규 접수 중단 후 남은 이벤트 모두 커밋"""
+        with self._lock:
+            self._closed = True
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _collect(self) -> list:
+        try:
+            batch = [self._queue.get(timeout=0.1)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self._flush_sec
+        while len(batch) < self._max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            with self._lock:
+                done = self._closed and self._queue.empty()
+            if done:
+                break
+            batch = self._collect()
+            if not batch:
+                continue
+            try:
+                self._flush(batch)
+            except Exception as e:
+                # 예기치 않은 오류에도 스레드는 유지, 대기 중인 요청은 오류로 응답
+                print(f"progress-event-buffer: 배치 처리 오류 ({e!r})")
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _flush(self, batch: list):
+        # 오더 ID 순으로 처리 (행 잠금 순서 고정, 같은 오더 내 도착 순서는 유지)
+        batch.sort(key=lambda e: str(e[0]))
+        db = self._session_factory()
+        try:
+            try:
+                outcomes = [
+                    order_transitions.transition(db, order_id, seq, equipment_id, now=ts, commit=False)
+                    for order_id, seq, equipment_id, ts, _ in batch
+                ]
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                print(f"progress-event-buffer: 배치 커밋 실패, 이벤트별 재시도 ({e})")
+                self.stats['fallback_batches'] += 1
+                outcomes = []
+                for order_id, seq, equipment_id, ts, _ in batch:
+                    try:
+                        outcomes.append(order_transitions.transition(db, order_id, seq, equipment_id, now=ts))
+                    except Exception as event_error:
+                        db.rollback()
+                        outcomes.append(event_error)
+        finally:
+            db.close()
+
+        self.stats['batches'] += 1
+        self.stats['events'] += len(batch)
+        for (order_id, seq, equipment_id, _, future), outcome in zip(batch, outcomes):
+            if isinstance(outcome, Exception):
+                future.set_exception(outcome)
+                continue
+            if self._on_commit is not None:
+                # 커밋 후 처리(알림/이벤트 발행) 실패는 로그만 (이미 커밋됨 -> 요청에는 결과 응답)
+                try:
+                    self._on_commit(order_id, seq, equipment_id, outcome)
+                except Exception as e:
+                    print(f"progress-event-buffer: 커밋 후 처리 실패 ({order_id}, {seq}): {e!r}")
+            future.set_result(outcome)
+
+
+# 전역 버퍼 (PROGRESS_WRITE_BUFFER=1 일 때만 서버 시작 시 생성)
+_progress_buffer = None
+
+
+def start_progress_buffer(on_commit=None) -> ProgressEventBuffer | None:
+    global _progress_buffer
+    if PROGRESS_WRITE_BUFFER and _progress_buffer is None:
+        _progress_buffer = ProgressEventBuffer(on_commit=on_commit)
+        _progress_buffer.start()
+        print(f"progress-event-buffer 시작 (max_batch={MAX_BATCH}, flush_ms={FLUSH_MS}, max_queue={MAX_QUEUE})")
+    return _progress_buffer
+
+
+def stop_progress_buffer():
+    global _progress_buffer
+    if _progress_buffer is not None:
+        _progress_buffer.stop()
+        print(f"progress-event-buffer 종료 {_progress_buffer.stats}")
+        _progress_buffer = None
+
+
+def get_progress_buffer() -> ProgressEventBuffer | None:
+    return _progress_buffer
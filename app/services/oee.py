@@ -0,0 +1,379 @@
+import threading
+import time
+import uuid
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from sqlalchemy import BigInteger, cast, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from core import fanout
+from models.work_order import WorkOrder, STATUS_STEP
+from models.work_result import WorkResult
+from models.master_equipment import MasterEquipment
+from models.master_operation_standard import MasterOperationStandard
+from models.quality_inspection import QualityInspection
+from models.quality_result import QualityResult
+from models.oee_shift import OeeShift
+from models.order_status_history import OrderStatusHistory
+from services.utilization import SHIFT_START_HOURS, MAX_INTERVAL_HOURS, bucket_edges, compute_utilization
+
+# 설비 x 교대 OEE 엔진
+# - 가동률(A) = 병합 가동시간 / 계획시간(교대 길이, 진행 중 교대는 경과 시간)
+# - 가동 구간: 실적 [start_ts, end_ts)
+#   실시간 공정진행 실적은 start_ts == end_ts (완료 시점만 기록) -> 같은 전이의 상태 이력 체류 구간
+#   [from_ts, changed_ts) 을 가동 구간으로 사용 (한 단계 전진한 전이만, 최대 MAX_INTERVAL_HOURS,
+#   services/cycle_anomaly.py 의 관측값과 같은 구간)
+#   체류 구간은 대기 시간을 포함하므로 A 는 높게, P 는 낮게 나옴 (A x P = 표준시간 / 계획시간 이라 OEE 는 영향 없음)
+#   성능(P)   = 표준 사이클타임 x 수량 / 가동시간
+#   품질(Q)   = 양품 / 수량 (오더 품질검사 양품률을 해당 오더 실적 수량에 적용, 검사 전이면 1)
+#   OEE = A x P x Q
+# - 수량/표준시간/양품은 실적 종료 시각이 속한 교대에 집계
+# - 재계산(recompute)은 구간 내 설비 x 교대 전체를 NumPy 로 한 번에 계산해 oee_shift 에 upsert
+#   (배치 백필: scripts/recompute_oee.py, 주 단위로 나누어 실행)
+# - 증분: 공정 실적/품질 결과 등록 시 (설비, 교대) 또는 오더를 dirty 표시하고
+#   조회 시 dirty 교대만 재계산, 진행 중 교대는 LIVE_REFRESH_SEC 마다 재계산
+#   dirty 표시는 core/fanout.py 로 다른 워커에도 전달 (어느 워커가 조회를 처리해도 재계산)
+
+LIVE_REFRESH_SEC = 60
+ORDER_LOOKBACK_DAYS = 31     # 품질 결과로 dirty 된 오더의 실적 탐색 범위
+UPSERT_CHUNK = 5000
+
+_lock = threading.Lock()
+_dirty_keys = set()          # (equipment_id, shift_start)
+_dirty_orders = set()
+_live_refreshed = None       # 진행 중 교대 마지막 재계산 (monotonic)
+
+
+def _shift_starts(ts: datetime, shift_hours: tuple = SHIFT_START_HOURS) -> list:
+    """ts 전날 ~ 다음날 교대 시작 시각 목록 (정렬)"""
+    day0 = datetime.combine(ts.date(), datetime.min.time())
+    return [day0 + timedelta(days=d, hours=h) for d in (-1, 0, 1) for h in sorted(shift_hours)]
+
+
+def shift_floor(ts: datetime) -> datetime:
+    """ts 가 속한 교대의 시작 시각"""
+    return max(s for s in _shift_starts(ts) if s <= ts)
+
+
+def next_shift(ts: datetime) -> datetime:
+    """ts 이후 첫 교대 시작 시각"""
+    return min(s for s in _shift_starts(ts) if s > ts)
+
+
+def shift_ceil(ts: datetime) -> datetime:
+    """ts 이후(포함) 첫 교대 시작 시각"""
+    return ts if shift_floor(ts) == ts else next_shift(ts)
+
+
+def mark_dirty(equipment_id: str | None, ts: datetime | None = None, since: datetime | None = None):
+    """공정 실적 기록 알림 (해당 설비 교대 재계산, since: 체류 구간 시작 -> 걸친 교대 모두)"""
+    if not equipment_id:
+        return
+    ts = ts or datetime.utcnow()
+    shift_start = shift_floor(max(since, ts - timedelta(hours=MAX_INTERVAL_HOURS)) if since else ts)
+    shifts = [shift_start]
+    while next_shift(shifts[-1]) <= ts:
+        shifts.append(next_shift(shifts[-1]))
+    with _lock:
+        _dirty_keys.update((equipment_id, s) for s in shifts)
+    for s in shifts:
+        fanout.send('oee_shift', [equipment_id, s.isoformat()])
+
+
+def mark_order_dirty(order_id):
+    """품질 결과 변경 알림 (오더 실적이 속한 설비 교대 재계산)"""
+    with _lock:
+        _dirty_orders.add(order_id)
+    fanout.send('oee_order', str(order_id))
+
+
+# 다른 워커의 dirty 표시 (core/fanout.py) - 어느 워커가 /dashboard/oee 를 처리해도 재계산
+def _remote_shift_dirty(data):
+    with _lock:
+        _dirty_keys.add((data[0], datetime.fromisoformat(data[1])))
+
+
+def _remote_order_dirty(order_id):
+    with _lock:
+        _dirty_orders.add(uuid.UUID(order_id))
+
+
+fanout.register('oee_shift', _remote_shift_dirty)
+fanout.register('oee_order', _remote_order_dirty)
+
+
+def shift_aggregates(codes: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                     qty: np.ndarray, ideal_sec: np.ndarray, good_qty: np.ndarray,
+                     n_codes: int, edges: np.ndarray, now_offset: int | None = None) -> dict:
+    """
+    순수 계산 코어 (DB 없음) - 설비 x 교대 합계 행렬
+    starts/ends: 구간 시작 기준 초, edges: 교대 경계 (bucket_edges)
+    now_offset: 현재 시각 오프셋 (이후 계획시간 제외)
+    """
+    n_buckets = len(edges) - 1
+    run = compute_utilization(codes, starts, ends, n_codes, int(edges[-1]), edges)['busy']
+
+    # 실적 종료 시각이 속한 교대에 수량/표준시간/양품 집계
+    bucket = np.searchsorted(edges, ends, side='right') - 1
+    inside = (bucket >= 0) & (bucket < n_buckets)
+    flat = codes[inside] * n_buckets + bucket[inside]
+    size = n_codes * n_buckets
+
+    def total(weights):
+        return np.bincount(flat, weights=weights[inside], minlength=size).reshape(n_codes, n_buckets)
+
+    planned = np.diff(edges).astype(np.float64)
+    if now_offset is not None:
+        planned = np.clip(now_offset - edges[:-1], 0, planned)
+
+    return {
+        'planned_sec': np.broadcast_to(planned, (n_codes, n_buckets)),
+        'run_sec': run.astype(np.float64),
+        'ideal_sec': total(ideal_sec.astype(np.float64)),
+        'total_qty': total(qty.astype(np.float64)),
+        'good_qty': total(good_qty.astype(np.float64)),
+    }
+
+
+def _load_results(db: Session, start: datetime, end: datetime, equipment_ids: list | None) -> pd.DataFrame:
+    H = OrderStatusHistory
+    q = (
+        db.query(
+            WorkResult.equipment_id,
+            cast(func.extract('epoch', WorkResult.start_ts), BigInteger).label('start'),
+            cast(func.extract('epoch', WorkResult.end_ts), BigInteger).label('end'),
+            WorkResult.order_id,
+            WorkResult.operation_seq,
+            WorkOrder.product_id,
+            WorkOrder.planned_qty,
+            H.from_status,
+            H.to_status,
+            cast(func.extract('epoch', H.from_ts), BigInteger),
+        )
+        .join(WorkOrder, WorkResult.order_id == WorkOrder.order_id)
+        # 같은 트랜잭션에서 기록된 전이 (changed_ts == 실적 end_ts, ix_osh_order_changed)
+        .outerjoin(H, (H.order_id == WorkResult.order_id) & (H.changed_ts == WorkResult.end_ts)
+                   & (WorkResult.start_ts == WorkResult.end_ts))
+        .filter(
+            WorkResult.equipment_id.isnot(None),
+            WorkResult.start_ts >= start - timedelta(hours=MAX_INTERVAL_HOURS),
+            # 시점 기록 실적은 체류 구간이 앞 교대로 이어지므로 구간 뒤 MAX_INTERVAL_HOURS 까지 포함
+            WorkResult.start_ts < end + timedelta(hours=MAX_INTERVAL_HOURS),
+            WorkResult.end_ts > start - timedelta(hours=MAX_INTERVAL_HOURS),
+        )
+    )
+    if equipment_ids is not None:
+        q = q.filter(WorkResult.equipment_id.in_(equipment_ids))
+    df = pd.DataFrame(
+        q.all(),
+        columns=['equipment_id', 'start', 'end', 'order_id', 'operation_seq', 'product_id', 'planned_qty',
+                 'from_status', 'to_status', 'from_epoch'],
+    )
+
+    # 시점 기록 실적 -> 한 단계 전진한 전이의 체류 구간 시작을 가동 시작으로
+    dwell = (
+        df['from_epoch'].notna()
+        & (df['to_status'].map(STATUS_STEP) == df['operation_seq'])
+        & (df['from_status'].map(STATUS_STEP) == df['operation_seq'] - 1)
+    )
+    from_epoch = pd.to_numeric(df['from_epoch'])
+    floor = df['end'] - MAX_INTERVAL_HOURS * 3600
+    df['start'] = df['start'].where(~dwell, from_epoch.where(from_epoch > floor, floor)).astype(np.int64)
+    return df.drop(columns=['from_status', 'to_status', 'from_epoch'])
+
+
+def _good_ratio(db: Session, order_ids: list, since: datetime) -> pd.Series:
+    """오더별 품질 양품률 (passed / (passed + defect))"""
+    if not order_ids:
+        return pd.Series(dtype=float)
+    rows = (
+        db.query(
+            QualityInspection.order_id,
+            func.sum(QualityResult.passed_qty),
+            func.sum(QualityResult.defect_qty),
+        )
+        .join(QualityInspection, QualityResult.inspection_id == QualityInspection.inspection_id)
+        .filter(QualityInspection.order_id.in_(order_ids), QualityResult.start_ts >= since)
+        .group_by(QualityInspection.order_id)
+        .all()
+    )
+    df = pd.DataFrame(rows, columns=['order_id', 'passed', 'defect']).set_index('order_id')
+    inspected = df['passed'] + df['defect']
+    return (df['passed'] / inspected).where(inspected > 0)
+
+
+def recompute(db: Session, start: datetime, end: datetime, equipment_ids: list | None = None,
+              now: datetime | None = None) -> dict:
+    """[start, end) 을 교대 경계로 넓혀 설비 x 교대 OEE 합계 재계산 후 upsert"""
+    now = now or datetime.utcnow()
+    start, end = shift_floor(start), shift_ceil(end)
+    span_sec = int((end - start).total_seconds())
+    epoch0 = int((start - datetime(1970, 1, 1)).total_seconds())
+
+    if equipment_ids is None:
+        equipment_ids = [
+            e for (e,) in db.query(MasterEquipment.equipment_id)
+            .filter(MasterEquipment.enabled == True)
+            .order_by(MasterEquipment.equipment_id)
+        ]
+        scope = None
+    else:
+        scope = equipment_ids
+    if not equipment_ids:
+        return {'start': start, 'end': end, 'rows': 0}
+
+    df = _load_results(db, start, end, scope)
+    df = df[df['equipment_id'].isin(equipment_ids)]
+
+    standards = pd.DataFrame(
+        db.query(
+            MasterOperationStandard.product_id,
+            MasterOperationStandard.operation_seq,
+            MasterOperationStandard.standard_cycle_time_sec,
+        ).all(),
+        columns=['product_id', 'operation_seq', 'cycle_sec'],
+    )
+    df = df.merge(standards, on=['product_id', 'operation_seq'], how='left')
+    ratio = _good_ratio(db, df['order_id'].unique().tolist(), start - timedelta(hours=MAX_INTERVAL_HOURS))
+    qty = df['planned_qty'].to_numpy(dtype=np.float64)
+    good = qty * df['order_id'].map(ratio).fillna(1.0).to_numpy(dtype=np.float64)
+
+    edges = bucket_edges(span_sec, start, 'shift')
+    agg = shift_aggregates(
+        pd.Index(equipment_ids).get_indexer(df['equipment_id']),
+        df['start'].to_numpy(dtype=np.int64) - epoch0,
+        df['end'].to_numpy(dtype=np.int64) - epoch0,
+        qty,
+        df['cycle_sec'].fillna(0).to_numpy(dtype=np.float64) * qty,
+        good,
+        len(equipment_ids),
+        edges,
+        now_offset=int((now - start).total_seconds()),
+    )
+
+    shift_starts = [start + timedelta(seconds=int(s)) for s in edges[:-1]]
+    shift_ends = [start + timedelta(seconds=int(s)) for s in edges[1:]]
+    records = []
+    for i, equipment_id in enumerate(equipment_ids):
+        for j in range(len(shift_starts)):
+            records.append({
+                'equipment_id': equipment_id,
+                'shift_start': shift_starts[j],
+                'shift_end': shift_ends[j],
+                'planned_sec': float(agg['planned_sec'][i, j]),
+                'run_sec': float(agg['run_sec'][i, j]),
+                'ideal_sec': float(agg['ideal_sec'][i, j]),
+                'total_qty': int(agg['total_qty'][i, j]),
+                'good_qty': float(agg['good_qty'][i, j]),
+                'updated_ts': now,
+            })
+
+    for k in range(0, len(records), UPSERT_CHUNK):
+        stmt = insert(OeeShift).values(records[k:k + UPSERT_CHUNK])
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=['equipment_id', 'shift_start'],
+            set_={c: getattr(stmt.excluded, c) for c in
+                  ('shift_end', 'planned_sec', 'run_sec', 'ideal_sec', 'total_qty', 'good_qty', 'updated_ts')},
+        ))
+    db.commit()
+    return {'start': start, 'end': end, 'rows': len(records), 'results': len(df)}
+
+
+def refresh_dirty(db: Session, now: datetime | None = None) -> int:
+    """dirty (설비, 교대) 와 진행 중 교대 재계산, 재계산한 교대 수 반환"""
+    global _live_refreshed
+    now = now or datetime.utcnow()
+    with _lock:
+        keys, orders = set(_dirty_keys), set(_dirty_orders)
+        _dirty_keys.clear()
+        _dirty_orders.clear()
+        live = _live_refreshed is None or time.monotonic() - _live_refreshed >= LIVE_REFRESH_SEC
+        if live:
+            _live_refreshed = time.monotonic()
+
+    if orders:
+        rows = (
+            db.query(WorkResult.equipment_id, WorkResult.end_ts)
+            .filter(
+                WorkResult.order_id.in_(list(orders)),
+                WorkResult.equipment_id.isnot(None),
+                WorkResult.start_ts >= now - timedelta(days=ORDER_LOOKBACK_DAYS),
+            )
+            .all()
+        )
+        keys |= {(equipment_id, shift_floor(end_ts)) for equipment_id, end_ts in rows}
+
+    by_shift = {}
+    for equipment_id, shift_start in keys:
+        by_shift.setdefault(shift_start, set()).add(equipment_id)
+    current = shift_floor(now)
+    if live:
+        by_shift[current] = None   # 전체 설비
+
+    for shift_start, equipment_ids in by_shift.items():
+        recompute(db, shift_start, next_shift(shift_start),
+                  sorted(equipment_ids) if equipment_ids is not None else None, now=now)
+    return len(by_shift)
+
+
+def _metrics(planned, run, ideal, total, good) -> dict:
+    availability = run / planned if planned else None
+    performance = ideal / run if run else None
+    quality = good / total if total else None
+    oee = availability * performance * quality if None not in (availability, performance, quality) else None
+
+    def pct(v):
+        return round(v * 100, 2) if v is not None else None
+
+    return {
+        'planned_sec': round(planned, 1),
+        'run_sec': round(run, 1),
+        'ideal_sec': round(ideal, 1),
+        'total_qty': int(total),
+        'good_qty': round(good, 1),
+        'availability': pct(availability),
+        'performance': pct(performance),
+        'quality': pct(quality),
+        'oee': pct(oee),
+    }
+
+
+def oee_summary(db: Session, start: datetime, end: datetime, group: str = 'shift',
+                equipment_id: str | None = None) -> dict:
+    """
+    oee_shift 합계 조회 (dirty 교대 재계산 후)
+    group: shift (설비 x 교대), day (설비 x 교대 시작일), equipment (설비별 기간 합계)
+    """
+    refresh_dirty(db)
+
+    sums = [
+        func.sum(OeeShift.planned_sec), func.sum(OeeShift.run_sec), func.sum(OeeShift.ideal_sec),
+        func.sum(OeeShift.total_qty), func.sum(OeeShift.good_qty),
+    ]
+    if group == 'shift':
+        keys = [OeeShift.equipment_id, OeeShift.shift_start]
+    elif group == 'day':
+        keys = [OeeShift.equipment_id, func.date(OeeShift.shift_start)]
+    else:
+        keys = [OeeShift.equipment_id]
+
+    q = (
+        db.query(*keys, *sums)
+        .filter(OeeShift.shift_start >= shift_floor(start), OeeShift.shift_start < end)
+        .group_by(*keys)
+        .order_by(*keys)
+    )
+    if equipment_id:
+        q = q.filter(OeeShift.equipment_id == equipment_id)
+
+    items = []
+    for row in q.all():
+        item = {'equipment_id': row[0]}
+        if group != 'equipment':
+            item[group] = row[1]
+        item.update(_metrics(*(float(v or 0) for v in row[len(keys):])))
+        items.append(item)
+
+    return {'start': start, 'end': end, 'group': group, 'items': items}
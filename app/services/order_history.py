@@ -0,0 +1,168 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from core.partitioning import DEFAULT_LOOKBACK_DAYS
+from models.work_order import WorkOrder, STATUS_STEP
+from models.order_status_history import OrderStatusHistory as H
+
+# 작업지시 상태 이력 분석 (order_status_history)
+# - WIP(시점 T): 종료된 체류 구간 중 T 를 포함하는 행 (GiST tsrange 인덱스)
+#              + 현재 상태에 T 이전에 진입해 아직 머무는 미완료 오더 (work_orders, 오더당 직전 전이 1건 조회)
+# - 상태 체류시간: 기간 내 해당 상태를 벗어난 구간 (from_status, changed_ts 인덱스)
+# - 리드타임: 기간 내 S5_DONE 진입 오더의 생성 ~ 완료 시간 (to_status, changed_ts 인덱스)
+# 모든 조회는 기간/시점 조건으로 인덱스 범위만 읽으므로 전체 이력 크기와 무관
+# 시각은 전이 기록과 같은 UTC 기준
+
+DONE_STATUS = "S5_DONE"
+PERCENTILES = (0.5, 0.9, 0.95)
+
+
+def default_range(start: datetime | None, end: datetime | None,
+                  days: int = DEFAULT_LOOKBACK_DAYS) -> tuple:
+    """조회 기간 기본값 (end = 현재, start = end - days)"""
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(days=days or DEFAULT_LOOKBACK_DAYS)
+    return start, end
+
+
+def _duration_sec(start_col, end_col):
+    return func.extract("epoch", end_col - start_col)
+
+
+def _stats_columns(duration) -> list:
+    columns = [
+        func.count().label("n"),
+        func.avg(duration).label("avg_sec"),
+        func.max(duration).label("max_sec"),
+    ]
+    for p in PERCENTILES:
+        columns.append(func.percentile_cont(p).within_group(duration).label(f"p{int(p * 100)}_sec"))
+    return columns
+
+
+def _stats_row(row) -> dict:
+    item = {"count": row.n}
+    for key in ["avg_sec", "max_sec"] + [f"p{int(p * 100)}_sec" for p in PERCENTILES]:
+        value = getattr(row, key)
+        item[key] = round(float(value), 1) if value is not None else None
+    return item
+
+
+def wip_at(db: Session, at: datetime | None = None, product_id: str | None = None) -> dict:
+    """시점 at 의 상태별 WIP 수 (완료 S5_DONE 제외)"""
+    at = at or datetime.utcnow()
+    counts = {}
+
+    # 1) 이미 벗어난 상태 중 at 시점에 머물러 있던 구간
+    closed = (
+        db.query(H.from_status, func.count())
+        .filter(func.tsrange(H.from_ts, H.changed_ts).op("@>")(at))
+    )
+    if product_id:
+        closed = closed.filter(H.product_id == product_id)
+    for status, n in closed.group_by(H.from_status):
+        counts[status] = counts.get(status, 0) + n
+
+    # 2) 현재 상태에 at 이전에 진입해 아직 머무는 오더 (진입 시각 = 마지막 전이, 없으면 생성 시각)
+    entered = func.coalesce(
+        select(func.max(H.changed_ts))
+        .where(H.order_id == WorkOrder.order_id)
+        .correlate(WorkOrder)
+        .scalar_subquery(),
+        WorkOrder.created_ts,
+    )
+    open_ = (
+        db.query(WorkOrder.status, func.count())
+        .filter(WorkOrder.status != DONE_STATUS, entered <= at)
+    )
+    if product_id:
+        open_ = open_.filter(WorkOrder.product_id == product_id)
+    for status, n in open_.group_by(WorkOrder.status):
+        counts[status] = counts.get(status, 0) + n
+
+    return {
+        "at": at,
+        "product_id": product_id,
+        "total": sum(counts.values()),
+        "wip": {status: counts[status] for status in STATUS_STEP if status in counts},
+    }
+
+
+def time_in_status(db: Session, status: str, start: datetime | None = None, end: datetime | None = None,
+                   product_id: str | None = None) -> dict:
+    """기간 내 status 를 벗어난 오더의 체류시간 통계 (제품별 + 전체)"""
+    start, end = default_range(start, end)
+    duration = _duration_sec(H.from_ts, H.changed_ts)
+    filters = [H.from_status == status, H.changed_ts >= start, H.changed_ts < end]
+    if product_id:
+        filters.append(H.product_id == product_id)
+
+    overall = db.query(*_stats_columns(duration)).filter(*filters).one()
+    by_product = (
+        db.query(H.product_id, *_stats_columns(duration))
+        .filter(*filters)
+        .group_by(H.product_id)
+        .order_by(H.product_id)
+        .all()
+    )
+    return {
+        "status": status,
+        "start": start,
+        "end": end,
+        "overall": _stats_row(overall),
+        "products": [{"product_id": r.product_id, **_stats_row(r)} for r in by_product],
+    }
+
+
+def lead_time(db: Session, start: datetime | None = None, end: datetime | None = None,
+              product_id: str | None = None, bucket_hours: float = 8) -> dict:
+    """기간 내 완료된 오더의 리드타임(생성 ~ 완료) 분포 (통계 + bucket_hours 단위 히스토그램)"""
+    start, end = default_range(start, end)
+    duration = _duration_sec(WorkOrder.created_ts, H.changed_ts)
+    filters = [H.to_status == DONE_STATUS, H.changed_ts >= start, H.changed_ts < end]
+    if product_id:
+        filters.append(H.product_id == product_id)
+
+    def base(*columns):
+        return db.query(*columns).join(WorkOrder, WorkOrder.order_id == H.order_id).filter(*filters)
+
+    overall = base(*_stats_columns(duration)).one()
+    by_product = base(H.product_id, *_stats_columns(duration)).group_by(H.product_id).order_by(H.product_id).all()
+
+    bucket = func.floor(duration / (bucket_hours * 3600)).label("bucket")
+    histogram = base(bucket, func.count()).group_by(bucket).order_by(bucket).all()
+
+    return {
+        "start": start,
+        "end": end,
+        "overall": _stats_row(overall),
+        "products": [{"product_id": r.product_id, **_stats_row(r)} for r in by_product],
+        "histogram": {
+            "bucket_hours": bucket_hours,
+            "buckets": [
+                {"from_hours": int(b) * bucket_hours, "to_hours": (int(b) + 1) * bucket_hours, "count": n}
+                for b, n in histogram
+            ],
+        },
+    }
+
+
+def order_history(db: Session, order_id) -> list:
+    """단일 작업지시 상태 이력"""
+    rows = (
+        db.query(H.from_status, H.to_status, H.from_ts, H.changed_ts)
+        .filter(H.order_id == order_id)
+        .order_by(H.changed_ts)
+        .all()
+    )
+    return [
+        {
+            "from_status": r.from_status,
+            "to_status": r.to_status,
+            "from_ts": r.from_ts,
+            "changed_ts": r.changed_ts,
+            "duration_sec": (r.changed_ts - r.from_ts).total_seconds(),
+        }
+        for r in rows
+    ]
@@ -0,0 +1,255 @@
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+
+from core import fanout
+from models.work_order import WorkOrder
+from models.master_equipment import MasterEquipment
+from models.master_operation_standard import MasterOperationStandard
+from services.scheduling import SCHEDULED_OPERATIONS, remaining_operations
+
+# 미완료 작업지시 납기 위험도 엔진
+# - 남은 공정(상태 기준)별 소요시간을 작업시간 예측 모델로 일괄 예측 (호출 1회)
+#   공정 소요시간 = 해당 공정 가용 설비 예측값의 평균
+#   분산 = 모델 RMSE^2 + 설비 간 예측값 분산 (공정 간 독립 가정으로 합산)
+# - 예상 완료 = now + 남은 소요시간 합, 지연확률 = P(N(mu, sigma^2) > 납기까지 남은 시간)
+# - 오더별 (남은 소요시간, 표준편차)는 캐시하고 진행/수정/생성/삭제된 오더만 재계산
+#   (확률/여유시간은 조회 시각 기준으로 매번 계산)
+# - 캐시는 워커 프로세스별 -> dirty 표시는 core/fanout.py 로 다른 워커에도 전달
+#   FULL_REFRESH_SEC 마다 전체 재계산 (전달 누락/모델 외 변경 보정)
+
+FULL_REFRESH_SEC = 300
+STANDARD_TIME_CV = 0.3      # 예측 모델 미사용(표준시간) 시 변동계수
+RISK_LEVELS = ((0.7, 'high'), (0.3, 'medium'), (0.0, 'low'))
+SORT_KEYS = ('probability', 'slack', 'due_date')
+
+_lock = threading.Lock()
+_cache = {}                 # order_id(str) -> 오더별 추정치 dict
+_dirty = set()
+_loaded_at = None           # 마지막 전체 계산 시각 (monotonic)
+
+
+def mark_dirty(order_id):
+    """오더 변경 알림 (다음 조회 시 해당 오더만 재계산)"""
+    _mark_dirty_local(str(order_id))
+    fanout.send('order_risk', str(order_id))
+
+
+def _mark_dirty_local(order_id: str):
+    with _lock:
+        _dirty.add(order_id)
+
+
+fanout.register('order_risk', _mark_dirty_local)
+
+
+def reset():
+    """캐시 전체 무효화 (예측 모델 교체 등)"""
+    global _loaded_at
+    with _lock:
+        _cache.clear()
+        _dirty.clear()
+        _loaded_at = None
+
+
+def late_probability(remaining_sec: float, sigma_sec: float, time_to_due_sec: float) -> float:
+    """남은 소요시간 ~ N(remaining, sigma^2) 가 납기까지 남은 시간을 넘을 확률"""
+    if sigma_sec <= 0:
+        return 1.0 if remaining_sec > time_to_due_sec else 0.0
+    z = (time_to_due_sec - remaining_sec) / (sigma_sec * math.sqrt(2))
+    return 0.5 * math.erfc(z)
+
+
+def _load_stations(db: Session) -> dict:
+    stations_by_op = {}
+    for eq in (
+        db.query(MasterEquipment.equipment_id, MasterEquipment.operation_seq)
+        .filter(MasterEquipment.enabled == True, MasterEquipment.operation_seq.in_(SCHEDULED_OPERATIONS))
+        .order_by(MasterEquipment.equipment_id)
+        .all()
+    ):
+        stations_by_op.setdefault(eq.operation_seq, []).append(eq.equipment_id)
+    return stations_by_op
+
+
+def _load_predictor():
+    from services.ai_work_time_prediction import get_work_time_sklearn_service
+
+    try:
+        return get_work_time_sklearn_service()
+    except Exception as e:
+        print(f"order_risk: 작업시간 예측 모델 사용 불가, 표준시간으로 계산 ({e})")
+        return None
+
+
+def estimate_operations(db: Session, keys: set, stations_by_op: dict) -> dict:
+    """
+    (제품, 공정, 수량) -> (평균 소요시간(초), 분산) 일괄 추정
+    예측 모델에 없는 제품/설비는 표준시간 x 수량, 분산은 (STANDARD_TIME_CV x 소요시간)^2
+    """
+    estimates = {}
+    service = _load_predictor()
+
+    if service is not None and keys:
+        known_products = set(service.get_available_products())
+        known_equipments = set(service.get_available_equipments())
+        model_var = float(service.get_model_info().get('rmse') or 0.0) ** 2
+
+        rows, owners = [], []
+        for key in keys:
+            product_id, seq, planned_qty = key
+            if product_id not in known_products:
+                continue
+            for equipment_id in stations_by_op.get(seq, []):
+                if equipment_id in known_equipments:
+                    rows.append((product_id, seq, equipment_id, planned_qty))
+                    owners.append(key)
+
+        per_key = {}
+        for key, sec in zip(owners, service.predict_batch(rows)):
+            per_key.setdefault(key, []).append(max(float(sec), 0.0))
+        for key, secs in per_key.items():
+            mean = sum(secs) / len(secs)
+            spread = sum((s - mean) ** 2 for s in secs) / len(secs)
+            estimates[key] = (mean, model_var + spread)
+
+    missing = keys - estimates.keys()
+    if missing:
+        standards = {
+            (s.product_id, s.operation_seq): s.standard_cycle_time_sec
+            for s in db.query(MasterOperationStandard).all()
+        }
+        for product_id, seq, planned_qty in missing:
+            sec = float(standards.get((product_id, seq), 0) * planned_qty)
+            estimates[(product_id, seq, planned_qty)] = (sec, (STANDARD_TIME_CV * sec) ** 2)
+    return estimates
+
+
+def _compute(db: Session, order_ids: list | None) -> dict:
+    """미완료 오더(전체 또는 지정 오더)의 남은 소요시간 추정 (예측 호출 1회)"""
+    q = db.query(
+        WorkOrder.order_id,
+        WorkOrder.product_id,
+        WorkOrder.planned_qty,
+        WorkOrder.due_date,
+        WorkOrder.status,
+    ).filter(WorkOrder.status != "S5_DONE")
+    if order_ids is not None:
+        q = q.filter(WorkOrder.order_id.in_(order_ids))
+    rows = q.all()
+    if not rows:
+        return {}
+
+    remaining = {r.order_id: remaining_operations(r.status) for r in rows}
+    keys = {(r.product_id, seq, r.planned_qty) for r in rows for seq in remaining[r.order_id]}
+    estimates = estimate_operations(db, keys, _load_stations(db))
+
+    entries = {}
+    for r in rows:
+        ops = remaining[r.order_id]
+        parts = [estimates[(r.product_id, seq, r.planned_qty)] for seq in ops]
+        entries[str(r.order_id)] = {
+            "order_id": str(r.order_id),
+            "product_id": r.product_id,
+            "planned_qty": r.planned_qty,
+            "status": r.status,
+            "due_date": r.due_date,
+            "remaining_operations": ops,
+            "remaining_sec": sum(mean for mean, _ in parts),
+            "sigma_sec": math.sqrt(sum(var for _, var in parts)),
+        }
+    return entries
+
+
+def refresh(db: Session, full: bool = False) -> dict:
+    """캐시 갱신 - 최초/주기 도래/full 이면 전체, 아니면 변경된 오더만. 갱신 통계 반환"""
+    global _loaded_at
+    with _lock:
+        expired = _loaded_at is None or time.monotonic() - _loaded_at > FULL_REFRESH_SEC
+        full = full or expired
+        taken = set(_dirty)
+        _dirty.clear()
+        dirty = None if full else list(taken)
+
+    if dirty == []:
+        return {"mode": "cached", "recomputed": 0}
+
+    started = time.perf_counter()
+    try:
+        entries = _compute(db, dirty)
+    except Exception:
+        # 계산 실패 시 가져온 dirty 표시를 되돌림 (다음 조회에서 다시 계산)
+        with _lock:
+            _dirty.update(taken)
+        raise
+    with _lock:
+        if full:
+            _cache.clear()
+            _loaded_at = time.monotonic()
+        else:
+            # 완료/삭제된 오더는 조회되지 않으므로 캐시에서 제거
+            for order_id in dirty:
+                _cache.pop(order_id, None)
+        _cache.update(entries)
+
+    return {
+        "mode": "full" if full else "incremental",
+        "recomputed": len(entries),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+def _risk_level(probability: float) -> str:
+    for threshold, level in RISK_LEVELS:
+        if probability >= threshold:
+            return level
+    return 'low'
+
+
+def at_risk_orders(db: Session, sort: str = 'probability', limit: int | None = 100,
+                   min_probability: float = 0.0, full: bool = False, now: datetime | None = None) -> dict:
+    """미완료 오더 납기 위험 목록 (sort: probability 내림차순 / slack, due_date 오름차순)"""
+    if sort not in SORT_KEYS:
+        raise ValueError(f"정렬 기준은 {SORT_KEYS} 중 하나: {sort}")
+
+    stats = refresh(db, full=full)
+    now = now or datetime.utcnow()
+    with _lock:
+        entries = list(_cache.values())
+
+    items = []
+    for e in entries:
+        time_to_due = (e["due_date"] - now).total_seconds()
+        probability = late_probability(e["remaining_sec"], e["sigma_sec"], time_to_due)
+        if probability < min_probability:
+            continue
+        items.append({
+            **e,
+            "remaining_sec": round(e["remaining_sec"], 1),
+            "sigma_sec": round(e["sigma_sec"], 1),
+            "projected_finish": now + timedelta(seconds=e["remaining_sec"]),
+            "slack_sec": round(time_to_due - e["remaining_sec"], 1),
+            "late_probability": round(probability, 4),
+            "risk": _risk_level(probability),
+        })
+
+    if sort == 'probability':
+        items.sort(key=lambda i: (-i["late_probability"], i["slack_sec"]))
+    elif sort == 'slack':
+        items.sort(key=lambda i: i["slack_sec"])
+    else:
+        items.sort(key=lambda i: i["due_date"])
+
+    return {
+        "generated_ts": now,
+        "refresh": stats,
+        "summary": {
+            "open_orders": len(entries),
+            "high": sum(1 for i in items if i["risk"] == 'high'),
+            "medium": sum(1 for i in items if i["risk"] == 'medium'),
+            "expected_late_orders": round(sum(i["late_probability"] for i in items), 1),
+        },
+        "items": items[:limit],
+    }
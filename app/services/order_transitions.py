@@ -0,0 +1,139 @@
+import os
+from datetime import datetime
+from typing import NamedTuple
+from sqlalchemy import select, update, insert, func
+from sqlalchemy.orm import Session
+
+from models.work_order import WorkOrder, OrderStatus, STATUS_STEP
+from models.work_result import WorkResult
+from models.order_status_history import OrderStatusHistory
+
+# 작업지시 상태 전이 엔진
+# - 상태는 OrderStatus 선언 순서(S0 < S1 < ... < S5)로만 전진 (역행 금지)
+# - 조건부 UPDATE 1문장으로 검사+변경을 원자적으로 처리 (애플리케이션 락 없음)
+#     WITH old AS (SELECT order_id, status FROM work_orders WHERE order_id = :id FOR UPDATE)
+#     UPDATE work_orders SET status = :new ... FROM old
+#     WHERE work_orders.order_id = old.order_id AND old.status < :new RETURNING old.status
+#   PostgreSQL enum 비교는 선언 순서 기준이므로 늦게 도착한 "2공정" 이 "4공정" 을 덮어쓰지 않음
+#   old CTE 는 잠금 후 최신 행을 읽으므로 RETURNING 의 이전 상태도 정확함 (이벤트 delta 용)
+#   동일 오더에 대한 동시 전이만 행 잠금으로 직렬화되고, 서로 다른 오더는 병렬 처리
+# - ORDER_STRICT_TRANSITIONS=1 이면 한 단계씩만 전이 (WHERE status = 직전 상태)
+# - 공정 실적(WorkResult)은 전이 결과와 무관하게 기록 (실제 수행된 작업)
+# - 상태가 실제로 바뀐 경우에만 order_status_history 에 1행 추가 (같은 트랜잭션)
+
+STRICT_TRANSITIONS = os.getenv('ORDER_STRICT_TRANSITIONS', '0') == '1'
+
+STATUSES = list(OrderStatus.enums)
+STEP_TO_STATUS = {step: status for status, step in STATUS_STEP.items() if step > 0}
+
+# 전이 결과
+APPLIED = 'applied'       # 상태 변경됨
+STALE = 'stale'           # 이미 같거나 이후 상태 (늦게 도착한 이벤트, 실적만 기록)
+REJECTED = 'rejected'     # 단계 건너뜀 (strict 모드)
+NOT_FOUND = 'not_found'
+
+
+class TransitionResult(NamedTuple):
+    outcome: str
+    from_status: str | None = None
+    to_status: str | None = None      # 처리 후 오더 상태
+    product_id: str | None = None
+    planned_qty: int | None = None
+    from_ts: datetime | None = None   # 전이 적용 시 이전 상태 진입 시각 (체류 구간 [from_ts, changed_ts))
+    changed_ts: datetime | None = None
+
+
+def allowed_transitions(status: str, strict: bool = STRICT_TRANSITIONS) -> list:
+    """현재 상태에서 전이 가능한 상태 목록"""
+    step = STATUS_STEP[status]
+    if strict:
+        return STATUSES[step + 1:step + 2]
+    return STATUSES[step + 1:]
+
+
+def can_transition(from_status: str, to_status: str, strict: bool = STRICT_TRANSITIONS) -> bool:
+    return to_status in allowed_transitions(from_status, strict)
+
+
+def transition(db: Session, order_id, operation_seq: int, equipment_id: str | None = None,
+               now: datetime | None = None, strict: bool = STRICT_TRANSITIONS,
+               commit: bool = True) -> TransitionResult:
+    """
+    공정 완료 이벤트 1건 처리: 실적 기록 + 상태 전진 (1 트랜잭션)
+    반환: TransitionResult(outcome=APPLIED / STALE / REJECTED / NOT_FOUND, 이전/이후 상태, 제품)
+    """
+    target = STEP_TO_STATUS.get(operation_seq)
+    if target is None:
+        raise ValueError(f"알 수 없는 공정 단계: {operation_seq}")
+    now = now or datetime.utcnow()
+
+    old = (
+        select(WorkOrder.order_id, WorkOrder.status)
+        .where(WorkOrder.order_id == order_id)
+        .with_for_update()
+        .cte('old')
+    )
+    if strict:
+        guard = old.c.status == STATUSES[STATUS_STEP[target] - 1]
+    else:
+        guard = old.c.status < target
+
+    values = {
+        'status': target,
+        'start_ts': func.coalesce(WorkOrder.start_ts, now),
+    }
+    if operation_seq == 5:
+        values['end_ts'] = now
+
+    updated = db.execute(
+        update(WorkOrder)
+        .where(WorkOrder.order_id == old.c.order_id, guard)
+        .values(**values)
+        .returning(old.c.status, WorkOrder.product_id, WorkOrder.created_ts, WorkOrder.planned_qty)
+        .execution_options(synchronize_session=False)
+    ).first()
+
+    if updated is not None:
+        from_ts = record_history(db, order_id, updated[1], updated[0], target, updated[2], now)
+        result = TransitionResult(APPLIED, updated[0], target, updated[1], updated[3], from_ts, now)
+    else:
+        current = (
+            db.query(WorkOrder.status, WorkOrder.product_id)
+            .filter(WorkOrder.order_id == order_id)
+            .first()
+        )
+        if current is None:
+            return TransitionResult(NOT_FOUND)
+        outcome = STALE if STATUS_STEP[current.status] >= STATUS_STEP[target] else REJECTED
+        result = TransitionResult(outcome, current.status, current.status, current.product_id)
+
+    db.add(WorkResult(
+        order_id=order_id,
+        operation_seq=operation_seq,
+        equipment_id=equipment_id or None,
+        start_ts=now,
+        end_ts=now,  # 단순 로직: start=end=now
+    ))
+    if commit:
+        db.commit()
+    return result
+
+
+def record_history(db: Session, order_id, product_id: str, from_status: str, to_status: str,
+                   created_ts: datetime, now: datetime) -> datetime:
+    """상태 전이 이력 1행 추가 (from_ts = 직전 전이 시각, 없으면 작업지시 생성 시각), from_ts 반환"""
+    # 오더 행이 잠긴 상태이므로 직전 전이 시각이 동시에 바뀌지 않음 (ix_osh_order_changed 사용)
+    last_changed = (
+        select(func.max(OrderStatusHistory.changed_ts))
+        .where(OrderStatusHistory.order_id == order_id)
+        .scalar_subquery()
+    )
+    return db.execute(insert(OrderStatusHistory).values(
+        order_id=order_id,
+        product_id=product_id,
+        from_status=from_status,
+        to_status=to_status,
+        # tsrange 인덱스는 from_ts <= changed_ts 필요 (now 를 지정한 호출/시계 오차 대비)
+        from_ts=func.least(func.coalesce(last_changed, created_ts), now),
+        changed_ts=now,
+    ).returning(OrderStatusHistory.from_ts)).scalar()
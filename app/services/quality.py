@@ -1,3 +1,6 @@
+import uuid
+import pandas as pd
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from models.quality_inspection import QualityInspection
 from models.quality_result import QualityResult
@@ -6,9 +9,26 @@ from models.work_order import WorkOrder
 from models.master_product import MasterProduct
 from datetime import datetime
 
-def list_inspections(db: Session):
-    # 품질검사 목록 조회 (작업지시 및 제품 정보 포함)
-    q = (
+from core.events import bus
+from services import oee
+from services import quality_analytics
+
+
+def inspection_event(action: str, inspection) -> dict:
+    """품질검사 변경 delta (이벤트 버스 발행용)"""
+    return {
+        "action": action,
+        "inspection_id": str(inspection.inspection_id),
+        "order_id": str(inspection.order_id),
+        "product_id": inspection.product_id,
+        "inspection_status": inspection.status,
+        "inspection_qty": inspection.inspection_qty,
+        "inspector": inspection.inspector,
+    }
+
+def inspections_query(db: Session):
+    # 품질검사 목록 쿼리 (제품 정보 포함, 검사일 최신순)
+    return (
         db.query(
             QualityInspection.inspection_id,
             QualityInspection.order_id,
@@ -23,8 +43,10 @@ def list_inspections(db: Session):
         .join(MasterProduct, QualityInspection.product_id == MasterProduct.product_id)
         .order_by(QualityInspection.inspection_date.desc())
     )
-    
-    rows = q.all()
+
+def list_inspections(db: Session):
+    # 품질검사 목록 조회 (작업지시 및 제품 정보 포함)
+    rows = inspections_query(db).all()
     
     items = []
     for r in rows:
@@ -69,6 +91,7 @@ def create_inspection(db: Session, order_id: str, product_id: str,
     db.add(inspection)
     db.commit()
     db.refresh(inspection)
+    bus.publish("quality", inspection_event("inspection_created", inspection))
     return inspection
 
 def get_inspection_detail(db: Session, inspection_id: str):
@@ -124,6 +147,7 @@ def update_inspection(db: Session, inspection_id: str, inspection_qty_raw: str,
     
     db.commit()
     db.refresh(inspection)
+    bus.publish("quality", inspection_event("inspection_updated", inspection))
     return inspection
 
 def delete_inspection(db: Session, inspection_id: str):
@@ -135,12 +159,14 @@ def delete_inspection(db: Session, inspection_id: str):
     if not inspection:
         return None
     
+    event = inspection_event("inspection_deleted", inspection)
     db.delete(inspection)
     db.commit()
+    bus.publish("quality", event)
     return True
 
-def list_results(db: Session):
-    # 품질검사 결과 목록 조회
+def results_query(db: Session, since: datetime | None = None):
+    # 품질검사 결과 목록 쿼리 (since: start_ts 하한 -> 파티션 프루닝)
     q = (
         db.query(
             QualityResult.result_id,
@@ -162,40 +188,57 @@ def list_results(db: Session):
         .outerjoin(MasterDefectCode, QualityResult.defect_code == MasterDefectCode.defect_code)
         .order_by(QualityResult.start_ts.desc())
     )
-    
-    rows = q.all()
-    
-    items = []
-    for r in rows:
-        items.append({
-            "result_id": str(r.result_id),
-            "inspection_id": str(r.inspection_id),
-            "inspector": r.inspector,
-            "passed_qty": r.passed_qty,
-            "defect_qty": r.defect_qty,
-            "defect_code": r.defect_code,
-            "defect_name": r.defect_name or "",
-            "defect_rate": float(r.defect_rate) if r.defect_rate else 0.0,
-            "product_id": r.product_id,
-            "product_name": r.product_name,
-            "start_ts": r.start_ts,
-            "end_ts": r.end_ts,
-            "inspection_time": r.inspection_time,
-        })
-    
-    # 검사 목록 (결과 등록용)
+    if since is not None:
+        q = q.filter(QualityResult.start_ts >= since)
+    return q
+
+RESULTS_STREAM_CHUNK = 2000
+
+
+def _result_item(r) -> dict:
+    return {
+        "result_id": str(r.result_id),
+        "inspection_id": str(r.inspection_id),
+        "inspector": r.inspector,
+        "passed_qty": r.passed_qty,
+        "defect_qty": r.defect_qty,
+        "defect_code": r.defect_code,
+        "defect_name": r.defect_name or "",
+        "defect_rate": float(r.defect_rate) if r.defect_rate else 0.0,
+        "product_id": r.product_id,
+        "product_name": r.product_name,
+        "start_ts": r.start_ts,
+        "end_ts": r.end_ts,
+        "inspection_time": r.inspection_time,
+    }
+
+
+def iter_results(db: Session, since: datetime | None = None, chunk_size: int = RESULTS_STREAM_CHUNK):
+    """품질검사 결과 목록 스트리밍 (서버측 커서로 chunk_size 행씩 읽으며 yield - 스트리밍 렌더링용)"""
+    for r in results_query(db, since).yield_per(chunk_size):
+        yield _result_item(r)
+
+
+def result_form_options(db: Session) -> dict:
+    # 결과 등록 폼 선택 목록 (대기 중인 검사, 불량 코드)
     inspections = db.query(QualityInspection).filter(
         QualityInspection.status == "PENDING"
     ).all()
-    
-    # 불량 코드 목록
     defect_codes = db.query(MasterDefectCode).all()
+    return {
+        "inspections": inspections,
+        "defect_codes": defect_codes
+    }
+
+
+def list_results(db: Session, since: datetime | None = None):
+    # 품질검사 결과 목록 조회 (since 이후 시작된 결과만)
+    items = [_result_item(r) for r in results_query(db, since).all()]
     
     return {
         "items": items,
         "total": len(items),
-        "inspections": inspections,
-        "defect_codes": defect_codes
+        **result_form_options(db),
     }
 
 def create_result(db: Session, inspection_id: str, inspector: str,
@@ -238,4 +281,131 @@ def create_result(db: Session, inspection_id: str, inspector: str,
     
     db.commit()
     db.refresh(result)
+    quality_analytics.invalidate()
+    if inspection:
+        oee.mark_order_dirty(inspection.order_id)
+        bus.publish("quality", {
+            **inspection_event("result_created", inspection),
+            "result_id": str(result.result_id),
+            "passed_qty": passed_qty,
+            "defect_qty": defect_qty,
+            "defect_code": result.defect_code,
+            "defect_rate": round(defect_rate, 2),
+        })
     return result
+
+
+BATCH_FIELDS = ['inspection_id', 'inspector', 'passed_qty', 'defect_qty', 'defect_code', 'start_ts', 'end_ts', 'notes']
+
+
+def _uuid_or_none(value):
+    try:
+        return uuid.UUID(str(value))
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def validate_results_batch(db: Session, items: list) -> tuple:
+    """
+    품질검사 결과 일괄 검증 + 불량률/검사시간 계산 (컬럼 단위 벡터 연산)
+    반환: (유효 행 DataFrame, 오류 목록 [{"index", "errors"}], 검사 정보 {inspection_id: (order_id, product_id)})
+    """
+    df = pd.DataFrame(items, columns=BATCH_FIELDS)
+    df['inspection_id'] = df['inspection_id'].map(_uuid_or_none)
+    df['inspector'] = df['inspector'].fillna('').astype(str).str.strip()
+    df['defect_code'] = df['defect_code'].fillna('').astype(str).str.strip()
+    df['notes'] = df['notes'].fillna('').astype(str)
+    for col in ('passed_qty', 'defect_qty'):
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+    for col in ('start_ts', 'end_ts'):
+        # 오프셋 있는/없는 시각이 섞여도 파싱되도록 UTC 로 맞춘 뒤 naive UTC (테이블 기준)로 저장
+        df[col] = pd.to_datetime(df[col], errors='coerce', format='ISO8601', utc=True).dt.tz_convert(None)
+
+    # 검사/불량코드 존재 여부 (IN 조회 각 1회)
+    ids = list({i for i in df['inspection_id'] if i is not None})
+    inspections = {
+        r.inspection_id: (r.order_id, r.product_id)
+        for r in db.query(QualityInspection.inspection_id, QualityInspection.order_id, QualityInspection.product_id)
+        .filter(QualityInspection.inspection_id.in_(ids))
+    } if ids else {}
+    codes = list(set(df['defect_code']) - {''})
+    known_codes = {
+        c for (c,) in db.query(MasterDefectCode.defect_code).filter(MasterDefectCode.defect_code.in_(codes))
+    } if codes else set()
+
+    checks = [
+        (df['inspection_id'].isna(), "inspection_id 형식 오류"),
+        (df['inspection_id'].notna() & ~df['inspection_id'].isin(list(inspections)), "검사를 찾을 수 없음"),
+        (df['inspector'].eq('') | (df['inspector'].str.len() > 50), "inspector 는 1~50자"),
+        (df['passed_qty'].isna() | (df['passed_qty'] < 0) | (df['passed_qty'] % 1 != 0), "passed_qty 는 0 이상 정수"),
+        (df['defect_qty'].isna() | (df['defect_qty'] < 0) | (df['defect_qty'] % 1 != 0), "defect_qty 는 0 이상 정수"),
+        (df['defect_code'].ne('') & ~df['defect_code'].isin(known_codes), "알 수 없는 불량코드"),
+        (df['start_ts'].isna() | df['end_ts'].isna(), "start_ts/end_ts 형식 오류"),
+        (df['end_ts'] < df['start_ts'], "end_ts 가 start_ts 보다 이전"),
+        (df['notes'].str.len() > 500, "notes 는 500자 이하"),
+    ]
+    messages = pd.DataFrame({msg: mask.fillna(True) for mask, msg in checks})
+    invalid = messages.any(axis=1)
+    errors = [
+        {"index": int(i), "errors": [msg for msg, hit in row.items() if hit]}
+        for i, row in messages[invalid].iterrows()
+    ]
+
+    valid = df[~invalid].copy()
+    valid['passed_qty'] = valid['passed_qty'].astype('int64')
+    valid['defect_qty'] = valid['defect_qty'].astype('int64')
+    total = valid['passed_qty'] + valid['defect_qty']
+    valid['defect_rate'] = (valid['defect_qty'] / total.where(total > 0) * 100).fillna(0.0).round(2)
+    valid['inspection_time'] = (valid['end_ts'] - valid['start_ts']).dt.total_seconds().astype('int64')
+    return valid, errors, inspections
+
+
+def create_results_batch(db: Session, items: list, atomic: bool = False) -> dict:
+    """
+    품질검사 결과 일괄 등록 (자동 검사장비 교대 마감 업로드 등)
+    - 유효 행은 multi-row INSERT, 대상 검사는 UPDATE ... WHERE inspection_id IN 1회로 COMPLETED 처리, 커밋 1회
+    - 항목별 검증 오류는 index 와 함께 반환 (atomic=True 이면 오류가 하나라도 있을 때 아무것도 등록하지 않음)
+    """
+    if not items:
+        return {"created": 0, "completed_inspections": 0, "errors": [], "result_ids": []}
+
+    valid, errors, inspections = validate_results_batch(db, items)
+    if valid.empty or (atomic and errors):
+        return {"created": 0, "completed_inspections": 0, "errors": errors, "result_ids": []}
+
+    valid['result_id'] = [uuid.uuid4() for _ in range(len(valid))]
+    records = (
+        valid[['result_id', 'inspection_id', 'inspector', 'passed_qty', 'defect_qty', 'defect_code',
+               'defect_rate', 'start_ts', 'end_ts', 'inspection_time', 'notes']]
+        .astype(object).to_dict('records')
+    )
+    for r in records:
+        r['defect_code'] = r['defect_code'] or None
+        r['start_ts'] = r['start_ts'].to_pydatetime()
+        r['end_ts'] = r['end_ts'].to_pydatetime()
+
+    inspection_ids = list(set(valid['inspection_id']))
+    db.execute(insert(QualityResult), records)
+    completed = (
+        db.query(QualityInspection)
+        .filter(QualityInspection.inspection_id.in_(inspection_ids))
+        .update({QualityInspection.status: "COMPLETED"}, synchronize_session=False)
+    )
+    db.commit()
+
+    quality_analytics.invalidate()
+    for order_id in {inspections[i][0] for i in inspection_ids}:
+        oee.mark_order_dirty(order_id)
+    bus.publish("quality", {
+        "action": "results_batch_created",
+        "created": len(records),
+        "inspection_ids": [str(i) for i in inspection_ids],
+        "passed_qty": int(valid['passed_qty'].sum()),
+        "defect_qty": int(valid['defect_qty'].sum()),
+    })
+    return {
+        "created": len(records),
+        "completed_inspections": completed,
+        "errors": errors,
+        "result_ids": [str(r['result_id']) for r in records],
+    }
@@ -0,0 +1,244 @@
+import os
+import threading
+import time
+from datetime import datetime, date, timedelta
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from core import fanout
+from core.db_routing import REPLICA_ENABLED, REPLICA_MAX_LAG_SEC
+from models.quality_inspection import QualityInspection
+from models.quality_result import QualityResult
+from models.quality_result_daily import QualityResultDaily
+from models.master_defect_code import MasterDefectCode
+from models.master_product import MasterProduct
+
+# 품질 KPI 집계 (불량코드 Pareto / 제품별 일별 불량률 추이 / 검사자별 처리량)
+# - DB 에서 GROUP BY 로 집계한 행만 가져옴 (원본 결과 행을 가져오지 않음)
+# - 실시간 quality_results 집계 + 보관(archive)된 quality_result_daily 집계를 키별로 합산
+#   (원본은 둘 중 한 곳에만 존재하므로 중복 없음)
+# - 결과는 (종류, 조회조건) 별로 캐시, create_result 에서 invalidate()
+#   캐시는 워커 프로세스별 -> 무효화는 core/fanout.py 로 다른 워커에도 전달, CACHE_TTL_SEC 경과 시에도 재계산
+# - 읽기 복제본 사용 시 무효화 후 REPLICA_MAX_LAG_SEC 동안은 캐시하지 않음 (복제 지연으로 등록 전 데이터일 수 있음)
+
+CACHE_TTL_SEC = int(os.getenv('QUALITY_ANALYTICS_TTL_SEC', '300'))
+CACHE_MAX_ENTRIES = 256
+UNSPECIFIED_DEFECT = ''         # 불량수량은 있으나 불량코드 미입력
+
+METRICS = ('result_count', 'passed_qty', 'defect_qty', 'inspection_time_sum')
+
+_lock = threading.Lock()
+_cache = {}                     # (종류, 조회조건) -> (계산 시각(monotonic), 결과)
+_generation = 0                 # invalidate() 마다 증가 (계산 도중 무효화된 결과는 캐시하지 않음)
+_invalidated_at = None          # 마지막 무효화 시각 (monotonic)
+
+
+def invalidate():
+    """캐시 전체 무효화 (품질검사 결과 등록/보관 시)"""
+    _invalidate_local()
+    fanout.send('quality_analytics')
+
+
+def _invalidate_local(_data=None):
+    global _generation, _invalidated_at
+    with _lock:
+        _cache.clear()
+        _generation += 1
+        _invalidated_at = time.monotonic()
+
+
+fanout.register('quality_analytics', _invalidate_local)
+
+
+def _cached(key: tuple, compute):
+    now = time.monotonic()
+    with _lock:
+        hit = _cache.get(key)
+        if hit is not None and now - hit[0] < CACHE_TTL_SEC:
+            return hit[1]
+        generation = _generation
+
+    value = compute()
+    with _lock:
+        settling = REPLICA_ENABLED and _invalidated_at is not None and now - _invalidated_at < REPLICA_MAX_LAG_SEC
+        if generation == _generation and not settling:
+            if len(_cache) >= CACHE_MAX_ENTRIES:
+                _cache.clear()
+            _cache[key] = (now, value)
+    return value
+
+
+def window_start(days: int | None, today: date | None = None) -> datetime | None:
+    """조회 기간 하한 (자정 기준 - 같은 날의 조회는 같은 캐시 키), days=None 또는 0 이면 전체"""
+    if not days:
+        return None
+    return datetime.combine((today or date.today()) - timedelta(days=days), datetime.min.time())
+
+
+def _live_columns():
+    R = QualityResult
+    return {
+        'day': func.date(R.start_ts),
+        'product_id': QualityInspection.product_id,
+        'inspector': R.inspector,
+        'defect_code': func.coalesce(R.defect_code, UNSPECIFIED_DEFECT),
+    }, [
+        func.count().label('result_count'),
+        func.sum(R.passed_qty).label('passed_qty'),
+        func.sum(R.defect_qty).label('defect_qty'),
+        func.coalesce(func.sum(R.inspection_time), 0).label('inspection_time_sum'),
+    ]
+
+
+def _rollup_columns():
+    D = QualityResultDaily
+    return {
+        'day': D.day,
+        'product_id': D.product_id,
+        'inspector': D.inspector,
+        'defect_code': D.defect_code,
+    }, [func.sum(getattr(D, m)).label(m) for m in METRICS]
+
+
+def grouped(db: Session, keys: tuple, start: datetime | None = None, end: datetime | None = None,
+            product_id: str | None = None) -> dict:
+    """keys(day/product_id/inspector/defect_code) 별 건수/양품/불량/검사시간 합계 (실시간 + 보관 집계)"""
+    totals = {}
+
+    def accumulate(rows):
+        for r in rows:
+            acc = totals.setdefault(tuple(getattr(r, k) for k in keys), dict.fromkeys(METRICS, 0))
+            for m in METRICS:
+                acc[m] += getattr(r, m) or 0
+
+    columns, metrics = _live_columns()
+    q = (
+        db.query(*[columns[k].label(k) for k in keys], *metrics)
+        .join(QualityInspection, QualityResult.inspection_id == QualityInspection.inspection_id)
+    )
+    if start is not None:
+        q = q.filter(QualityResult.start_ts >= start)
+    if end is not None:
+        q = q.filter(QualityResult.start_ts < end)
+    if product_id is not None:
+        q = q.filter(QualityInspection.product_id == product_id)
+    accumulate(q.group_by(*[columns[k] for k in keys]).all())
+
+    # 보관 집계는 일 단위 (start/end 가 속한 날 포함)
+    columns, metrics = _rollup_columns()
+    q = db.query(*[columns[k].label(k) for k in keys], *metrics)
+    if start is not None:
+        q = q.filter(QualityResultDaily.day >= start.date())
+    if end is not None:
+        q = q.filter(QualityResultDaily.day <= end.date())
+    if product_id is not None:
+        q = q.filter(QualityResultDaily.product_id == product_id)
+    accumulate(q.group_by(*[columns[k] for k in keys]).all())
+
+    for acc in totals.values():
+        for m in ('result_count', 'passed_qty', 'defect_qty'):
+            acc[m] = int(acc[m])
+        acc['inspection_time_sum'] = float(acc['inspection_time_sum'])
+    return totals
+
+
+def defect_rate(passed_qty: int, defect_qty: int) -> float:
+    total = passed_qty + defect_qty
+    return round(defect_qty / total * 100, 2) if total else 0.0
+
+
+def defect_pareto(db: Session, start: datetime | None = None, end: datetime | None = None,
+                  product_id: str | None = None) -> dict:
+    """불량코드별 불량수량 (내림차순) + 누적 비율"""
+    def compute():
+        totals = grouped(db, ('defect_code',), start, end, product_id)
+        names = dict(db.query(MasterDefectCode.defect_code, MasterDefectCode.name).all())
+        rows = sorted(
+            ((code, acc) for (code,), acc in totals.items() if acc['defect_qty'] > 0),
+            key=lambda item: item[1]['defect_qty'], reverse=True,
+        )
+        total_defects = sum(acc['defect_qty'] for _, acc in rows)
+
+        items, cumulative = [], 0
+        for code, acc in rows:
+            cumulative += acc['defect_qty']
+            items.append({
+                'defect_code': code or None,
+                'defect_name': names.get(code, '미지정' if code == UNSPECIFIED_DEFECT else code),
+                'defect_qty': acc['defect_qty'],
+                'result_count': acc['result_count'],
+                'share': round(acc['defect_qty'] / total_defects * 100, 2),
+                'cumulative_share': round(cumulative / total_defects * 100, 2),
+            })
+        return {'total_defects': total_defects, 'items': items}
+
+    return _cached(('pareto', start, end, product_id), compute)
+
+
+def defect_trend(db: Session, start: datetime | None = None, end: datetime | None = None,
+                 product_id: str | None = None) -> dict:
+    """제품별 일별 검사수량/불량수량/불량률"""
+    def compute():
+        totals = grouped(db, ('product_id', 'day'), start, end, product_id)
+        names = dict(db.query(MasterProduct.product_id, MasterProduct.name).all())
+        products = {}
+        for (pid, day), acc in sorted(totals.items()):
+            product = products.setdefault(pid, {'product_id': pid, 'product_name': names.get(pid, pid), 'days': []})
+            product['days'].append({
+                'day': day,
+                'inspected_qty': acc['passed_qty'] + acc['defect_qty'],
+                'defect_qty': acc['defect_qty'],
+                'defect_rate': defect_rate(acc['passed_qty'], acc['defect_qty']),
+            })
+        return {'products': list(products.values())}
+
+    return _cached(('trend', start, end, product_id), compute)
+
+
+def inspector_throughput(db: Session, start: datetime | None = None, end: datetime | None = None,
+                         product_id: str | None = None) -> dict:
+    """검사자별 처리 건수/수량, 검사시간(inspection_time) 기준 평균 소요시간과 시간당 처리수량"""
+    def compute():
+        totals = grouped(db, ('inspector',), start, end, product_id)
+        items = []
+        for (inspector,), acc in totals.items():
+            qty = acc['passed_qty'] + acc['defect_qty']
+            seconds = acc['inspection_time_sum']
+            items.append({
+                'inspector': inspector,
+                'result_count': acc['result_count'],
+                'inspected_qty': qty,
+                'defect_rate': defect_rate(acc['passed_qty'], acc['defect_qty']),
+                'inspection_hours': round(seconds / 3600, 2),
+                'avg_sec_per_result': round(seconds / acc['result_count'], 1) if acc['result_count'] else None,
+                'qty_per_hour': round(qty / seconds * 3600, 1) if seconds > 0 else None,
+            })
+        items.sort(key=lambda item: item['inspected_qty'], reverse=True)
+        return {'items': items}
+
+    return _cached(('inspectors', start, end, product_id), compute)
+
+
+def quality_kpi(db: Session, start: datetime | None = None, end: datetime | None = None,
+                product_id: str | None = None) -> dict:
+    """기간 전체 품질 KPI + Pareto / 추이 / 검사자별 처리량"""
+    def compute():
+        acc = grouped(db, (), start, end, product_id).get((), dict.fromkeys(METRICS, 0))
+        return {
+            'result_count': acc['result_count'],
+            'inspected_qty': acc['passed_qty'] + acc['defect_qty'],
+            'passed_qty': acc['passed_qty'],
+            'defect_qty': acc['defect_qty'],
+            'defect_rate': defect_rate(acc['passed_qty'], acc['defect_qty']),
+            'inspection_hours': round(acc['inspection_time_sum'] / 3600, 2),
+        }
+
+    return {
+        'start': start,
+        'end': end,
+        'product_id': product_id,
+        'kpi': _cached(('kpi', start, end, product_id), compute),
+        'pareto': defect_pareto(db, start, end, product_id),
+        'trend': defect_trend(db, start, end, product_id),
+        'inspectors': inspector_throughput(db, start, end, product_id),
+    }
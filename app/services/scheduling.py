@@ -0,0 +1,199 @@
+import heapq
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+
+from models.work_order import WorkOrder, STATUS_STEP
+from models.master_equipment import MasterEquipment
+from models.master_operation_standard import MasterOperationStandard
+
+# 유한 능력 스케줄링 (heap 기반 list scheduling, 납기 우선)
+# - 미완료 작업지시를 납기(EDD) 순으로 정렬하고, 남은 공정(1~4)마다
+#   해당 공정 설비 heap(가용시각 최소)에서 설비를 꺼내 배정
+# - 공정 시작 = max(설비 가용시각, 앞 공정 종료시각)
+# - 시각은 기준시각(now) 대비 초(float)로 계산하고 결과 변환 시에만 datetime 사용
+
+SCHEDULED_OPERATIONS = (1, 2, 3, 4)
+
+
+def remaining_operations(status: str) -> list:
+    """상태 기준 남은 공정 (S1_READY = 1공정 완료 -> 2,3,4 남음)"""
+    done = STATUS_STEP.get(status, 0)
+    return [seq for seq in SCHEDULED_OPERATIONS if seq > done]
+
+
+def schedule_orders(orders: list, stations_by_op: dict, durations: dict,
+                    station_free: dict | None = None) -> dict:
+    """
+    순수 스케줄링 코어 (DB 없음)
+    orders: [(order_id, product_id, planned_qty, due_offset_sec, status), ...]
+    stations_by_op: {operation_seq: [equipment_id, ...]}
+    durations: {(product_id, operation_seq, planned_qty): 소요시간(초)}
+    station_free: {equipment_id: 가용 시작 오프셋(초)} (기본 0)
+    반환: 오더별 공정 배정(설비/시작/종료 오프셋)과 납기 지연
+    """
+    station_free = station_free or {}
+    heaps = {}
+    for seq, stations in stations_by_op.items():
+        heap = [(station_free.get(eq, 0.0), eq) for eq in stations]
+        heapq.heapify(heap)
+        heaps[seq] = heap
+
+    busy = {eq: 0.0 for stations in stations_by_op.values() for eq in stations}
+    assignments = []
+    unscheduled = []
+
+    # 납기 우선 (동일 납기는 입력 순서 유지)
+    for order_id, product_id, planned_qty, due_offset, status in sorted(orders, key=lambda o: o[3]):
+        ready = 0.0
+        ops = []
+        for seq in remaining_operations(status):
+            heap = heaps.get(seq)
+            if not heap:
+                unscheduled.append((order_id, f"{seq}공정 가용 설비 없음"))
+                ops = None
+                break
+            duration = durations.get((product_id, seq, planned_qty), 0.0)
+            free, equipment_id = heapq.heappop(heap)
+            start = free if free > ready else ready
+            finish = start + duration
+            heapq.heappush(heap, (finish, equipment_id))
+            busy[equipment_id] += duration
+            ops.append((seq, equipment_id, start, finish))
+            ready = finish
+
+        if ops is None:
+            continue
+        assignments.append((order_id, product_id, due_offset, ops, ready, ready - due_offset))
+
+    makespan = max((a[4] for a in assignments), default=0.0)
+    return {
+        "assignments": assignments,
+        "unscheduled": unscheduled,
+        "makespan_sec": makespan,
+        "station_busy_sec": busy,
+    }
+
+
+def _load_durations(db: Session, orders: list, stations_by_op: dict, use_predictor: bool,
+                    model_type: str = 'sklearn') -> dict:
+    """(제품, 공정, 수량)별 소요시간(초) - 표준시간 x 수량 또는 작업시간 예측 모델(설비 평균)"""
+    keys = {
+        (product_id, seq, planned_qty)
+        for _, product_id, planned_qty, _, status in orders
+        for seq in remaining_operations(status)
+    }
+
+    if use_predictor:
+        from services.ai_work_time_prediction import get_work_time_service
+
+        service = get_work_time_service(model_type)
+        known_products = set(service.get_available_products())
+        known_equipments = set(service.get_available_equipments())
+        rows, owners = [], []
+        for key in keys:
+            product_id, seq, planned_qty = key
+            if product_id not in known_products:
+                continue
+            for equipment_id in stations_by_op.get(seq, []):
+                if equipment_id in known_equipments:
+                    rows.append((product_id, seq, equipment_id, planned_qty))
+                    owners.append(key)
+
+        predicted = service.predict_batch(rows)
+        sums, counts = {}, {}
+        for key, sec in zip(owners, predicted):
+            sums[key] = sums.get(key, 0.0) + float(sec)
+            counts[key] = counts.get(key, 0) + 1
+        durations = {key: sums[key] / counts[key] for key in sums}
+        missing = keys - durations.keys()
+    else:
+        durations = {}
+        missing = keys
+
+    if missing:
+        standards = {
+            (s.product_id, s.operation_seq): s.standard_cycle_time_sec
+            for s in db.query(MasterOperationStandard).all()
+        }
+        for product_id, seq, planned_qty in missing:
+            durations[(product_id, seq, planned_qty)] = float(
+                standards.get((product_id, seq), 0) * planned_qty
+            )
+    return durations
+
+
+def build_schedule(db: Session, now: datetime | None = None, use_predictor: bool = False,
+                   limit: int | None = None, model_type: str = 'sklearn') -> dict:
+    """미완료 작업지시 전체에 대한 설비 배정/시작/종료/납기지연 계산"""
+    now = now or datetime.utcnow()
+
+    order_rows = (
+        db.query(
+            WorkOrder.order_id,
+            WorkOrder.product_id,
+            WorkOrder.planned_qty,
+            WorkOrder.due_date,
+            WorkOrder.status,
+        )
+        .filter(WorkOrder.status != "S5_DONE")
+        .all()
+    )
+    orders = [
+        (r.order_id, r.product_id, r.planned_qty, (r.due_date - now).total_seconds(), r.status)
+        for r in order_rows
+    ]
+
+    stations_by_op = {}
+    for eq in (
+        db.query(MasterEquipment.equipment_id, MasterEquipment.operation_seq)
+        .filter(MasterEquipment.enabled == True, MasterEquipment.operation_seq.in_(SCHEDULED_OPERATIONS))
+        .order_by(MasterEquipment.equipment_id)
+        .all()
+    ):
+        stations_by_op.setdefault(eq.operation_seq, []).append(eq.equipment_id)
+
+    durations = _load_durations(db, orders, stations_by_op, use_predictor, model_type)
+    result = schedule_orders(orders, stations_by_op, durations)
+
+    def to_ts(offset: float) -> datetime:
+        return now + timedelta(seconds=offset)
+
+    assignments = result["assignments"]
+    late = [a for a in assignments if a[5] > 0]
+    items = []
+    for order_id, product_id, due_offset, ops, finish, lateness in assignments[:limit]:
+        items.append({
+            "order_id": str(order_id),
+            "product_id": product_id,
+            "due_date": to_ts(due_offset),
+            "projected_finish": to_ts(finish),
+            "lateness_sec": round(lateness, 1),
+            "is_late": lateness > 0,
+            "operations": [
+                {
+                    "operation_seq": seq,
+                    "equipment_id": equipment_id,
+                    "start_ts": to_ts(start),
+                    "end_ts": to_ts(end),
+                }
+                for seq, equipment_id, start, end in ops
+            ],
+        })
+
+    makespan = result["makespan_sec"]
+    return {
+        "generated_ts": now,
+        "duration_source": f"predictor:{model_type}" if use_predictor else "standard",
+        "summary": {
+            "orders": len(assignments),
+            "late_orders": len(late),
+            "total_lateness_sec": round(sum(a[5] for a in late), 1),
+            "makespan_end": to_ts(makespan),
+            "station_utilization": {
+                eq: round(busy / makespan * 100, 1) if makespan > 0 else 0.0
+                for eq, busy in result["station_busy_sec"].items()
+            },
+        },
+        "unscheduled": [{"order_id": str(o), "reason": reason} for o, reason in result["unscheduled"]],
+        "items": items,
+    }
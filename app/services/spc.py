@@ -0,0 +1,307 @@
+import math
+import os
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from datetime import datetime
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from models.master_inspection_item import MasterInspectionItem
+from models.quality_measurement import QualityMeasurement
+from models.spc_subgroup import SpcSubgroup
+from models.spc_item_stats import SpcItemStats
+
+# 검사항목 측정값 SPC 엔진
+# - 적재: 항목별 측정값 배열을 quality_measurements 1행(float8[])으로 저장하고
+#   SUBGROUP_SIZE 개씩 나눈 부분군 통계(평균/범위/표준편차/합/제곱합)를 NumPy 로 계산해 spc_subgroups 에 저장,
+#   항목 x 제품 누적 합계(spc_item_stats)는 가산 upsert
+# - 관리도(X̄-R, X̄-S): 조회 기간의 부분군 행만 읽음 (측정값 원본 재조회 없음)
+#   군내 표준편차 σ = mean(R/d2(n)) 또는 mean(S/c4(n)) -> 부분군 크기별 관리한계
+#     X̄: CL ± 3σ/√n,  R: (d2 ± 3·d3)σ,  S: c4σ ± 3σ√(1-c4²)  (n 이 일정하면 A2/D3/D4, A3/B3/B4 공식과 동일)
+# - 공정능력: Cp/Cpk(군내 σ), Pp/Ppk(전체 σ, 합/제곱합으로 계산)
+# - Western Electric 규칙 (X̄ 관리도, 슬라이딩 윈도우 벡터 연산)
+#   1: 3σ 밖 1점 / 2: 연속 3점 중 2점이 같은 쪽 2σ 밖 / 3: 연속 5점 중 4점이 같은 쪽 1σ 밖 / 4: 연속 8점 중심선 같은 쪽
+
+SUBGROUP_SIZE = int(os.getenv('SPC_SUBGROUP_SIZE', '5'))
+MAX_CHART_POINTS = 2000
+
+# 부분군 크기별 d2, d3 (범위 R 의 평균/표준편차 계수)
+D2 = {2: 1.128, 3: 1.693, 4: 2.059, 5: 2.326, 6: 2.534, 7: 2.704, 8: 2.847, 9: 2.970, 10: 3.078,
+      11: 3.173, 12: 3.258, 13: 3.336, 14: 3.407, 15: 3.472, 16: 3.532, 17: 3.588, 18: 3.640,
+      19: 3.689, 20: 3.735, 21: 3.778, 22: 3.819, 23: 3.858, 24: 3.895, 25: 3.931}
+D3 = {2: 0.853, 3: 0.888, 4: 0.880, 5: 0.864, 6: 0.848, 7: 0.833, 8: 0.820, 9: 0.808, 10: 0.797,
+      11: 0.787, 12: 0.778, 13: 0.770, 14: 0.763, 15: 0.756, 16: 0.750, 17: 0.744, 18: 0.739,
+      19: 0.734, 20: 0.729, 21: 0.724, 22: 0.720, 23: 0.716, 24: 0.712, 25: 0.708}
+MAX_SUBGROUP_SIZE = max(D2)
+
+
+def c4(n: int) -> float:
+    """표본 표준편차 편향 보정 계수"""
+    return math.sqrt(2 / (n - 1)) * math.exp(math.lgamma(n / 2) - math.lgamma((n - 1) / 2))
+
+
+def split_subgroups(values: np.ndarray, size: int = SUBGROUP_SIZE) -> list:
+    """측정값 배열 -> 부분군 배열 목록 (남은 1개는 마지막 부분군에 포함)"""
+    size = max(2, min(size, MAX_SUBGROUP_SIZE - 1))
+    k, rest = divmod(len(values), size)
+    if rest == 1 and k:
+        k, tail = k - 1, values[(k - 1) * size:]
+    else:
+        tail = values[k * size:]
+    groups = [values[:k * size].reshape(k, size)] if k else []
+    if len(tail):
+        groups.append(tail.reshape(1, len(tail)))
+    return groups
+
+
+def subgroup_stats(groups: np.ndarray) -> dict:
+    """같은 크기 부분군 행렬(k x n)의 부분군별 통계 (벡터 연산)"""
+    n = groups.shape[1]
+    stats = {
+        'n': np.full(len(groups), n),
+        'mean': groups.mean(axis=1),
+        'range': np.ptp(groups, axis=1),
+        'sum': groups.sum(axis=1),
+        'sumsq': (groups ** 2).sum(axis=1),
+        'min': groups.min(axis=1),
+        'max': groups.max(axis=1),
+    }
+    if n >= 2:
+        stats['std'] = groups.std(axis=1, ddof=1)
+        stats['r_over_d2'] = stats['range'] / D2[n]
+        stats['s_over_c4'] = stats['std'] / c4(n)
+    else:
+        stats['std'] = stats['r_over_d2'] = stats['s_over_c4'] = np.full(len(groups), np.nan)
+    return stats
+
+
+def ingest(db: Session, product_id: str, items: dict, measured_ts: datetime | None = None,
+           inspection_id: str | None = None, subgroup_size: int = SUBGROUP_SIZE, commit: bool = True) -> dict:
+    """
+    항목별 측정값 배열 적재 (items: {item_id: [값, ...]})
+    반환: {item_id: 부분군 수}, 알 수 없는 항목이면 ValueError
+    """
+    measured_ts = measured_ts or datetime.utcnow()
+    known = {i for (i,) in db.query(MasterInspectionItem.item_id).filter(MasterInspectionItem.item_id.in_(list(items)))}
+    unknown = set(items) - known
+    if unknown:
+        raise ValueError(f"알 수 없는 검사항목: {sorted(unknown)}")
+
+    counts = {}
+    for item_id, raw in items.items():
+        values = np.asarray(raw, dtype=np.float64)
+        if values.ndim != 1 or len(values) == 0 or not np.isfinite(values).all():
+            raise ValueError(f"{item_id}: 측정값은 유한한 숫자 배열이어야 함")
+
+        measurement_id = db.execute(
+            insert(QualityMeasurement).values(
+                inspection_id=inspection_id, item_id=item_id, product_id=product_id,
+                measured_ts=measured_ts, values=values.tolist(),
+            ).returning(QualityMeasurement.measurement_id)
+        ).scalar()
+
+        rows = []
+        totals = {'subgroups': 0, 'within_subgroups': 0, 'n_total': 0, 'sum': 0.0, 'sumsq': 0.0,
+                  'sum_r_over_d2': 0.0, 'sum_s_over_c4': 0.0}
+        for groups in split_subgroups(values, subgroup_size):
+            stats = subgroup_stats(groups)
+            columns = {k: v.tolist() for k, v in stats.items()}
+            for i in range(len(groups)):
+                row = {k: columns[k][i] for k in columns}
+                for k in ('std', 'r_over_d2', 's_over_c4'):
+                    if row[k] != row[k]:    # NaN -> NULL (n = 1)
+                        row[k] = None
+                rows.append({
+                    'measurement_id': measurement_id, 'item_id': item_id, 'product_id': product_id,
+                    'measured_ts': measured_ts, **row,
+                })
+            totals['subgroups'] += len(groups)
+            totals['n_total'] += groups.size
+            totals['sum'] += float(stats['sum'].sum())
+            totals['sumsq'] += float(stats['sumsq'].sum())
+            if groups.shape[1] >= 2:
+                totals['within_subgroups'] += len(groups)
+                totals['sum_r_over_d2'] += float(stats['r_over_d2'].sum())
+                totals['sum_s_over_c4'] += float(stats['s_over_c4'].sum())
+
+        db.execute(insert(SpcSubgroup), rows)
+        stmt = insert(SpcItemStats).values(
+            item_id=item_id, product_id=product_id, min=float(values.min()), max=float(values.max()),
+            updated_ts=measured_ts, **totals,
+        )
+        update = {c: getattr(SpcItemStats, c) + getattr(stmt.excluded, c) for c in totals}
+        update['min'] = func.least(SpcItemStats.min, stmt.excluded.min)
+        update['max'] = func.greatest(SpcItemStats.max, stmt.excluded.max)
+        update['updated_ts'] = stmt.excluded.updated_ts
+        db.execute(stmt.on_conflict_do_update(index_elements=['item_id', 'product_id'], set_=update))
+        counts[item_id] = totals['subgroups']
+
+    if commit:
+        db.commit()
+    return counts
+
+
+def western_electric(z: np.ndarray) -> dict:
+    """X̄ 관리도 표준화 점수 z 에 대한 규칙 위반 점 인덱스 (윈도우 마지막 점 기준)"""
+    def window_hits(flags: np.ndarray, window: int, count: int) -> np.ndarray:
+        if len(flags) < window:
+            return np.empty(0, dtype=np.int64)
+        hits = sliding_window_view(flags, window).sum(axis=1) >= count
+        return np.flatnonzero(hits) + window - 1
+
+    def both_sides(threshold: float, window: int, count: int) -> np.ndarray:
+        return np.union1d(window_hits(z > threshold, window, count), window_hits(z < -threshold, window, count))
+
+    return {
+        'rule1': np.flatnonzero(np.abs(z) > 3),
+        'rule2': both_sides(2, 3, 2),
+        'rule3': both_sides(1, 5, 4),
+        'rule4': both_sides(0, 8, 8),
+    }
+
+
+def capability(lsl: float | None, usl: float | None, mean: float, sigma_within: float | None,
+               sigma_overall: float | None) -> dict:
+    """Cp/Cpk (군내 σ), Pp/Ppk (전체 σ)"""
+    def indices(sigma):
+        if not sigma:
+            return None, None
+        spread = (usl - lsl) / (6 * sigma) if lsl is not None and usl is not None else None
+        sides = [v for v in ((usl - mean) / (3 * sigma) if usl is not None else None,
+                             (mean - lsl) / (3 * sigma) if lsl is not None else None) if v is not None]
+        return spread, (min(sides) if sides else None)
+
+    cp, cpk = indices(sigma_within)
+    pp, ppk = indices(sigma_overall)
+
+    def r(v):
+        return round(v, 4) if v is not None else None
+
+    return {'cp': r(cp), 'cpk': r(cpk), 'pp': r(pp), 'ppk': r(ppk)}
+
+
+def _overall_sigma(n_total: float, total: float, sumsq: float) -> float | None:
+    if n_total < 2:
+        return None
+    return math.sqrt(max(sumsq - total * total / n_total, 0.0) / (n_total - 1))
+
+
+def _item_limits(db: Session, item_id: str):
+    return db.query(MasterInspectionItem).filter(MasterInspectionItem.item_id == item_id).first()
+
+
+def item_capability(db: Session, item_id: str, product_id: str) -> dict | None:
+    """전체 기간 공정능력 (누적 합계 1행 조회)"""
+    item = _item_limits(db, item_id)
+    stats = db.query(SpcItemStats).filter(
+        SpcItemStats.item_id == item_id, SpcItemStats.product_id == product_id
+    ).first()
+    if item is None or stats is None or stats.n_total == 0:
+        return None
+    mean = stats.sum / stats.n_total
+    sigma_within = stats.sum_s_over_c4 / stats.within_subgroups if stats.within_subgroups else None
+    sigma_overall = _overall_sigma(stats.n_total, stats.sum, stats.sumsq)
+    return {
+        'item_id': item_id,
+        'product_id': product_id,
+        'n': stats.n_total,
+        'subgroups': stats.subgroups,
+        'mean': round(mean, 6),
+        'sigma_within': round(sigma_within, 6) if sigma_within else None,
+        'sigma_overall': round(sigma_overall, 6) if sigma_overall else None,
+        'min': stats.min,
+        'max': stats.max,
+        'lower_limit': item.lower_limit,
+        'upper_limit': item.upper_limit,
+        'target': item.target,
+        **capability(item.lower_limit, item.upper_limit, mean, sigma_within, sigma_overall),
+    }
+
+
+def control_chart(db: Session, item_id: str, product_id: str, chart: str = 'xbar_r',
+                  start: datetime | None = None, end: datetime | None = None,
+                  max_points: int = MAX_CHART_POINTS) -> dict | None:
+    """
+    X̄-R / X̄-S 관리도 (기간 내 최근 max_points 부분군)
+    관리한계/공정능력은 조회한 부분군으로 계산 (원본 측정값은 읽지 않음)
+    """
+    item = _item_limits(db, item_id)
+    if item is None:
+        return None
+
+    q = db.query(
+        SpcSubgroup.measured_ts, SpcSubgroup.n, SpcSubgroup.mean, SpcSubgroup.range, SpcSubgroup.std,
+        SpcSubgroup.sum, SpcSubgroup.sumsq, SpcSubgroup.r_over_d2, SpcSubgroup.s_over_c4,
+    ).filter(SpcSubgroup.item_id == item_id, SpcSubgroup.product_id == product_id)
+    if start is not None:
+        q = q.filter(SpcSubgroup.measured_ts >= start)
+    if end is not None:
+        q = q.filter(SpcSubgroup.measured_ts < end)
+    rows = q.order_by(SpcSubgroup.measured_ts.desc(), SpcSubgroup.subgroup_id.desc()).limit(max_points).all()[::-1]
+
+    base = {'item_id': item_id, 'product_id': product_id, 'chart': chart, 'unit': item.unit,
+            'lower_limit': item.lower_limit, 'upper_limit': item.upper_limit, 'target': item.target}
+    if not rows:
+        return {**base, 'points': [], 'violations': {}}
+
+    ts = [r.measured_ts for r in rows]
+    arr = {k: np.array([getattr(r, k) if getattr(r, k) is not None else np.nan for r in rows], dtype=np.float64)
+           for k in ('n', 'mean', 'range', 'std', 'sum', 'sumsq', 'r_over_d2', 's_over_c4')}
+    n = arr['n'].astype(np.int64)
+    n_total = n.sum()
+    center = float(arr['sum'].sum() / n_total)
+
+    spread_key, estimate_key = ('range', 'r_over_d2') if chart == 'xbar_r' else ('std', 's_over_c4')
+    sigma = float(np.nanmean(arr[estimate_key])) if np.isfinite(arr[estimate_key]).any() else None
+
+    points = []
+    violations = {}
+    if sigma:
+        x_half = 3 * sigma / np.sqrt(n)
+        if chart == 'xbar_r':
+            d2 = np.array([D2.get(k, np.nan) for k in n])
+            d3 = np.array([D3.get(k, np.nan) for k in n])
+            spread_cl = d2 * sigma
+            spread_ucl = (d2 + 3 * d3) * sigma
+            spread_lcl = np.maximum((d2 - 3 * d3) * sigma, 0)
+        else:
+            c = np.array([c4(k) if k >= 2 else np.nan for k in n])
+            spread_cl = c * sigma
+            spread_ucl = (c + 3 * np.sqrt(1 - c ** 2)) * sigma
+            spread_lcl = np.maximum((c - 3 * np.sqrt(1 - c ** 2)) * sigma, 0)
+
+        z = (arr['mean'] - center) / (sigma / np.sqrt(n))
+        violations = {k: v.tolist() for k, v in western_electric(z).items()}
+        spread_out = np.flatnonzero((arr[spread_key] > spread_ucl) | (arr[spread_key] < spread_lcl))
+        violations['spread_rule1'] = spread_out.tolist()
+    else:
+        x_half = spread_cl = spread_ucl = spread_lcl = np.full(len(rows), np.nan)
+
+    def num(v):
+        return None if v != v else round(float(v), 6)
+
+    for i in range(len(rows)):
+        points.append({
+            'ts': ts[i],
+            'n': int(n[i]),
+            'mean': num(arr['mean'][i]),
+            'x_ucl': num(center + x_half[i]),
+            'x_lcl': num(center - x_half[i]),
+            spread_key: num(arr[spread_key][i]),
+            'spread_cl': num(spread_cl[i]),
+            'spread_ucl': num(spread_ucl[i]),
+            'spread_lcl': num(spread_lcl[i]),
+        })
+
+    sigma_overall = _overall_sigma(n_total, arr['sum'].sum(), arr['sumsq'].sum())
+    return {
+        **base,
+        'center': round(center, 6),
+        'sigma_within': round(sigma, 6) if sigma else None,
+        'subgroups': len(rows),
+        'n': int(n_total),
+        'capability': capability(item.lower_limit, item.upper_limit, center, sigma, sigma_overall),
+        'points': points,
+        'violations': violations,
+    }
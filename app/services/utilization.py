@@ -0,0 +1,193 @@
+import os
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from sqlalchemy import BigInteger, cast, func
+from sqlalchemy.orm import Session
+
+from models.work_result import WorkResult
+from models.master_equipment import MasterEquipment
+
+# 설비 가동률 타임라인 엔진 (WorkResult 구간 기반)
+# - 시각은 조회 시작 기준 초(int64) 배열로 변환하고 설비별 구간을 정렬 후 sweep 으로 병합
+#   키 = 설비코드 * span + 상대시각 -> 설비 간 키 범위가 겹치지 않으므로
+#   전체를 한 번에 정렬하고 np.maximum.accumulate 한 번으로 설비별 병합 (Python 루프 없음)
+# - 버킷(일/교대)별 가동시간 = 누적 가동시간 함수 B(t) 의 버킷 경계 차이 (searchsorted)
+# - 결과: 설비별 가동/비가동 시간, 가동률, 버킷별 가동률, Gantt 용 병합 구간
+
+SHIFT_START_HOURS = tuple(int(h) for h in os.getenv('SHIFT_START_HOURS', '6,14,22').split(','))
+BUCKETS = ('day', 'shift')
+MAX_INTERVAL_HOURS = 24     # 조회 시작 이전에 시작된 실적 포함 범위 (start_ts 파티션 프루닝용 하한)
+
+
+def bucket_edges(span_sec: int, window_start: datetime, bucket: str = 'day',
+                 shift_hours: tuple = SHIFT_START_HOURS) -> np.ndarray:
+    """버킷 경계 (조회 시작 기준 초, 양 끝 포함)"""
+    offsets = [0] if bucket == 'day' else sorted(h * 3600 for h in shift_hours)
+    day0 = datetime.combine(window_start.date(), datetime.min.time())
+    base = int((day0 - window_start).total_seconds())
+    days = np.arange(span_sec // 86400 + 2, dtype=np.int64) * 86400 + base
+    edges = (days[:, None] + np.asarray(offsets, dtype=np.int64)[None, :]).ravel()
+    edges = edges[(edges > 0) & (edges < span_sec)]
+    return np.concatenate(([0], edges, [span_sec])).astype(np.int64)
+
+
+def merge_intervals(codes: np.ndarray, starts: np.ndarray, ends: np.ndarray, span_sec: int) -> tuple:
+    """
+    설비별 겹침 구간 병합 (sort + sweep)
+    codes: 설비 코드(0..n-1), starts/ends: 조회 시작 기준 초 (조회 구간 밖은 잘라냄)
+    반환: (codes, starts, ends) 병합 구간 - 설비 코드, 시작 순 정렬
+    """
+    starts = np.clip(starts, 0, span_sec)
+    ends = np.clip(ends, 0, span_sec)
+    valid = ends > starts
+    codes, starts, ends = codes[valid].astype(np.int64), starts[valid], ends[valid]
+    if len(starts) == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+
+    # 설비별로 키 공간을 분리 (구간 끝 <= span_sec < stride)
+    stride = span_sec + 1
+    start_keys = codes * stride + starts
+    end_keys = codes * stride + ends
+    order = np.argsort(start_keys, kind='stable')
+    start_keys, end_keys = start_keys[order], end_keys[order]
+
+    # 앞선 구간들의 최대 종료 시각보다 늦게 시작하면 새 병합 구간 (맞닿은 구간은 병합)
+    running_end = np.maximum.accumulate(end_keys)
+    first = np.empty(len(start_keys), dtype=bool)
+    first[0] = True
+    first[1:] = start_keys[1:] > running_end[:-1]
+
+    first_idx = np.flatnonzero(first)
+    last_idx = np.append(first_idx[1:] - 1, len(start_keys) - 1)
+    merged_start = start_keys[first_idx]
+    merged_end = running_end[last_idx]
+
+    merged_codes = merged_start // stride
+    return merged_codes, merged_start - merged_codes * stride, merged_end - merged_codes * stride
+
+
+def busy_by_bucket(codes: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                   n_codes: int, edges: np.ndarray) -> np.ndarray:
+    """병합 구간의 설비 x 버킷 가동시간(초) 행렬"""
+    busy = np.zeros((n_codes, len(edges) - 1), dtype=np.int64)
+    if len(starts) == 0:
+        return busy
+
+    stride = int(edges[-1]) + 1
+    start_keys = codes * stride + starts
+    lengths = ends - starts
+    cum_before = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+
+    # B(k) = 키 k 이전까지 누적 가동시간 (다른 설비분은 같은 행의 차이에서 상쇄)
+    edge_keys = np.arange(n_codes, dtype=np.int64)[:, None] * stride + edges[None, :]
+    idx = np.searchsorted(start_keys, edge_keys, side='right') - 1
+    safe = np.maximum(idx, 0)
+    cumulative = np.where(
+        idx >= 0,
+        cum_before[safe] + np.clip(edge_keys - start_keys[safe], 0, lengths[safe]),
+        0,
+    )
+    busy[:] = np.diff(cumulative, axis=1)
+    return busy
+
+
+def compute_utilization(codes: np.ndarray, starts: np.ndarray, ends: np.ndarray, n_codes: int,
+                        span_sec: int, edges: np.ndarray) -> dict:
+    """
+    순수 계산 코어 (DB 없음)
+    반환: merged(codes, starts, ends), busy(설비 x 버킷 초), bucket_len(버킷 길이 초)
+    """
+    merged = merge_intervals(codes, starts, ends, span_sec)
+    busy = busy_by_bucket(*merged, n_codes, edges)
+    return {'merged': merged, 'busy': busy, 'bucket_len': np.diff(edges)}
+
+
+def load_intervals(db: Session, start: datetime, end: datetime, equipment_id: str | None = None) -> tuple:
+    """조회 구간과 겹치는 설비 실적 구간 (설비 id 배열, 시작/종료 epoch 초 배열)"""
+    q = (
+        db.query(
+            WorkResult.equipment_id,
+            cast(func.extract('epoch', WorkResult.start_ts), BigInteger),
+            cast(func.extract('epoch', WorkResult.end_ts), BigInteger),
+        )
+        .filter(
+            WorkResult.equipment_id.isnot(None),
+            WorkResult.start_ts >= start - timedelta(hours=MAX_INTERVAL_HOURS),
+            WorkResult.start_ts < end,
+            WorkResult.end_ts > start,
+        )
+    )
+    if equipment_id:
+        q = q.filter(WorkResult.equipment_id == equipment_id)
+    rows = q.all()
+    if not rows:
+        return np.empty(0, dtype=object), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    equipment_ids, starts, ends = zip(*rows)
+    return (
+        np.asarray(equipment_ids, dtype=object),
+        np.asarray(starts, dtype=np.int64),
+        np.asarray(ends, dtype=np.int64),
+    )
+
+
+def _iso(base: datetime, offset_sec) -> str:
+    return (base + timedelta(seconds=int(offset_sec))).isoformat()
+
+
+def station_utilization(db: Session, start: datetime, end: datetime, bucket: str = 'day',
+                        timeline: bool = False, equipment_id: str | None = None) -> dict:
+    """설비별 가동/비가동 시간과 가동률 (일/교대 버킷, timeline=True 면 Gantt 구간 포함)"""
+    span_sec = int((end - start).total_seconds())
+    epoch0 = int((start - datetime(1970, 1, 1)).total_seconds())
+
+    stations = db.query(MasterEquipment.equipment_id, MasterEquipment.name, MasterEquipment.operation_seq)
+    if equipment_id:
+        stations = stations.filter(MasterEquipment.equipment_id == equipment_id)
+    stations = stations.order_by(MasterEquipment.equipment_id).all()
+
+    equipment_ids, starts, ends = load_intervals(db, start, end, equipment_id)
+    # 설비 코드 = 마스터 순서, 마스터에 없는 설비 id 는 뒤에 추가
+    known = [s.equipment_id for s in stations]
+    known_set = set(known)
+    uniques = known + [eq for eq in pd.unique(equipment_ids) if eq not in known_set]
+    codes = pd.Index(uniques).get_indexer(equipment_ids)
+    names = {s.equipment_id: (s.name, s.operation_seq) for s in stations}
+
+    edges = bucket_edges(span_sec, start, bucket)
+    result = compute_utilization(codes, starts - epoch0, ends - epoch0, len(uniques), span_sec, edges)
+    busy, bucket_len = result['busy'], result['bucket_len']
+    merged_codes, merged_starts, merged_ends = result['merged']
+    if timeline:
+        bounds = np.searchsorted(merged_codes, np.arange(len(uniques) + 1))
+
+    items = []
+    for code, eq in enumerate(uniques):
+        busy_sec = int(busy[code].sum())
+        name, operation_seq = names.get(eq, (eq, None))
+        item = {
+            'equipment_id': eq,
+            'name': name,
+            'operation_seq': operation_seq,
+            'busy_sec': busy_sec,
+            'idle_sec': span_sec - busy_sec,
+            'utilization': round(busy_sec / span_sec * 100, 2) if span_sec else 0.0,
+            'buckets': [round(b / l * 100, 2) for b, l in zip(busy[code].tolist(), bucket_len.tolist())],
+        }
+        if timeline:
+            lo, hi = bounds[code], bounds[code + 1]
+            item['timeline'] = [
+                [_iso(start, s), _iso(start, e)]
+                for s, e in zip(merged_starts[lo:hi].tolist(), merged_ends[lo:hi].tolist())
+            ]
+        items.append(item)
+
+    return {
+        'start': start,
+        'end': end,
+        'bucket': bucket,
+        'buckets': [[_iso(start, a), _iso(start, b)] for a, b in zip(edges[:-1].tolist(), edges[1:].tolist())],
+        'intervals': len(starts),
+        'stations': items,
+    }
@@ -1,7 +1,7 @@
 # services/work_orders.py
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
-from models.work_order import WorkOrder
+from models.work_order import WorkOrder, STATUS_STEP
 
 from models.work_result import WorkResult
 from models.master_operation import MasterOperation
@@ -10,10 +10,18 @@ from models.master_equipment import MasterEquipment
 from models.master_product import MasterProduct
 from datetime import datetime
 
+from core.database import SessionLocal
+from core.events import bus
+from services import order_risk
+from services import order_transitions
+from services import order_history
+from services import oee
+from services.cycle_anomaly import get_cycle_detector
 
-def list_orders(db: Session):
-    """작업지시 목록 조회 (제품 정보 포함)"""
-    q = (
+
+def orders_query(db: Session):
+    """작업지시 목록 쿼리 (제품 정보 포함, 납기순)"""
+    return (
         db.query(
             WorkOrder.order_id,
             WorkOrder.product_id,
@@ -26,7 +34,9 @@ def list_orders(db: Session):
         .order_by(WorkOrder.due_date.asc())
     )
 
-    rows = q.all()
+def list_orders(db: Session):
+    """작업지시 목록 조회 (제품 정보 포함)"""
+    rows = orders_query(db).all()
 
     # 템플릿에서 쓰기 편하도록 dict 리스트로 변환
     items = []
@@ -63,6 +73,8 @@ def create_order(db: Session, product_id: str, planned_qty_raw: str, due_date_ra
     db.add(order)
     db.commit()
     db.refresh(order)
+    order_risk.mark_dirty(order.order_id)
+    bus.publish("order", order_event("created", order))
     return order
 
 def get_order_detail(db: Session, order_id: str):
@@ -96,6 +108,7 @@ def get_order_detail(db: Session, order_id: str):
         "created_ts": row.created_ts,
         "start_ts": row.start_ts,
         "end_ts": row.end_ts,
+        "history": order_history.order_history(db, row.order_id),
     }
 
 def update_order(db: Session, order_id: str,
@@ -111,6 +124,8 @@ def update_order(db: Session, order_id: str,
 
     db.commit()
     db.refresh(order)
+    order_risk.mark_dirty(order_id)
+    bus.publish("order", order_event("updated", order, order.status))
     return order
 
 def delete_order(db: Session, order_id: str):
@@ -119,14 +134,16 @@ def delete_order(db: Session, order_id: str):
     if not order:
         return None
 
+    # 삭제 후에는 속성 접근 불가이므로 delta 먼저 생성
+    event = order_event("deleted", order, order.status)
     db.delete(order)
     db.commit()
+    order_risk.mark_dirty(order_id)
+    bus.publish("order", event)
     return True
 
-def list_results(db: Session):
-    """
-    생산실적 목록 조회 (공정/설비/제품 정보 포함)
-    """
+def results_query(db: Session, since: datetime | None = None):
+    """생산실적 목록 쿼리 (since: start_ts 하한 -> 파티션 프루닝)"""
     q = (
         db.query(
             WorkResult.result_id,
@@ -146,23 +163,40 @@ def list_results(db: Session):
         .join(MasterProduct, WorkOrder.product_id == MasterProduct.product_id)
         .order_by(desc(WorkResult.start_ts))
     )
+    if since is not None:
+        q = q.filter(WorkResult.start_ts >= since)
+    return q
 
-    rows = q.all()
+RESULTS_STREAM_CHUNK = 2000
 
-    items = []
-    for r in rows:
-        items.append({
-            "result_id": str(r.result_id),
-            "order_id": str(r.order_id),
-            "product_id": r.product_id,
-            "product_name": r.product_name,
-            "operation_seq": r.operation_seq,
-            "operation_name": r.operation_name,
-            "equipment_id": r.equipment_id,
-            "equipment_name": r.equipment_name,
-            "start_ts": r.start_ts,
-            "end_ts": r.end_ts,
-        })
+
+def _result_item(r) -> dict:
+    return {
+        "result_id": str(r.result_id),
+        "order_id": str(r.order_id),
+        "product_id": r.product_id,
+        "product_name": r.product_name,
+        "operation_seq": r.operation_seq,
+        "operation_name": r.operation_name,
+        "equipment_id": r.equipment_id,
+        "equipment_name": r.equipment_name,
+        "start_ts": r.start_ts,
+        "end_ts": r.end_ts,
+    }
+
+
+def iter_results(db: Session, since: datetime | None = None, chunk_size: int = RESULTS_STREAM_CHUNK):
+    """생산실적 목록 스트리밍 (서버측 커서로 chunk_size 행씩 읽으며 yield - 스트리밍 렌더링용)"""
+    for r in results_query(db, since).yield_per(chunk_size):
+        yield _result_item(r)
+
+
+def list_results(db: Session, since: datetime | None = None):
+    """
+    생산실적 목록 조회 (공정/설비/제품 정보 포함)
+    since 가 주어지면 해당 시각 이후 시작된 실적만 조회
+    """
+    items = [_result_item(r) for r in results_query(db, since).all()]
 
     return {
         "items": items,
@@ -227,38 +261,68 @@ def list_progress(db: Session):
         "equipments": equipments,
     }
 
-# 단계 → 상태 매핑
-STEP_TO_STATUS = {
-    1: "S1_READY",
-    2: "S2_ASSEMBLY",
-    3: "S3_INSPECTION",
-    4: "S4_PACK",
-    5: "S5_DONE",
-}
-
 def advance_progress(db: Session, order_id: str, operation_seq: str, equipment_id: str | None):
-    now = datetime.utcnow()
-    op_seq = int(operation_seq) 
-
-    # 주문 로드
-    order = db.query(WorkOrder).filter(WorkOrder.order_id == order_id).first()
-
-    # 실적 한 줄 추가
-    wr = WorkResult(
-        order_id=order_id,
-        operation_seq=op_seq,
-        equipment_id=equipment_id or None,
-        start_ts=now,
-        end_ts=now, # 단순 로직: start=end=now
-    )
-    db.add(wr)
+    # 실적 기록 + 상태 전진 (조건부 UPDATE, 늦게 도착한 이전 공정은 상태를 되돌리지 않음)
+    result = order_transitions.transition(db, order_id, int(operation_seq), equipment_id)
+    progress_committed(order_id, int(operation_seq), equipment_id, result)
+    return result
+
+def progress_committed(order_id, operation_seq: int, equipment_id: str | None,
+                       result: order_transitions.TransitionResult):
+    """공정 이벤트 커밋 후 처리 (직접 처리/그룹 커밋 버퍼 공통)"""
+    if result.outcome == order_transitions.NOT_FOUND:
+        return
+    order_risk.mark_dirty(order_id)
+    oee.mark_dirty(equipment_id, result.changed_ts, since=result.from_ts)
+    bus.publish("order", {
+        "action": "progress",
+        "outcome": result.outcome,
+        "order_id": str(order_id),
+        "product_id": result.product_id,
+        "status": result.to_status,
+        "prev_status": result.from_status,
+        "operation_seq": operation_seq,
+        "equipment_id": equipment_id or None,
+        "line": equipment_line(equipment_id),
+    })
+
+    # 한 단계 전진한 공정 완료 -> 사이클타임 이상 감지 (체류시간 / 계획수량)
+    if (result.outcome == order_transitions.APPLIED and equipment_id and result.from_ts is not None
+            and operation_seq == STATUS_STEP[result.from_status] + 1):
+        alert = get_cycle_detector().observe(
+            equipment_id, result.product_id, operation_seq,
+            (result.changed_ts - result.from_ts).total_seconds(),
+            qty=result.planned_qty, ts=result.changed_ts, order_id=order_id,
+        )
+        if alert:
+            bus.publish("alert", {**alert, "line": equipment_line(equipment_id)})
 
-    # 주문 상태/시간 갱신
-    if order is not None:
-        order.status = STEP_TO_STATUS.get(op_seq, order.status)
-        if order.start_ts is None:
-            order.start_ts = now
-        if op_seq == 5:
-            order.end_ts = now
+# 설비 -> 라인(location) 매핑 (이벤트 라인 필터용, 최초 1회 로드)
+_equipment_lines = None
 
-    db.commit()
\ No newline at end of file
+def equipment_line(equipment_id: str | None) -> str | None:
+    global _equipment_lines
+    if not equipment_id:
+        return None
+    if _equipment_lines is None:
+        db = SessionLocal()
+        try:
+            _equipment_lines = {
+                e.equipment_id: e.location
+                for e in db.query(MasterEquipment.equipment_id, MasterEquipment.location)
+            }
+        finally:
+            db.close()
+    return _equipment_lines.get(equipment_id)
+
+def order_event(action: str, order, prev_status: str | None = None) -> dict:
+    """작업지시 생성/수정/삭제 delta"""
+    return {
+        "action": action,
+        "order_id": str(order.order_id),
+        "product_id": order.product_id,
+        "planned_qty": order.planned_qty,
+        "due_date": order.due_date,
+        "status": order.status,
+        "prev_status": prev_status,
+    }